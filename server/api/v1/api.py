@@ -1,11 +1,13 @@
 # api/v1/api.py
 from fastapi import APIRouter
 from .endpoints import (
+    admin_router,
     auth_router,
     chat_router,
     hustles_router,
     jobs_router,
     profile_router,
+    recommendations_router,
     reskilling_router,
     risk_router,
 )
@@ -19,15 +21,24 @@ api_router.include_router(risk_router, prefix="", tags=["risk"]) # Risk requires
 api_router.include_router(jobs_router, prefix="", tags=["jobs"]) # Jobs requires API Key
 api_router.include_router(reskilling_router, prefix="", tags=["reskilling"]) # Reskilling requires API Key
 api_router.include_router(hustles_router, prefix="", tags=["hustles"]) # Hustles requires API Key
+api_router.include_router(recommendations_router, prefix="", tags=["recommendations"]) # Bundled recommendations require API Key
 api_router.include_router(chat_router, prefix="", tags=["chat"]) # Chat requires API Key
+api_router.include_router(admin_router, prefix="", tags=["admin"]) # Admin requires PROFILING_TOKEN
 
 # Paths will be:
 # /api/v1/signup
 # /api/v1/token
 # /api/v1/me (Requires JWT)
 # /api/v1/profile (Requires API Key)
+# /api/v1/profile/{userId}/resume [POST, multipart or raw body] (Requires API Key)
 # /api/v1/risk/{userId} (Requires API Key)
+# /api/v1/risk/batch [POST] (Requires API Key)
 # /api/v1/jobs/{userId} (Requires API Key)
 # /api/v1/reskilling/{userId} (Requires API Key)
 # /api/v1/hustles/{userId} (Requires API Key)
-# /api/v1/chat (Requires API Key and userId in body)
\ No newline at end of file
+# /api/v1/recommendations/{userId}?include=risk,jobs,reskilling,hustles (Requires API Key)
+# /api/v1/recommendations/batch [POST] (Requires API Key)
+# /api/v1/chat (Requires API Key and userId in body)
+# /api/v1/chat/history/{userId} [GET, DELETE] (Requires API Key)
+# /api/v1/admin/profiles, /api/v1/admin/profiles/{profileId} (Requires X-Admin-Token = PROFILING_TOKEN)
+# /api/v1/admin/caches/recommendations [DELETE] (Requires X-Admin-Token; clears the cache in every worker)
\ No newline at end of file
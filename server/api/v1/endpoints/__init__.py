@@ -3,6 +3,8 @@ from .chat import router as chat_router
 from .hustles import router as hustles_router
 from .jobs import router as jobs_router
 from .profile import router as profile_router
+from .recommendations import router as recommendations_router
 from .reskilling import router as reskilling_router
 from .risk import router as risk_router
-from .auth import router as auth_router
\ No newline at end of file
+from .auth import router as auth_router
+from .admin import router as admin_router
\ No newline at end of file
@@ -0,0 +1,55 @@
+# api/v1/endpoints/admin.py
+from datetime import datetime, timezone
+from typing import List
+from fastapi import APIRouter, HTTPException, Response, status, Depends
+from fastapi.responses import FileResponse
+from models import ProfileInfo, ErrorResponse
+from services.profiling import request_profiler
+from services.recommendation_service import invalidate_recommendation_cache
+from dependencies import get_admin_token
+
+# Admin routes require the profiling token (X-Admin-Token), not the public API key
+router = APIRouter(dependencies=[Depends(get_admin_token)])
+
+@router.get(
+    "/admin/profiles",
+    response_model=List[ProfileInfo],
+    responses={403: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+)
+async def list_profiles():
+    """
+    Request profiles in the on-disk ring, newest first.
+    Requires PROFILING_TOKEN in the X-Admin-Token header.
+    """
+    return [
+        ProfileInfo(
+            id=entry.id, method=entry.method, path=entry.path, durationMs=entry.duration_ms,
+            sizeBytes=entry.size_bytes, createdAt=datetime.fromtimestamp(entry.created_at, timezone.utc),
+            format=entry.format,
+        )
+        for entry in request_profiler.ring.list()
+    ]
+
+@router.get(
+    "/admin/profiles/{profileId}",
+    response_class=FileResponse,
+    responses={403: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+)
+async def download_profile(profileId: str):
+    """Downloads one profile (pstats or speedscope JSON, see `format` in the listing)."""
+    found = request_profiler.ring.find(profileId)
+    if found is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    path, entry = found
+    media_type = "application/json" if entry.format == "speedscope" else "application/octet-stream"
+    return FileResponse(path, media_type=media_type, filename=entry.name)
+
+@router.delete(
+    "/admin/caches/recommendations",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={403: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+)
+async def clear_recommendation_cache():
+    """Clears the recommendation cache of every worker (this one right away, the others via the state backend)."""
+    invalidate_recommendation_cache()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
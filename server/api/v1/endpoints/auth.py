@@ -1,7 +1,7 @@
 # api/v1/endpoints/auth.py - Use JWT only for /me
 from fastapi import APIRouter, HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordRequestForm
-from models import UserCreate, UserProfileResponse, Token, ErrorResponse, UserDB # Import UserDB for /me response
+from models import UserCreate, UserProfileResponse, Token, ErrorResponse, UserDB, UserResponse # UserResponse is the public /me view of UserDB
 from services import auth_service
 from database import get_user_from_db # Needed to fetch user for /me after verify_token
 from dependencies import get_current_user # Import the JWT dependency
@@ -15,7 +15,7 @@ router = APIRouter(tags=["auth"])
     "/signup",
     response_model=UserProfileResponse, # Returning userId and message
     status_code=status.HTTP_201_CREATED,
-    responses={400: {"model": ErrorResponse}}
+    responses={400: {"model": ErrorResponse}, 409: {"model": ErrorResponse}}
 )
 async def signup(user_create: UserCreate):
     """
@@ -24,7 +24,7 @@ async def signup(user_create: UserCreate):
     Returns the user ID (of the auth entry).
     """
     try:
-        user_db_data = auth_service.create_user(user_create) # Creates UserDB with auth fields
+        user_db_data = await auth_service.create_user_async(user_create) # Creates UserDB with auth fields (bcrypt runs off the event loop)
         # Return response similar to profile submission, but for the auth user ID
         return UserProfileResponse(userId=user_db_data.id, message="User created successfully")
     except HTTPException as e:
@@ -45,7 +45,7 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     """
     Handles user login with email and password (form data) and returns a JWT access token.
     """
-    user = auth_service.authenticate_user(form_data.username, form_data.password)
+    user = await auth_service.authenticate_user_async(form_data.username, form_data.password)
 
     if not user:
         raise HTTPException(
@@ -64,7 +64,7 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
 
     return Token(access_token=access_token, token_type="bearer")
 
-@router.get("/me", response_model=UserDB, responses={401: {"model": ErrorResponse}})
+@router.get("/me", response_model=UserResponse, responses={401: {"model": ErrorResponse}})
 async def read_users_me(current_user: UserDB = Depends(get_current_user)):
     """
     Get details of the current authenticated user (from JWT token).
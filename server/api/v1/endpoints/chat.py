@@ -1,23 +1,19 @@
 # api/v1/endpoints/chat.py - Use API Key and userId in body
-from fastapi import APIRouter, HTTPException, status, Depends
-from models import ChatRequest, ChatResponse, ErrorResponse
+import json
+from typing import AsyncIterator
+from uuid import UUID
+from fastapi import APIRouter, HTTPException, status, Depends, Request, Response
+from fastapi.responses import StreamingResponse
+from models import ChatRequest, ChatResponse, ChatHistoryResponse, ChatTurn, ErrorResponse, UserDB
 from services import user_service, chat_service
-from dependencies import get_api_key # Use API Key dependency
+from services.chat_backend import ChatTimeoutError
+from dependencies import get_api_key, charge_user # Use API Key dependency
 
 # Apply API Key dependency to this router
 router = APIRouter(dependencies=[Depends(get_api_key)])
 
-@router.post(
-    "/chat", # Path is /chat
-    response_model=ChatResponse,
-    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 401: {"model": ErrorResponse}} # Add 401 for API key
-)
-# Accept ChatRequest with userId
-async def chat_with_ai_mentor(chat_request: ChatRequest):
-    """
-    Handles conversational queries with the AI mentor for a user identified by userId.
-    Requires API Key in X-API-Key header.
-    """
+async def _load_chat_user(chat_request: ChatRequest) -> UserDB:
+    """Validates the chat request and returns the user it refers to."""
     if not chat_request.message.strip():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -25,7 +21,7 @@ async def chat_with_ai_mentor(chat_request: ChatRequest):
         )
 
     # Get user data using the provided userId from the request body
-    user_data = user_service.get_user(chat_request.userId)
+    user_data = await user_service.get_user_async(chat_request.userId)
     if user_data is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -38,12 +34,120 @@ async def chat_with_ai_mentor(chat_request: ChatRequest):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User profile incomplete. Job title not found for this user ID to use chat features."
         )
+    return user_data
+
+@router.post(
+    "/chat", # Path is /chat
+    response_model=ChatResponse,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 401: {"model": ErrorResponse}, 504: {"model": ErrorResponse}} # Add 401 for API key
+)
+# Accept ChatRequest with userId
+async def chat_with_ai_mentor(chat_request: ChatRequest):
+    """
+    Handles conversational queries with the AI mentor for a user identified by userId.
+    Requires API Key in X-API-Key header.
+    """
+    user_data = await _load_chat_user(chat_request)
+    message = chat_request.message.strip()
+    history = await chat_service.conversation_store.get_async(user_data.id) # Snapshot; appends from here on don't touch it
 
+    try:
+        response_text = await chat_service.generate_chat_response(
+            message,
+            user_data.jobTitle,
+            user_data.interests,
+            history
+        )
+    except ChatTimeoutError as e:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=str(e)
+        )
 
-    response_text = chat_service.mock_chat_response(
-        chat_request.message.strip(),
-        user_data.jobTitle,
-        user_data.interests
+    await chat_service.conversation_store.record_exchange_async(user_data.id, message, response_text)
+    return ChatResponse(response=response_text)
+
+def _sse(data: dict, event: str = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+@router.post(
+    "/chat/stream",
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {"text/event-stream": {}}, "description": "Server-Sent Events: `data: {\"delta\": ...}` per chunk, then `event: done`"},
+        400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 401: {"model": ErrorResponse},
+    }
+)
+async def stream_chat_with_ai_mentor(chat_request: ChatRequest, request: Request):
+    """
+    Same as /chat, but streams the answer as Server-Sent Events while it is generated.
+    Generation stops when the client disconnects.
+    Requires API Key in X-API-Key header.
+    """
+    user_data = await _load_chat_user(chat_request)
+    message = chat_request.message.strip()
+    history = await chat_service.conversation_store.get_async(user_data.id)
+    producer = chat_service.get_response_producer()
+
+    async def events() -> AsyncIterator[str]:
+        # Each chunk is pulled from the producer only after the previous event
+        # was handed to the server, so a slow client slows generation down
+        # (backpressure) instead of piling chunks up in memory.
+        chunks = producer.stream(message, user_data.jobTitle, user_data.interests, history)
+        answer = []
+        try:
+            async for chunk in chunks:
+                if await request.is_disconnected():
+                    break
+                answer.append(chunk)
+                yield _sse({"delta": chunk})
+            else:
+                # Only complete answers go into the history
+                await chat_service.conversation_store.record_exchange_async(user_data.id, message, "".join(answer))
+                yield _sse({}, event="done")
+        except ChatTimeoutError as e:
+            yield _sse({"detail": str(e)}, event="error")
+        except Exception:
+            yield _sse({"detail": "Chat generation failed"}, event="error")
+        finally:
+            await chunks.aclose() # Stops the producer if we left early
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
-    return ChatResponse(response=response_text)
\ No newline at end of file
+@router.get(
+    "/chat/history/{userId}",
+    response_model=ChatHistoryResponse,
+    responses={404: {"model": ErrorResponse}, 401: {"model": ErrorResponse}}
+)
+async def get_chat_history(userId: UUID, request: Request):
+    """
+    Returns the recent chat turns kept for a user (bounded; older turns are trimmed).
+    Requires API Key in X-API-Key header.
+    """
+    user_data = await user_service.get_user_async(userId)
+    if user_data is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    charge_user(request, user_data)
+    history = await chat_service.conversation_store.get_async(userId) or ()
+    return ChatHistoryResponse(userId=userId, turns=[ChatTurn(role=turn.role, text=turn.text) for turn in history])
+
+@router.delete(
+    "/chat/history/{userId}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={401: {"model": ErrorResponse}}
+)
+async def clear_chat_history(userId: UUID):
+    """
+    Forgets a user's chat history.
+    Requires API Key in X-API-Key header.
+    """
+    await chat_service.conversation_store.clear_async(userId)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,8 +1,11 @@
 # api/v1/endpoints/profile.py - Use API Key
-from fastapi import APIRouter, HTTPException, status, Depends
-from models import UserProfileRequest, UserProfileResponse, ErrorResponse, UserDB # Ensure UserDB is imported if needed elsewhere, though not directly returned
-from services import user_service
-from dependencies import get_api_key # Use API Key dependency
+from fastapi import APIRouter, HTTPException, status, Depends, Request, Response
+from typing import Optional
+from uuid import UUID
+from models import UserProfileRequest, UserProfileResponse, ResumeUploadResponse, ErrorResponse, UserDB # Ensure UserDB is imported if needed elsewhere, though not directly returned
+from services import user_service, resume_service
+from api.v1.uploads import iter_upload
+from dependencies import get_api_key, check_not_modified, charge_user # Use API Key dependency
 
 # Apply API Key dependency to this router
 router = APIRouter(dependencies=[Depends(get_api_key)])
@@ -27,7 +30,7 @@ async def submit_user_profile(profile: UserProfileRequest):
         )
 
     # Call service to create a new profile entry
-    user_db_data = user_service.create_user_profile(profile)
+    user_db_data = await user_service.create_user_profile_async(profile)
 
     # Return the ID of the newly created profile entry
     return UserProfileResponse(userId=user_db_data.id, message="Profile submitted successfully")
@@ -39,19 +42,55 @@ async def submit_user_profile(profile: UserProfileRequest):
     status_code=status.HTTP_200_OK,
     responses={404: {"model": ErrorResponse}}
 )
-async def get_user_profile(user_id: str):
+async def get_user_profile(user_id: str, request: Request, response: Response):
     """
     Retrieves user profile information by user ID.
+    Supports If-None-Match (answers 304 when the profile is unchanged).
     Requires API Key in X-API-Key header.
     """
-    user_profile: Optional[UserDB] = user_service.get_user(user_id) # Returns UserDB or None
+    user_profile: Optional[UserDB] = await user_service.get_user_async(user_id) # Returns UserDB or None
     
     if not user_profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User profile not found" 
         )
+
+    charge_user(request, user_profile)
+    check_not_modified(request, response, user_profile)
     
     # *** This is the crucial part ***
     # Construct and return the UserProfileResponse object
-    return UserProfileResponse(userId=user_profile, message="User profile retrieved successfully")
\ No newline at end of file
+    return UserProfileResponse(userId=user_profile.id, message="User profile retrieved successfully")
+
+@router.post(
+    "/profile/{userId}/resume",
+    response_model=ResumeUploadResponse,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 413: {"model": ErrorResponse}, 401: {"model": ErrorResponse}}
+)
+async def upload_resume(userId: UUID, request: Request):
+    """
+    Uploads a resume as multipart/form-data (file field "resume") or as the raw
+    request body. The body is read in chunks and skills are extracted as it
+    arrives; the profile stores the skill set used by the recommendation routes.
+    Requires API Key in X-API-Key header.
+    """
+    user_data = await user_service.get_user_async(userId)
+    if user_data is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    charge_user(request, user_data)
+
+    try:
+        updated, bytes_read = await resume_service.ingest_resume(user_data, iter_upload(request, "resume"))
+    except resume_service.ResumeTooLargeError as e:
+        raise HTTPException(
+            status_code=413, # Content Too Large
+            detail=str(e)
+        )
+
+    return ResumeUploadResponse(
+        userId=updated.id, skills=updated.skills, bytesRead=bytes_read, storedOnDisk=updated.resumeFile is not None,
+    )
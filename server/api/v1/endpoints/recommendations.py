@@ -0,0 +1,77 @@
+# api/v1/endpoints/recommendations.py
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request, Response
+from uuid import UUID
+from models import RecommendationsResponse, ErrorResponse, BatchRequest, BatchRecommendationsResponse
+from services import user_service, recommendation_service, batch_service
+from dependencies import get_api_key, check_not_modified, charge_user
+
+router = APIRouter(dependencies=[Depends(get_api_key)])
+
+_INCLUDE_QUERY = Query(
+    ",".join(recommendation_service.RECOMMENDATION_SECTIONS),
+    description="Comma-separated sections to include: risk, jobs, reskilling, hustles",
+)
+
+def _parse_sections(include: str) -> set:
+    """Validates the include query parameter."""
+    sections = {section.strip().lower() for section in include.split(",") if section.strip()}
+    unknown = sections - set(recommendation_service.RECOMMENDATION_SECTIONS)
+    if unknown or not sections:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"include must list one or more of: {', '.join(recommendation_service.RECOMMENDATION_SECTIONS)}"
+        )
+    return sections
+
+@router.get(
+    "/recommendations/{userId}",
+    response_model=RecommendationsResponse,
+    response_model_exclude_none=True,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}, 401: {"model": ErrorResponse}}
+)
+async def get_recommendations(
+    userId: UUID,
+    request: Request,
+    response: Response,
+    include: str = _INCLUDE_QUERY,
+):
+    """
+    Returns risk, green jobs, reskilling courses and side hustles for a user in one response.
+    The profile is looked up once for all sections.
+    Supports If-None-Match; the ETag depends on the sections requested.
+    Requires API Key in X-API-Key header.
+    """
+    sections = recommendation_service.bundle_sections(_parse_sections(include)) # Validated before any lookup
+
+    user_data = await user_service.get_user_async(userId)
+    if user_data is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    charge_user(request, user_data)
+    check_not_modified(request, response, user_data, variant=".".join(sections))
+
+    if not user_data.jobTitle:
+         raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User profile incomplete. Job title not found for this user ID."
+        )
+
+    return recommendation_service.get_recommendation_bundle(user_data, sections)
+
+@router.post(
+    "/recommendations/batch",
+    response_model=BatchRecommendationsResponse,
+    response_model_exclude_none=True,
+    responses={400: {"model": ErrorResponse}, 401: {"model": ErrorResponse}}
+)
+async def get_recommendations_batch(batch: BatchRequest, include: str = _INCLUDE_QUERY):
+    """
+    Returns recommendation sections for many users and/or raw job titles.
+    Each distinct job title + interests pair is computed once and shared.
+    Results come back in request order with per-item errors.
+    Requires API Key in X-API-Key header.
+    """
+    sections = _parse_sections(include)
+    return BatchRecommendationsResponse(results=await batch_service.recommend_batch(batch.items, sections))
@@ -1,10 +1,12 @@
 # api/v1/endpoints/reskilling.py
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, Depends, Response
 from typing import List
 from uuid import UUID
-from models import ReskillingCourse, ErrorResponse
-from services import user_service, recommendation_service
-from dependencies import get_api_key
+from models import ReskillingCourse, ErrorResponse, UserDB
+from services import recommendation_service
+from dependencies import get_api_key, conditional_user_get
+from config import FAST_JSON_RESPONSES
+from api.v1.responses import PreEncodedJSONResponse
 
 router = APIRouter(dependencies=[Depends(get_api_key)])
 
@@ -13,19 +15,19 @@ router = APIRouter(dependencies=[Depends(get_api_key)])
     response_model=List[ReskillingCourse],
     responses={404: {"model": ErrorResponse}}
 )
-async def get_reskilling_recommendations(userId: UUID):
+async def get_reskilling_recommendations(userId: UUID, response: Response, user_data: UserDB = Depends(conditional_user_get)):
     """
     Returns reskilling course suggestions based on user profile.
     Returns up to 2 recommendations.
     Requires API Key in X-API-Key header.
     """
-    user_data = user_service.get_user(userId)
-    if user_data is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
+    if FAST_JSON_RESPONSES:
+        # Cached, already-encoded JSON; skips response_model re-validation
+        return PreEncodedJSONResponse(
+            recommendation_service.get_reskilling_courses_json(user_data.jobTitle, user_data.interests, user_data.skills),
+            headers_from=response,
         )
 
-    courses = recommendation_service.mock_get_reskilling_courses(user_data.jobTitle, user_data.interests)
+    courses = recommendation_service.get_reskilling_courses(user_data.jobTitle, user_data.interests, user_data.skills)
 
     return courses
\ No newline at end of file
@@ -1,9 +1,9 @@
 # api/v1/endpoints/risk.py - Use API Key and userId
 from fastapi import APIRouter, HTTPException, status, Depends
 from uuid import UUID
-from models import AutomationRiskResponse, ErrorResponse
-from services import user_service, recommendation_service
-from dependencies import get_api_key # Use API Key dependency
+from models import AutomationRiskResponse, ErrorResponse, BatchRequest, BatchRiskResponse, UserDB
+from services import recommendation_service, batch_service
+from dependencies import get_api_key, conditional_user_get # Use API Key dependency
 
 # Apply API Key dependency to this router
 router = APIRouter(dependencies=[Depends(get_api_key)])
@@ -14,19 +14,11 @@ router = APIRouter(dependencies=[Depends(get_api_key)])
     responses={404: {"model": ErrorResponse}, 401: {"model": ErrorResponse}} # Add 401 for API key
 )
 # Accept userId path parameter
-async def get_automation_risk(userId: UUID): # userId is back here
+async def get_automation_risk(userId: UUID, user_data: UserDB = Depends(conditional_user_get)): # Looked up (404) and ETag-checked by the dependency
     """
     Calculates the automation risk score for a user's job identified by userId.
     Requires API Key in X-API-Key header.
     """
-    # Get user data using the provided userId
-    user_data = user_service.get_user(userId)
-    if user_data is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-
     # Check if jobTitle exists for this profile entry
     if not user_data.jobTitle:
          raise HTTPException(
@@ -41,4 +33,19 @@ async def get_automation_risk(userId: UUID): # userId is back here
         jobTitle=user_data.jobTitle,
         riskScore=risk_score,
         explanation=explanation
-    )
\ No newline at end of file
+    )
+
+@router.post(
+    "/risk/batch",
+    response_model=BatchRiskResponse,
+    response_model_exclude_none=True,
+    responses={401: {"model": ErrorResponse}, 422: {"model": ErrorResponse}}
+)
+async def get_automation_risk_batch(batch: BatchRequest):
+    """
+    Scores automation risk for many users and/or raw job titles in one call.
+    Results come back in request order; items that fail carry an `error`
+    instead of failing the whole batch.
+    Requires API Key in X-API-Key header.
+    """
+    return BatchRiskResponse(results=await batch_service.score_risk_batch(batch.items))
@@ -0,0 +1,155 @@
+# api/v1/middleware.py
+import asyncio
+import json
+import time
+
+from services.admission import AdmissionController, admission_controller, classify, client_key, user_key
+from services.metrics import Histogram, registry
+from services.profiling import ProfileRing, RequestProfiler, request_profiler
+from config import API_KEY_NAME, PROFILING_HEADER
+
+_API_KEY_HEADER = API_KEY_NAME.lower().encode()
+_PROFILING_HEADER = PROFILING_HEADER.lower().encode()
+
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds", "Request latency by route template.", ("method", "route", "status"),
+)
+
+
+class AdmissionMiddleware:
+    """
+    Pure ASGI middleware in front of every route: classifies the request,
+    asks the admission controller whether to take it, and either answers
+    429/503 with Retry-After right away or tracks it as in flight until the
+    response (including a streamed one) has finished.
+    """
+
+    def __init__(self, app, controller: AdmissionController = admission_controller):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        controller = self.controller
+        controller.monitor.ensure_started()
+        route_class = classify(scope["path"])
+
+        api_key = authorization = None
+        for name, value in scope["headers"]:
+            if name == _API_KEY_HEADER:
+                api_key = value.decode("latin-1")
+            elif name == b"authorization":
+                authorization = value.decode("latin-1")
+        client = scope.get("client")
+        key = client_key(route_class, api_key, client[0] if client else None)
+
+        user = user_key(authorization)
+        rejection = controller.admit(route_class, key, user)
+        if rejection is not None:
+            await _reject(send, rejection.status, rejection.retry_after, rejection.detail)
+            return
+
+        if user is not None:
+            scope.setdefault("state", {})["admission_user"] = user # Already charged; see dependencies.charge_user
+        controller.enter(route_class)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.leave(route_class)
+
+
+async def _reject(send, status: int, retry_after: int, detail: str) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(retry_after).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class MetricsMiddleware:
+    """
+    Records every request's latency in http_request_duration_seconds, labelled
+    by method, route template (e.g. /api/v1/jobs/{userId}, so user IDs don't
+    explode the label set) and status code.
+    """
+
+    def __init__(self, app, histogram: Histogram = http_request_duration_seconds):
+        self.app = app
+        self.histogram = histogram
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500 # Reported if the app raises before starting a response
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route") # Set by the router once a route matched
+            self.histogram.observe(
+                time.perf_counter() - start, scope["method"], route.path if route is not None else "unmatched", str(status),
+            )
+
+
+class ProfilingMiddleware:
+    """
+    Profiles requests selected by the debug header or per-route sampling (see
+    services/profiling.py) and writes the result to the profile ring. The
+    response of a profiled request carries X-Profile-Id. Only installed when
+    PROFILING_ENABLED is set; unselected requests cost one header scan and a
+    random() draw.
+    """
+
+    def __init__(self, app, profiler: RequestProfiler = request_profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        header = None
+        for name, value in scope["headers"]:
+            if name == _PROFILING_HEADER:
+                header = value.decode("latin-1")
+                break
+        if not self.profiler.wants(scope["path"], header):
+            await self.app(scope, receive, send)
+            return
+        profile = self.profiler.begin()
+        if profile is None: # Another request is being profiled
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = ProfileRing.new_id()
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message = dict(message, headers=list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())])
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            duration = time.perf_counter() - start
+            data, format = self.profiler.end(profile)
+            await asyncio.to_thread(
+                self.profiler.ring.save, profile_id, scope["method"], scope["path"], duration, data, format,
+            )
@@ -0,0 +1,40 @@
+# api/v1/responses.py
+from typing import Iterable, Optional, Union
+
+from fastapi import Response
+
+# Headers FastAPI's placeholder response carries that must not leak into ours
+_SKIPPED_HEADERS = {"content-length", "content-type"}
+
+
+class PreEncodedJSONResponse(Response):
+    """
+    JSON response built from already-encoded fragments.
+
+    Returning a Response from an endpoint makes FastAPI skip response_model
+    validation and serialization entirely, so only use this for trusted
+    internal data whose JSON was produced from the same models (e.g. the
+    recommendation cache). A list of fragments is sent as a JSON array.
+    """
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: Union[bytes, Iterable[bytes]],
+        status_code: int = 200,
+        headers_from: Optional[Response] = None,
+        **kwargs,
+    ):
+        headers = kwargs.pop("headers", None) or {}
+        if headers_from is not None:
+            # Carry over headers set by dependencies (e.g. ETag), which FastAPI
+            # does not merge into responses returned directly by the endpoint
+            for name, value in headers_from.headers.items():
+                if name not in _SKIPPED_HEADERS:
+                    headers[name] = value
+        super().__init__(content, status_code=status_code, headers=headers, **kwargs)
+
+    def render(self, content) -> bytes:
+        if isinstance(content, (bytes, bytearray)):
+            return bytes(content)
+        return b"[" + b",".join(content) + b"]"
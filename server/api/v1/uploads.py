@@ -0,0 +1,90 @@
+# api/v1/uploads.py
+from typing import AsyncIterator, List
+
+from fastapi import HTTPException, Request, status
+
+
+def _multipart_module():
+    # Imported on first multipart upload. Older releases install as `multipart`;
+    # neither is required for raw uploads.
+    try:
+        import python_multipart as multipart
+    except ModuleNotFoundError:
+        try:
+            import multipart
+        except ModuleNotFoundError:
+            return None
+    return multipart
+
+
+async def iter_upload(request: Request, field: str) -> AsyncIterator[bytes]:
+    """
+    Yields the bytes of an uploaded file as they arrive, without buffering the
+    whole body. Accepts either multipart/form-data (the part named `field`) or
+    a raw request body (e.g. text/plain).
+    """
+    content_type = request.headers.get("content-type", "")
+    if not content_type.startswith("multipart/form-data"):
+        async for chunk in request.stream():
+            if chunk:
+                yield chunk
+        return
+
+    multipart = _multipart_module()
+    if multipart is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="multipart uploads need python-multipart; send the file as the raw request body instead"
+        )
+    _, params = multipart.multipart.parse_options_header(content_type)
+    if b"boundary" not in params:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing multipart boundary")
+
+    wanted = field.encode()
+    ready: List[bytes] = []
+    state = {"header": b"", "value": b"", "selected": False, "found": False}
+
+    def on_part_begin() -> None:
+        state["selected"] = False
+
+    def on_header_field(data: bytes, start: int, end: int) -> None:
+        state["header"] += data[start:end]
+
+    def on_header_value(data: bytes, start: int, end: int) -> None:
+        state["value"] += data[start:end]
+
+    def on_header_end() -> None:
+        if state["header"].lower() == b"content-disposition" and not state["found"]:
+            _, options = multipart.multipart.parse_options_header(state["value"])
+            if options.get(b"name") == wanted:
+                state["selected"] = state["found"] = True # Only the first matching part is used
+        state["header"], state["value"] = b"", b""
+
+    def on_part_data(data: bytes, start: int, end: int) -> None:
+        if state["selected"]:
+            ready.append(data[start:end])
+
+    parser = multipart.MultipartParser(params[b"boundary"], {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_part_data": on_part_data,
+    })
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            if ready:
+                data = b"".join(ready)
+                ready.clear()
+                yield data
+        parser.finalize()
+    except multipart.exceptions.MultipartParseError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Malformed multipart body")
+    if ready:
+        yield b"".join(ready)
+    if not state["found"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Missing '{field}' file in multipart body"
+        )
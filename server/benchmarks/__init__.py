@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+# Run benchmarks from the server directory, e.g. `python -m benchmarks.login_storm`.
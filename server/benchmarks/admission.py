@@ -0,0 +1,129 @@
+# benchmarks/admission.py
+"""
+Synthetic overload: an open-loop generator fires a mixed workload (reads,
+chat, logins, large batches) at a fixed arrival rate, well past what one
+worker can serve, while a prober polls /me. Runs once with admission control
+off and once with it on, and reports per route class how many requests were
+served or shed (429/503), their latency, the /me latency and the worst
+event-loop lag.
+
+    python -m benchmarks.admission --rate 400 --duration 5 --user-rate 5
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+
+from benchmarks.common import api_key_headers, make_client, summarize
+from main import app
+from services.admission import TokenBuckets, admission_controller, classify
+from services.loop_monitor import loop_monitor
+
+# (weight, request factory) - factories take (client, context, rng)
+def _jobs(client, ctx, rng):
+    return client.get(f"/api/v1/jobs/{rng.choice(ctx['users'])}", headers=ctx["headers"])
+
+def _chat(client, ctx, rng):
+    return client.post("/api/v1/chat", headers=ctx["headers"], json={"userId": rng.choice(ctx["users"]), "message": "what next?"})
+
+def _login(client, ctx, rng):
+    return client.post("/api/v1/token", data={"username": ctx["email"], "password": ctx["password"]})
+
+def _batch(client, ctx, rng):
+    items = [{"jobTitle": f"{rng.choice(ctx['titles'])} {i}"} for i in range(ctx["batch_size"])]
+    return client.post("/api/v1/recommendations/batch?include=risk,jobs", headers=ctx["headers"], json={"items": items})
+
+_MIX = ((60, "/api/v1/jobs/x", _jobs), (20, "/api/v1/chat", _chat), (10, "/api/v1/token", _login), (10, "/api/v1/recommendations/batch", _batch))
+
+
+async def _timed(request, route_class: str, results):
+    start = time.perf_counter()
+    response = await request
+    results[route_class].append((response.status_code, time.perf_counter() - start))
+
+
+async def _probe(client, ctx, stop: asyncio.Event, samples: list, interval: float = 0.01):
+    # Latency is measured from when each probe was due, so time spent waiting
+    # for a blocked loop counts against /me too
+    headers = {"Authorization": f"Bearer {ctx['token']}"}
+    due = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(max(0.0, due - time.perf_counter()))
+        response = await client.get("/api/v1/me", headers=headers)
+        samples.append(time.perf_counter() - due)
+        assert response.status_code == 200, response.status_code
+        due = max(due + interval, time.perf_counter())
+
+
+async def _phase(client, ctx, rate: float, duration: float, seed: int):
+    rng = random.Random(seed)
+    weights = [weight for weight, _, _ in _MIX]
+    results = defaultdict(list)
+    me_samples: list = []
+    stop = asyncio.Event()
+    prober = asyncio.create_task(_probe(client, ctx, stop, me_samples))
+    tasks = []
+    start = time.perf_counter()
+    sent, total = 0, int(rate * duration)
+    while sent < total:
+        # Open loop: arrivals follow the clock, not completions (late ones are sent as soon as the loop gets here)
+        due = min(total, int((time.perf_counter() - start) * rate)) - sent
+        for _ in range(due):
+            _, path, factory = rng.choices(_MIX, weights)[0]
+            tasks.append(asyncio.create_task(_timed(factory(client, ctx, rng), classify(path).name, results)))
+        sent += due
+        await asyncio.sleep(0.005)
+    await asyncio.gather(*tasks)
+    stop.set()
+    await prober
+    return results, me_samples
+
+
+def _report(label: str, results, me_samples, elapsed: float) -> None:
+    print(f"\n{label} ({elapsed:.1f}s, max loop lag {loop_monitor.max_lag() * 1000:.0f} ms)")
+    print(f"  {'class':<8} {'sent':>6} {'ok':>6} {'429':>6} {'503':>6} {'ok p50 ms':>10} {'ok p99 ms':>10}")
+    for name, rows in sorted(results.items()):
+        ok = [elapsed for status, elapsed in rows if status < 400]
+        count = lambda code: sum(1 for status, _ in rows if status == code)
+        stats = summarize(ok)
+        print(f"  {name:<8} {len(rows):>6} {len(ok):>6} {count(429):>6} {count(503):>6} {stats['p50_ms']:>10.1f} {stats['p99_ms']:>10.1f}")
+    me = summarize(me_samples)
+    print(f"  /me      probes {me['count']}, p50 {me['p50_ms']:.1f} ms, p99 {me['p99_ms']:.1f} ms, max {max(me_samples, default=0) * 1000:.1f} ms")
+
+
+async def run(rate: float, duration: float, user_rate: float, batch_size: int) -> None:
+    async with make_client(app) as client:
+        headers = api_key_headers()
+        email, password = "admission@example.com", "admission-pass"
+        await client.post("/api/v1/signup", json={"email": email, "password": password})
+        token = (await client.post("/api/v1/token", data={"username": email, "password": password})).json()["access_token"]
+        users = []
+        for i in range(20):
+            user_id = (await client.post("/api/v1/signup", json={"email": f"load{i}@example.com", "password": "load-pass"})).json()["userId"]
+            await client.post("/api/v1/profile", headers=headers, json={"id": user_id, "jobTitle": "Cashier", "interests": "solar"})
+            users.append(user_id)
+        ctx = {
+            "headers": headers, "email": email, "password": password, "token": token, "users": users,
+            "titles": ["Cashier", "Teacher", "Driver", "Data Entry Clerk", "Assembler"], "batch_size": batch_size,
+        }
+
+        for enabled in (False, True):
+            admission_controller.enabled = enabled
+            admission_controller.user_buckets = TokenBuckets(user_rate, user_rate * 2) if enabled and user_rate > 0 else None
+            admission_controller.reset_counters()
+            loop_monitor._max_lag = 0.0
+            start = time.perf_counter()
+            results, me_samples = await _phase(client, ctx, rate, duration, seed=1)
+            _report(f"admission control {'on' if enabled else 'off'}", results, me_samples, time.perf_counter() - start)
+            await asyncio.sleep(1) # Let the lag estimate decay between phases
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=float, default=400, help="arrivals per second")
+    parser.add_argument("--duration", type=float, default=5, help="seconds of load per phase")
+    parser.add_argument("--user-rate", type=float, default=5, help="per-user requests/s when admission control is on (0 = off)")
+    parser.add_argument("--batch-size", type=int, default=500, help="items per batch request")
+    args = parser.parse_args()
+    asyncio.run(run(args.rate, args.duration, args.user_rate, args.batch_size))
@@ -0,0 +1,81 @@
+# benchmarks/chat_batching.py
+"""
+Offline throughput of the chat scheduler against the latency-simulating stub
+backend. Compares one backend call per request (max batch size 1, no
+coalescing benefit) with micro-batching, at a few duplicate-prompt rates.
+
+    python -m benchmarks.chat_batching --requests 2000 --concurrency 200
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from benchmarks.common import summarize
+from services.chat_backend import ChatPrompt, LocalStubBackend, MicroBatchScheduler
+
+_MESSAGES = [
+    "What should my next career path be?",
+    "Any green job ideas for me?",
+    "Which courses should I take to reskill?",
+    "How can I earn extra income on the side?",
+    "What is my automation risk?",
+]
+_PROFILES = [("Retail cashier", "sustainability"), ("Teacher", "education, climate"), ("Truck driver", None)]
+
+
+def _prompts(count: int, duplicate_rate: float, rng: random.Random):
+    prompts = []
+    for index in range(count):
+        job_title, interests = rng.choice(_PROFILES)
+        if rng.random() < duplicate_rate:
+            message = rng.choice(_MESSAGES)
+        else:
+            message = f"{rng.choice(_MESSAGES)} (request {index})"
+        prompts.append(ChatPrompt(message, job_title, interests))
+    return prompts
+
+
+async def _run(scheduler: MicroBatchScheduler, prompts, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    samples = []
+
+    async def one(prompt):
+        async with semaphore:
+            start = time.perf_counter()
+            await scheduler.submit(prompt)
+            samples.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(prompt) for prompt in prompts))
+    return time.perf_counter() - start, samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--call-latency-ms", type=float, default=50)
+    parser.add_argument("--item-latency-ms", type=float, default=2)
+    parser.add_argument("--backend-concurrency", type=int, default=4)
+    parser.add_argument("--max-batch-size", type=int, default=16)
+    parser.add_argument("--max-wait-ms", type=float, default=5)
+    parser.add_argument("--duplicate-rates", type=float, nargs="+", default=[0.0, 0.5])
+    args = parser.parse_args()
+
+    print(f"{'mode':<10} {'dups':>5} {'req/s':>9} {'calls':>6} {'coalesced':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for duplicate_rate in args.duplicate_rates:
+        prompts = _prompts(args.requests, duplicate_rate, random.Random(42))
+        for mode, batch_size in (("single", 1), ("batched", args.max_batch_size)):
+            backend = LocalStubBackend(args.call_latency_ms / 1000, args.item_latency_ms / 1000, args.backend_concurrency)
+            scheduler = MicroBatchScheduler(backend, max_batch_size=batch_size, max_wait=args.max_wait_ms / 1000, timeout=600)
+            elapsed, samples = asyncio.run(_run(scheduler, prompts, args.concurrency))
+            summary = summarize(samples)
+            print(
+                f"{mode:<10} {duplicate_rate:>5.2f} {len(prompts) / elapsed:>9.0f} {backend.calls:>6} "
+                f"{scheduler.coalesced:>10} {summary['p50_ms']:>8.1f} {summary['p99_ms']:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
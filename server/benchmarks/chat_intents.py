@@ -0,0 +1,105 @@
+# benchmarks/chat_intents.py
+"""
+Intent classification cost on long, realistic chat messages: the registry
+classifier vs. the previous chain of `any(keyword in message ...)` scans.
+Also shows how the classifier scales as more intents are registered, and
+with --crossover times the keyword matcher's two strategies (substring
+scan, automaton) by keyword count to place SMALL_SET_THRESHOLD.
+
+    python -m benchmarks.chat_intents --messages 200 --extra-intents 0 50 200
+    python -m benchmarks.chat_intents --crossover
+"""
+import argparse
+import random
+import string
+import timeit
+
+from services.chat_service import intent_classifier
+from services.intent_classifier import IntentClassifier
+from services.keyword_matcher import KeywordMatcher
+
+_SENTENCES = [
+    "I have worked as a retail cashier for seven years and I am worried about self-checkout machines.",
+    "My manager says the store might cut hours next year, so I want to understand my options.",
+    "I care a lot about the environment and volunteer at a community garden on weekends.",
+    "Here is my resume: customer service, cash handling, inventory counts, training new staff.",
+    "I am not sure whether I should go back to school or look for something online.",
+    "Could you explain what the day to day looks like in those roles and what they pay?",
+]
+
+_LEGACY_CHAIN = [
+    ["next", "future", "path", "transition"],
+    ["green job", "eco job", "sustainable career"],
+    ["reskilling", "courses", "learn", "train"],
+    ["side hustle", "extra income", "part-time"],
+    ["risk", "automate", "obsolete"],
+]
+
+
+def _corpus(count: int, rng: random.Random):
+    # Pasted messages of roughly 1-8 KB
+    return [" ".join(rng.choice(_SENTENCES) for _ in range(rng.randint(10, 80))) for _ in range(count)]
+
+
+def _legacy_classify(message: str):
+    message_lower = message.lower()
+    for index, keywords in enumerate(_LEGACY_CHAIN):
+        if any(keyword in message_lower for keyword in keywords):
+            return index
+    return None
+
+
+def _with_extra_intents(extra: int, rng: random.Random) -> IntentClassifier:
+    classifier = IntentClassifier()
+    for intent in intent_classifier.intents:
+        classifier.register(intent.name, intent.keywords, intent.respond)
+    for i in range(extra):
+        keywords = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 9))) for _ in range(4)]
+        classifier.register(f"extra{i}", keywords, lambda context: "")
+    return classifier
+
+
+def crossover(messages: int) -> None:
+    rng = random.Random(4)
+    corpus = [m.lower() for m in _corpus(messages, rng)]
+    print(f"keyword matcher on {messages} messages (us/message)")
+    for size in (25, 50, 100, 150, 200, 300, 400):
+        keywords = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))) for _ in range(size)]
+        matcher = KeywordMatcher((keyword, keyword) for keyword in keywords)
+        timings = []
+        for substring_scan in (True, False):
+            matcher.substring_scan = substring_scan
+            timings.append(timeit.timeit(lambda: [matcher.find_all(m) for m in corpus], number=3) / 3 / messages * 1e6)
+        print(f"  {size:4d} keywords: substring scan {timings[0]:8.1f}  automaton {timings[1]:8.1f}")
+
+
+def main(messages: int, extras) -> None:
+    rng = random.Random(3)
+    corpus = _corpus(messages, rng)
+    chars = sum(len(m) for m in corpus)
+    legacy = timeit.timeit(lambda: [_legacy_classify(m) for m in corpus], number=5) / 5
+    print(f"{messages} messages, {chars / messages:,.0f} chars on average")
+    print(f"  legacy if/elif chain       : {legacy / messages * 1e6:8.1f} us/message")
+    intents = intent_classifier.intents
+    differ = sum(
+        intent_classifier.classify(m) is not (None if index is None else intents[index])
+        for m, index in ((m, _legacy_classify(m)) for m in corpus)
+    )
+    print(f"  messages where weighting picks another intent than the chain: {differ}")
+    for extra in extras:
+        classifier = _with_extra_intents(extra, rng)
+        elapsed = timeit.timeit(lambda: [classifier.classify(m) for m in corpus], number=5) / 5
+        keywords = sum(len(intent.keywords) for intent in classifier.intents)
+        print(f"  classifier, {keywords:4d} keywords : {elapsed / messages * 1e6:8.1f} us/message")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--extra-intents", type=int, nargs="+", default=[0, 50, 200])
+    parser.add_argument("--crossover", action="store_true", help="time the matcher strategies by keyword count")
+    args = parser.parse_args()
+    if args.crossover:
+        crossover(args.messages // 4 or 1)
+    else:
+        main(args.messages, args.extra_intents)
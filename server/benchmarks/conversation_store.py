@@ -0,0 +1,93 @@
+# benchmarks/conversation_store.py
+"""
+Chat history store with many concurrent sessions: resident bytes per session,
+append / read latency, and behaviour once the global cap forces LRU eviction.
+The read path (a tuple snapshot of the turns) is compared with copying the
+transcript into dicts each turn (what resending or rebuilding the whole
+history would cost).
+
+    python -m benchmarks.conversation_store --sessions 100000 --turns 20
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+import uuid
+
+from benchmarks.common import summarize
+from services.conversation_store import ASSISTANT, USER, ConversationStore
+
+_QUESTIONS = [
+    "What green jobs fit someone like me?",
+    "Which courses should I take first?",
+    "Tell me more about that.",
+    "Is my job at risk from automation?",
+]
+
+
+def _fill(store: ConversationStore, user_ids, turns: int, rng: random.Random) -> None:
+    for _ in range(turns // 2):
+        for user_id in user_ids:
+            question = rng.choice(_QUESTIONS)
+            store.append(user_id, USER, question)
+            store.append(user_id, ASSISTANT, (question + " ") * 6) # A fresh ~240-char answer string per turn
+
+
+def _latency(store: ConversationStore, user_ids, samples: int, rng: random.Random):
+    appends, reads, copies = [], [], []
+    for _ in range(samples):
+        user_id = rng.choice(user_ids)
+        start = time.perf_counter()
+        history = store.get(user_id)
+        last = history.last(USER) if history else None
+        reads.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        transcript = [{"role": turn.role, "text": turn.text} for turn in history] if history else []
+        copies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        store.append(user_id, USER, last.text if last else _QUESTIONS[0])
+        appends.append(time.perf_counter() - start)
+    del transcript
+    return summarize(reads), summarize(copies), summarize(appends)
+
+
+def main(sessions: int, turns: int, samples: int) -> None:
+    rng = random.Random(42)
+    user_ids = [uuid.uuid4() for _ in range(sessions)]
+
+    gc.collect()
+    tracemalloc.start()
+    store = ConversationStore(max_turns=turns, max_chars=8000, max_sessions=sessions, max_total_chars=10**12)
+    _fill(store, user_ids, turns, rng)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stats = store.stats()
+    print(f"{sessions} sessions x {turns} turns: {current / 2**20:,.0f} MiB, "
+          f"{current / sessions:,.0f} bytes/session ({stats['total_chars'] / sessions:,.0f} chars of text)")
+
+    reads, copies, appends = _latency(store, user_ids, samples, rng)
+    for name, summary in (("get + last turn", reads), ("copy transcript", copies), ("append", appends)):
+        print(f"  {name:<16} p50 {summary['p50_ms'] * 1000:7.2f} us   p99 {summary['p99_ms'] * 1000:7.2f} us")
+
+    # Half the text budget: every append past the cap evicts the idlest session
+    capped = ConversationStore(max_turns=turns, max_chars=8000, max_sessions=sessions,
+                               max_total_chars=stats["total_chars"] // 2)
+    start = time.perf_counter()
+    _fill(capped, user_ids, turns, rng)
+    elapsed = time.perf_counter() - start
+    capped_stats = capped.stats()
+    print(f"  with a cap at 50% of that text: {len(capped)} sessions kept, {capped_stats['evictions']} evictions, "
+          f"{elapsed / (sessions * turns) * 1e6:.2f} us/append")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--samples", type=int, default=20_000)
+    args = parser.parse_args()
+    main(args.sessions, args.turns, args.samples)
@@ -0,0 +1,151 @@
+# benchmarks/metrics_overhead.py
+"""
+Cost of the metrics instrumentation (MetricsMiddleware plus the service
+function timers), measured two ways:
+
+- end to end: the same request mix served with METRICS_ENABLED on and off,
+  each in fresh processes, alternating so machine noise hits both sides.
+  On a busy machine the process-to-process spread can exceed the overhead;
+- by component, in one process: the cost of one middleware pass and one
+  timer call (interleaved with/without runs), times how many of each a
+  request of the mix makes, relative to the request time.
+
+Requests go straight to the ASGI app (no HTTP client), so only server-side
+cost is compared.
+
+    python -m benchmarks.metrics_overhead --requests 3000 --pairs 3
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+
+async def _serve_mix(requests: int, rounds: int) -> float:
+    """Best wall time of `rounds` passes over a read-route mix."""
+    from benchmarks.common import api_key_headers, asgi_get
+    from database import create_user_in_db
+    from models import UserDB
+    from main import app
+
+    headers = api_key_headers()
+    users = [
+        str(create_user_in_db(UserDB(jobTitle=title, interests="recycling")).id)
+        for title in ("Cashier", "Teacher", "Solar Installer", "Barista")
+    ]
+    paths = [
+        f"/api/v1/{route}/{user_id}"
+        for user_id in users
+        for route in ("risk", "jobs", "reskilling", "hustles", "recommendations")
+    ]
+    for path in paths:
+        assert await asgi_get(app, path, headers) == 200, path
+
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for i in range(requests):
+            await asgi_get(app, paths[i % len(paths)], headers)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+async def _components(requests: int, rounds: int, calls: int = 50_000) -> dict:
+    from api.v1.middleware import MetricsMiddleware
+    from services.metrics import Histogram, service_function_seconds, timed
+
+    def timer_calls() -> int:
+        return sum(sum(row[:-1]) for row in service_function_seconds.collect().values())
+
+    before = timer_calls()
+    request_s = await _serve_mix(requests, rounds) / requests
+    timers_per_request = (timer_calls() - before) / (requests * rounds + 20) # + the 20 warm-up requests
+
+    async def noop_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def discard(message):
+        pass
+
+    async def time_app(app) -> float:
+        start = time.perf_counter()
+        for _ in range(calls):
+            await app({"type": "http", "method": "GET", "path": "/"}, None, discard)
+        return time.perf_counter() - start
+
+    def time_function(func) -> float:
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        return time.perf_counter() - start
+
+    def function():
+        return None
+
+    wrapped = MetricsMiddleware(noop_app, Histogram("bench_seconds", "", ("method", "route", "status")))
+    timed_function = timed("bench")(function)
+    app_plain = app_wrapped = func_plain = func_timed = float("inf")
+    for _ in range(rounds): # Interleaved, best of each
+        app_plain = min(app_plain, await time_app(noop_app))
+        app_wrapped = min(app_wrapped, await time_app(wrapped))
+        func_plain = min(func_plain, time_function(function))
+        func_timed = min(func_timed, time_function(timed_function))
+    middleware_s = max(0.0, app_wrapped - app_plain) / calls
+    timer_s = max(0.0, func_timed - func_plain) / calls
+
+    return {
+        "request_us": request_s * 1e6,
+        "middleware_us": middleware_s * 1e6,
+        "timer_us": timer_s * 1e6,
+        "timers_per_request": timers_per_request,
+        "overhead_pct": (middleware_s + timers_per_request * timer_s) / request_s * 100,
+    }
+
+
+def _run_child(enabled: bool, requests: int, rounds: int) -> float:
+    env = dict(os.environ, METRICS_ENABLED="true" if enabled else "false", WARMUP_ON_STARTUP="false")
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.metrics_overhead", "--child", "--requests", str(requests), "--rounds", str(rounds)],
+        env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=3000, help="requests per round")
+    parser.add_argument("--rounds", type=int, default=5, help="rounds per measurement (the best one counts)")
+    parser.add_argument("--pairs", type=int, default=3, help="on/off process pairs for the end-to-end comparison")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(_serve_mix(args.requests, args.rounds))))
+        return
+
+    off, on = [], []
+    for _ in range(args.pairs):
+        off.append(_run_child(False, args.requests, args.rounds))
+        on.append(_run_child(True, args.requests, args.rounds))
+    best_off, best_on = min(off), min(on)
+    print("end to end (separate processes)")
+    print(f"  metrics off: {args.requests / best_off:>8.0f} req/s ({best_off / args.requests * 1e6:.1f} us/request)")
+    print(f"  metrics on:  {args.requests / best_on:>8.0f} req/s ({best_on / args.requests * 1e6:.1f} us/request)")
+    print(f"  overhead:    {(best_on / best_off - 1) * 100:+.2f}%")
+
+    # This process hasn't imported the app yet, so the instrumentation is built in
+    os.environ["METRICS_ENABLED"] = "true"
+    parts = asyncio.run(_components(args.requests, args.rounds))
+    print("by component (one process)")
+    print(f"  request:     {parts['request_us']:.1f} us")
+    print(f"  middleware:  {parts['middleware_us']:.2f} us per request")
+    print(f"  timers:      {parts['timers_per_request']:.1f} per request x {parts['timer_us']:.2f} us")
+    print(f"  overhead:    {parts['overhead_pct']:.2f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# benchmarks/occupation_taxonomy.py
+"""
+Occupation dataset construction time (lazy, so worker startup pays only
+this), load time on first use, index memory and title resolution latency at
+several dataset sizes (synthetic CSVs written to a temp dir). Lookups are
+timed uncached (exact title, title inside a longer free-text title, title
+with a typo) and cached (memo hit).
+
+    python -m benchmarks.occupation_taxonomy --occupations 1000 10000 100000
+"""
+import argparse
+import csv
+import gc
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.common import summarize
+from services.occupation_taxonomy import OccupationTaxonomy
+
+_LEVELS = ["", "Senior", "Junior", "Lead", "Assistant", "Chief", "Trainee", "Principal"]
+_FIELDS = (
+    "Retail Warehouse Solar Wind Hydro Marine Agricultural Forestry Medical Dental Veterinary Legal Financial "
+    "Insurance Software Hardware Network Database Civil Mechanical Electrical Chemical Environmental Water "
+    "Transport Aviation Rail Logistics Food Hospitality Construction Mining Textile Printing Media Education"
+).split()
+_ROLES = (
+    "Cashier Clerk Technician Engineer Analyst Manager Coordinator Specialist Inspector Operator Assistant "
+    "Consultant Planner Designer Administrator Supervisor Officer Advisor Installer Mechanic Driver Teacher"
+).split()
+
+
+def _titles(count: int, rng: random.Random):
+    seen = set()
+    while len(seen) < count:
+        # Beyond the combinations above, add a numbered specialty so large datasets stay unique
+        parts = [rng.choice(_LEVELS), rng.choice(_FIELDS), rng.choice(_ROLES)]
+        if len(seen) > len(_LEVELS) * len(_FIELDS) * len(_ROLES) // 2:
+            parts.append(f"Grade {rng.randint(1, count)}")
+        title = " ".join(part for part in parts if part)
+        if title not in seen:
+            seen.add(title)
+            yield title
+
+
+def _write_csv(path: str, titles) -> None:
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["title", "risk_score", "explanation", "synonyms"])
+        for index, title in enumerate(titles):
+            writer.writerow([
+                title, index % 101,
+                f"{title} work mixes routine tasks with judgement; estimated exposure to automation tools.",
+                title.replace("Senior", "Sr").replace("Assistant", "Asst") if index % 3 == 0 else "",
+            ])
+
+
+def _typo(title: str, rng: random.Random) -> str:
+    position = rng.randrange(1, len(title) - 1)
+    return title[:position] + title[position + 1:] # Drop one character
+
+
+def _time_lookups(taxonomy: OccupationTaxonomy, queries, cached: bool):
+    taxonomy._resolve_normalized.cache_clear()
+    if cached:
+        for query in queries:
+            taxonomy.resolve(query)
+    samples, misses = [], 0
+    for query in queries:
+        start = time.perf_counter()
+        result = taxonomy.resolve(query)
+        samples.append(time.perf_counter() - start)
+        misses += result is None
+    return summarize(samples), misses
+
+
+def main(sizes, lookups: int) -> None:
+    rng = random.Random(3)
+    print(f"{'occupations':>11} {'init us':>8} {'load ms':>8} {'index MiB':>9}   lookup p50/p99 us (misses)")
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            titles = list(_titles(size, rng))
+            path = os.path.join(workdir, f"occupations-{size}.csv")
+            _write_csv(path, titles)
+
+            start = time.perf_counter()
+            taxonomy = OccupationTaxonomy(path)
+            construct = time.perf_counter() - start
+            start = time.perf_counter()
+            taxonomy.resolve(titles[0]) # First use loads the file
+            load = time.perf_counter() - start
+
+            gc.collect()
+            tracemalloc.start() # Separate instance: tracemalloc would inflate the load time
+            OccupationTaxonomy(path).resolve(titles[0])
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+
+            sample = rng.sample(titles, min(lookups, len(titles)))
+            workloads = {
+                "exact": sample,
+                "contained": [f"{title} at Acme Corp" for title in sample],
+                "typo": [_typo(title, rng) for title in sample],
+            }
+            cells = []
+            for name, queries in workloads.items():
+                summary, misses = _time_lookups(taxonomy, queries, cached=False)
+                cells.append(f"{name} {summary['p50_ms'] * 1000:.1f}/{summary['p99_ms'] * 1000:.0f} ({misses})")
+            summary, _ = _time_lookups(taxonomy, workloads["typo"], cached=True)
+            cells.append(f"memo hit {summary['p50_ms'] * 1000:.1f}/{summary['p99_ms'] * 1000:.0f}")
+            print(f"{size:>11} {construct * 1e6:>8.0f} {load * 1000:>8.0f} {memory / 2**20:>9.1f}   " + "  ".join(cells))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--occupations", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.occupations, args.lookups)
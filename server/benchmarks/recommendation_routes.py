@@ -0,0 +1,141 @@
+# benchmarks/recommendation_routes.py
+"""
+Before/after for the pre-encoded response path on /jobs/{userId} and
+/hustles/{userId}: the default response_model path ("before") against
+FAST_JSON_RESPONSES=true ("after"), measured two ways:
+
+- end to end: requests per second per core, each mode in fresh processes,
+  alternating so machine noise hits both sides; requests go straight to
+  the ASGI app (no HTTP client in the loop), so only server-side cost counts;
+- the response step alone, in one process: fetching the cached list and
+  turning it into a response (FastAPI's validation + serialization of the
+  list, vs. the cached bytes in a PreEncodedJSONResponse), interleaved.
+
+Also times picking a pre-built catalog entry against building its model
+from the template, as every produced list did before entries were pre-built.
+
+    python -m benchmarks.recommendation_routes --requests 3000 --pairs 3
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+_TITLE, _INTERESTS = "Retail Cashier", "eco"
+
+
+async def _serve(requests: int, rounds: int) -> dict:
+    """Best req/s of `rounds` passes per route."""
+    from benchmarks.common import api_key_headers, asgi_get
+    from database import create_user_in_db
+    from main import app
+    from models import UserDB
+
+    user = create_user_in_db(UserDB(email="bench@example.com", jobTitle=_TITLE, interests=_INTERESTS))
+    headers = api_key_headers()
+    rates = {}
+    for route in ("jobs", "hustles"):
+        url = f"/api/v1/{route}/{user.id}"
+        for _ in range(100): # Warm up caches
+            assert await asgi_get(app, url, headers) == 200
+        best = float("inf")
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for _ in range(requests):
+                await asgi_get(app, url, headers)
+            best = min(best, time.perf_counter() - start)
+        rates[route] = requests / best
+    return rates
+
+
+async def _response_step(calls: int, rounds: int) -> None:
+    from fastapi.routing import serialize_response
+    from api.v1.endpoints import hustles, jobs
+    from api.v1.responses import PreEncodedJSONResponse
+    from services import recommendation_service as service
+
+    getters = {
+        "jobs": (jobs.router, service.get_green_jobs, service.get_green_jobs_json),
+        "hustles": (hustles.router, service.get_side_hustles, service.get_side_hustles_json),
+    }
+    for route, (router, get_models, get_json) in getters.items():
+        field = router.routes[0].response_field
+
+        async def before():
+            items = get_models(_TITLE, _INTERESTS)
+            await serialize_response(field=field, response_content=items, dump_json=True)
+
+        async def after():
+            PreEncodedJSONResponse(get_json(_TITLE, _INTERESTS))
+
+        timings = {before: float("inf"), after: float("inf")}
+        for _ in range(rounds): # Interleaved, best of each
+            for step in timings:
+                start = time.perf_counter()
+                for _ in range(calls):
+                    await step()
+                timings[step] = min(timings[step], time.perf_counter() - start)
+        print(f"  /{route:<8} response_model {timings[before] / calls * 1e6:6.1f} us   "
+              f"pre-encoded {timings[after] / calls * 1e6:6.1f} us")
+
+
+def _entries(rounds: int) -> None:
+    from services.recommendation_service import _engine
+
+    rng = random.Random(1)
+    for section in ("jobs", "hustles"):
+        catalog = _engine.catalog(section)
+        fields = [(type(entry.variants[0]), entry.variants[0].model_dump()) for entry in catalog]
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for entry in catalog:
+                entry.render(rng)
+        prebuilt = (time.perf_counter() - start) / (rounds * len(catalog))
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for model, values in fields:
+                model(**values)
+        built = (time.perf_counter() - start) / (rounds * len(catalog))
+        print(f"  {section:<8} pre-built {prebuilt * 1e6:.2f} us per entry   built per call {built * 1e6:.2f} us per entry")
+
+
+def _run_child(fast: bool, requests: int, rounds: int) -> dict:
+    env = dict(os.environ, FAST_JSON_RESPONSES="true" if fast else "false", WARMUP_ON_STARTUP="false")
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.recommendation_routes", "--child", "--requests", str(requests), "--rounds", str(rounds)],
+        env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=3000, help="requests per round")
+    parser.add_argument("--rounds", type=int, default=3, help="rounds per process (best is kept)")
+    parser.add_argument("--pairs", type=int, default=3, help="before/after process pairs")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(asyncio.run(_serve(args.requests, args.rounds))))
+        return
+
+    print("end to end, req/s per core (best per process)")
+    for _ in range(args.pairs):
+        before = _run_child(False, args.requests, args.rounds)
+        after = _run_child(True, args.requests, args.rounds)
+        print("  " + "   ".join(
+            f"/{route}: {before[route]:,.0f} -> {after[route]:,.0f} ({(after[route] / before[route] - 1) * 100:+.0f}%)"
+            for route in before
+        ))
+    print("response step alone (cache hit)")
+    asyncio.run(_response_step(20_000, args.rounds))
+    print("catalog entries")
+    _entries(2000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# benchmarks/relevance.py
+"""
+BM25 catalog ranking at catalog sizes well beyond the built-in one: index
+build time and per-query top-k latency of the inverted index with
+upper-bound pruning, without pruning, and of scoring every entry (what a
+per-entry loop over the catalog would cost).
+
+Catalog words follow a Zipf-like distribution (a few words in many entries,
+a long tail of rare ones); --vocabulary sets the number of distinct words.
+
+    python -m benchmarks.relevance --entries 1000 10000 50000 --queries 2000
+"""
+import argparse
+import heapq
+import random
+import time
+
+from benchmarks.common import summarize
+from services.relevance_engine import BM25Index
+
+_COMMON = "green energy sustainable environmental program coordinator assistant support".split()
+
+
+def _vocabulary(size: int):
+    words = [f"skill{i}" for i in range(size)]
+    cumulative, total = [], 0.0
+    for rank in range(size):
+        total += 1 / (rank + 1)
+        cumulative.append(total)
+    return words, cumulative
+
+
+def _catalog(count: int, vocabulary, rng: random.Random):
+    words, weights = vocabulary
+    for index in range(count):
+        yield index, " ".join(rng.sample(_COMMON, 2) + rng.choices(words, cum_weights=weights, k=12))
+
+
+def _queries(count: int, vocabulary, rng: random.Random):
+    # Title + interests + resume skills: a handful of words, mostly from the head of the distribution
+    words, weights = vocabulary
+    return [" ".join(rng.sample(_COMMON, 1) + rng.choices(words, cum_weights=weights, k=8)) for _ in range(count)]
+
+
+def _full_scan(documents, terms, k):
+    # Same BM25 weights, but every entry is visited for every query
+    scored = []
+    for doc_id, weights in enumerate(documents):
+        score = sum(weights.get(term, 0.0) for term in terms)
+        if score:
+            scored.append((score, doc_id))
+    scored.sort(key=lambda pair: (-pair[0], pair[1]))
+    return scored[:k]
+
+
+def main(sizes, queries: int, k: int, vocabulary_size: int) -> None:
+    rng = random.Random(7)
+    vocabulary = _vocabulary(vocabulary_size)
+    print(f"{'entries':>8} {'build s':>8} {'top_k p50/p99 us':>17} {'unpruned p50 us':>16} {'scan p50 us':>12}")
+    for size in sizes:
+        start = time.perf_counter()
+        index = BM25Index(_catalog(size, vocabulary, rng))
+        build = time.perf_counter() - start
+        texts = [index.query_terms(query) for query in _queries(queries, vocabulary, rng)]
+
+        samples = []
+        for terms in texts:
+            start = time.perf_counter()
+            index.top_k(terms, k)
+            samples.append(time.perf_counter() - start)
+
+        # Without upper-bound pruning: score every posting of every query term
+        unpruned = []
+        for terms in texts:
+            start = time.perf_counter()
+            heapq.nlargest(k, index.scores(terms).items(), key=lambda pair: pair[1])
+            unpruned.append(time.perf_counter() - start)
+
+        # Dense per-entry weights for the full-scan comparison
+        documents = [{} for _ in range(len(index))]
+        for term, postings in index._postings.items():
+            for doc_id, weight in postings.items():
+                documents[doc_id][term] = weight
+        scan = []
+        for terms in texts[:max(20, queries // 50)]:
+            start = time.perf_counter()
+            _full_scan(documents, terms, k)
+            scan.append(time.perf_counter() - start)
+
+        indexed, plain, scanned = summarize(samples), summarize(unpruned), summarize(scan)
+        print(f"{size:>8} {build:>8.2f} {indexed['p50_ms'] * 1000:>8.0f}/{indexed['p99_ms'] * 1000:<8.0f} "
+              f"{plain['p50_ms'] * 1000:>16.0f} {scanned['p50_ms'] * 1000:>12.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--vocabulary", type=int, default=20000)
+    args = parser.parse_args()
+    main(args.entries, args.queries, args.k, args.vocabulary)
@@ -0,0 +1,98 @@
+# benchmarks/resume_upload.py
+"""
+Large resumes: JSON profile submission (resumeText in the body) vs. the
+streaming upload route. Reports request latency and the peak Python memory
+allocated while the request runs (tracemalloc), with and without spilling
+the raw text to disk.
+
+    python -m benchmarks.resume_upload --resume-kb 512 2048 --repeat 5
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+_WORDS = (
+    "customer service inventory sales teamwork scheduling training recycling solar logistics "
+    "managed coordinated delivered improved store team weekly reports shifts cash handling"
+).split()
+
+
+def _resume(kb: int) -> bytes:
+    rng = random.Random(42)
+    words, size = [], 0
+    while size < kb * 1024:
+        word = rng.choice(_WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words).encode()
+
+
+async def _measure(send, repeat: int):
+    # Timed runs without tracemalloc (it slows allocation-heavy code several-fold), then one traced run
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        status = await send()
+        samples.append(time.perf_counter() - start)
+        assert status in (200, 201), status
+    tracemalloc.start()
+    await send()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(samples), peak
+
+
+async def run(sizes, repeat: int) -> None:
+    # Imported here so RESUME_SPILL_DIR / RESUME_MAX_BYTES set by main() take effect
+    from benchmarks.common import api_key_headers, make_client
+    from main import app
+
+    async with make_client(app) as client:
+        headers = api_key_headers()
+        response = await client.post("/api/v1/signup", json={"email": "resume@example.com", "password": "resume-pass"})
+        user_id = response.json()["userId"]
+        await client.post("/api/v1/profile", headers=headers, json={"id": user_id, "jobTitle": "Cashier"})
+
+        print(f"{'resume':>8} {'mode':<16} {'best ms':>9} {'peak MiB':>9}")
+        for kb in sizes:
+            resume = _resume(kb)
+            text = resume.decode()
+
+            async def json_profile():
+                response = await client.post("/api/v1/profile", headers=headers, json={
+                    "id": user_id, "jobTitle": "Cashier", "resumeText": text,
+                })
+                return response.status_code
+
+            async def streamed():
+                async def chunks():
+                    for start in range(0, len(resume), 64 * 1024):
+                        yield resume[start:start + 64 * 1024]
+                response = await client.post(
+                    f"/api/v1/profile/{user_id}/resume", headers={**headers, "content-type": "text/plain"}, content=chunks(),
+                )
+                return response.status_code
+
+            for mode, send in (("json profile", json_profile), ("streamed upload", streamed)):
+                best, peak = await _measure(send, repeat)
+                print(f"{kb:>6}KB {mode:<16} {best * 1000:>9.1f} {peak / 2**20:>9.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resume-kb", type=int, nargs="+", default=[512, 2048])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--spill", action="store_true", help="Keep raw resumes on disk (RESUME_SPILL_DIR)")
+    args = parser.parse_args()
+    os.environ["RESUME_MAX_BYTES"] = str(max(args.resume_kb) * 1024 * 2)
+    if args.spill:
+        os.environ["RESUME_SPILL_DIR"] = tempfile.mkdtemp(prefix="resume-bench-")
+    asyncio.run(run(args.resume_kb, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
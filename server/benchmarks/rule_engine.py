@@ -0,0 +1,81 @@
+# benchmarks/rule_engine.py
+"""
+Rule resolution latency as the occupation table grows: compiled keyword
+automaton vs. the old linear chain of substring tests.
+
+    python -m benchmarks.rule_engine --rules 10 100 500 1000 2000
+
+--crossover times the keyword matcher's two strategies (substring scan vs.
+automaton) on titles and interests, which is where the rule engine's
+SMALL_SET_THRESHOLD comes from.
+"""
+import argparse
+import random
+import string
+import timeit
+
+from services.recommendation_rules import DEFAULT_RULE, OCCUPATION_RULES
+from services.keyword_matcher import KeywordMatcher
+from services.rule_engine import OccupationRule, RuleEngine
+
+_TITLES = ["Senior Retail Cashier", "High School Teacher", "Registered Nurse", "Warehouse Forklift Operator",
+           "Junior Software Developer", "Customer Service Representative"]
+_INTERESTS = ["environment, eco, technology", "art, design and community gardening", "sports"]
+
+
+def _synthetic_rules(count: int):
+    rng = random.Random(1)
+    rules = list(OCCUPATION_RULES)
+    while len(rules) < count:
+        keywords = tuple("".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 10))) for _ in range(3))
+        rules.append(OccupationRule(name=f"rule{len(rules)}", keywords=keywords, risk_score=50, risk_explanation=""))
+    return rules
+
+
+def _linear(rules, job_title: str):
+    title = job_title.lower()
+    for rule in rules:
+        if any(keyword in title for keyword in rule.keywords):
+            return rule
+    return DEFAULT_RULE
+
+
+def crossover(number: int) -> None:
+    rng = random.Random(2)
+    inputs = {"titles": [t.lower() for t in _TITLES], "interests": _INTERESTS}
+    print("keyword matcher, us per string (substring scan / automaton)")
+    for size in (4, 25, 50, 75, 100, 200, 400, 800):
+        keywords = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 10))) for _ in range(size)]
+        matcher = KeywordMatcher((keyword, keyword) for keyword in keywords)
+        row = []
+        for name, texts in inputs.items():
+            timings = []
+            for substring_scan in (True, False):
+                matcher.substring_scan = substring_scan
+                best = min(timeit.repeat(lambda: [matcher.find_all(t) for t in texts], number=number, repeat=3))
+                timings.append(best / number / len(texts) * 1e6)
+            row.append(f"{name} {timings[0]:7.2f} / {timings[1]:5.2f}")
+        print(f"  {size:4d} keywords: " + "   ".join(row))
+
+
+def main(sizes, number: int) -> None:
+    print(f"{'rules':>6} {'compiled us':>12} {'linear us':>10}")
+    for size in sizes:
+        rules = _synthetic_rules(size)
+        engine = RuleEngine(rules, DEFAULT_RULE)
+        compiled = timeit.timeit(lambda: [engine.resolve(t, "environment, eco") for t in _TITLES], number=number)
+        linear = timeit.timeit(lambda: [_linear(rules, t) for t in _TITLES], number=number)
+        per_call = 1e6 / (number * len(_TITLES))
+        print(f"{size:>6} {compiled * per_call:>12.2f} {linear * per_call:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rules", type=int, nargs="+", default=[10, 100, 500, 1000, 2000])
+    parser.add_argument("--number", type=int, default=2000)
+    parser.add_argument("--crossover", action="store_true", help="time substring scan vs. automaton on short strings")
+    args = parser.parse_args()
+    if args.crossover:
+        crossover(args.number)
+    else:
+        main(args.rules, args.number)
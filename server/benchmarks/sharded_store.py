@@ -0,0 +1,140 @@
+# benchmarks/sharded_store.py
+"""
+Multi-threaded stress run of the sharded store (database/sharded_store.py):
+threads create users and rewrite their email, job title and interests while
+others look users up by id, email, job title and interest. Every indexed
+read is checked against the query (a user returned for "teacher" must be a
+teacher), and at the end check_indexes() compares every index with the
+stored users. Exits with 1 on any inconsistency.
+
+Also times the job title query against the dict store's full scan, and the
+write/read mix against the dict store.
+
+    python -m benchmarks.sharded_store --threads 8 --duration 10 --users 20000
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+import uuid
+
+from benchmarks.common import summarize
+from database.sharded_store import ShardedUserStore, interest_tokens, normalize_job_title
+from database.storage import DictUserStore
+from models import UserDB
+
+_TITLES = ("Cashier", "Teacher", " teacher ", "Nurse", "Delivery Driver", "delivery  driver", "Barista", "Accountant")
+_INTERESTS = ("solar", "recycling, gardening", "Solar, eco-design", "coding", "environment", "", "teaching, coding")
+_EMAILS = 200 # Small pool, so threads keep moving addresses between users
+
+
+def _random_user(rng: random.Random, user_id: uuid.UUID = None) -> UserDB:
+    return UserDB(
+        id=user_id or uuid.uuid4(),
+        email=f"user{rng.randrange(_EMAILS)}@example.com" if rng.random() < 0.7 else None,
+        jobTitle=rng.choice(_TITLES),
+        interests=rng.choice(_INTERESTS) or None,
+    )
+
+
+def stress(store: ShardedUserStore, threads: int, duration: float, users: int) -> int:
+    rng = random.Random(1)
+    ids = [store.create(_random_user(rng)).id for _ in range(users)]
+    ops = [0] * threads
+    violations = []
+    deadline = time.perf_counter() + duration
+
+    def run(worker: int) -> None:
+        rng = random.Random(worker)
+        count = 0
+        while time.perf_counter() < deadline:
+            roll = rng.random()
+            if roll < 0.05:
+                ids.append(store.create(_random_user(rng)).id) # list.append is atomic
+            elif roll < 0.45:
+                store.update(rng.choice(ids), _random_user(rng, rng.choice(ids)))
+            elif roll < 0.6:
+                store.get(rng.choice(ids))
+            elif roll < 0.75:
+                email = f"user{rng.randrange(_EMAILS)}@example.com"
+                user = store.get_by_email(email)
+                if user is not None and (user.email or "").lower() != email:
+                    violations.append(f"get_by_email({email!r}) returned {user.email!r}")
+            elif roll < 0.9:
+                title = rng.choice(_TITLES)
+                for user in store.find_by_job_title(title):
+                    if normalize_job_title(user.jobTitle or "") != normalize_job_title(title):
+                        violations.append(f"find_by_job_title({title!r}) returned {user.jobTitle!r}")
+            else:
+                query = rng.choice(("solar", "coding", "eco", "recycling", "Solar, eco-design", "teaching coding"))
+                for user in store.find_by_interest(query):
+                    if not interest_tokens(query) <= interest_tokens(user.interests):
+                        violations.append(f"find_by_interest({query!r}) returned {user.interests!r}")
+            count += 1
+        ops[worker] = count
+
+    workers = [threading.Thread(target=run, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    problems = store.check_indexes()
+    print(f"stress: {threads} threads, {sum(ops) / duration:,.0f} ops/s, {store.count()} users")
+    print(f"  reads that didn't match their query: {len(violations)}")
+    print(f"  index inconsistencies after the run: {len(problems)}")
+    for line in (violations + problems)[:10]:
+        print(f"    {line}")
+    return len(violations) + len(problems)
+
+
+def query_speed(users: int, samples: int) -> None:
+    rng = random.Random(2)
+    store, unindexed = ShardedUserStore(), DictUserStore({}, {})
+    for _ in range(users):
+        unindexed.create(store.create(_random_user(rng)))
+
+    for name, query in (("index", store.find_by_job_title), ("scan", unindexed.find_by_job_title)):
+        latencies = []
+        for _ in range(samples):
+            title = rng.choice(_TITLES)
+            start = time.perf_counter()
+            query(title)
+            latencies.append(time.perf_counter() - start)
+        stats = summarize(latencies)
+        print(f"  users with jobTitle X via {name:<5}  p50 {stats['p50_ms']:.3f} ms  p95 {stats['p95_ms']:.3f} ms")
+
+
+def mix_speed(store, users: int, operations: int) -> float:
+    rng = random.Random(3)
+    ids = [store.create(_random_user(rng)).id for _ in range(users)]
+    start = time.perf_counter()
+    for _ in range(operations):
+        if rng.random() < 0.3:
+            store.update(rng.choice(ids), _random_user(rng, rng.choice(ids)))
+        else:
+            store.get_by_email(f"user{rng.randrange(_EMAILS)}@example.com")
+    return operations / (time.perf_counter() - start)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5, help="seconds of the stress run")
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--shards", type=int, default=16)
+    parser.add_argument("--samples", type=int, default=200, help="timed job title queries")
+    args = parser.parse_args()
+
+    failures = stress(ShardedUserStore(args.shards), args.threads, args.duration, args.users)
+    print(f"query speed ({args.users} users)")
+    query_speed(args.users, args.samples)
+    print("update/email lookup mix, one thread")
+    for store in (DictUserStore({}, {}), ShardedUserStore(args.shards)):
+        print(f"  {type(store).__name__:<18} {mix_speed(store, args.users, 50_000):>10,.0f} ops/s")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+# benchmarks/startup.py
+"""
+Cold start: import time of main.py, time to the first response, time until
+/ready reports ready, and the latency of the first real requests (signup,
+login, jobs) with and without the startup warmup. Every run is a fresh
+interpreter, so nothing is cached between runs.
+
+    python -m benchmarks.startup --runs 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+_START = time.perf_counter()
+
+
+async def _child() -> dict:
+    import main
+    imported = time.perf_counter() - _START
+
+    from benchmarks.common import api_key_headers, asgi_get, make_client
+    app = main.app
+    result = {"import_s": imported}
+    async with app.router.lifespan_context(app):
+        await asgi_get(app, "/", {})
+        result["first_response_s"] = time.perf_counter() - _START
+        while await asgi_get(app, "/ready", {}) != 200:
+            await asyncio.sleep(0.005)
+        result["ready_s"] = time.perf_counter() - _START
+
+        async with make_client(app) as client:
+            async def timed(name, request):
+                start = time.perf_counter()
+                response = await request
+                result[name] = time.perf_counter() - start
+                assert response.status_code < 400, (name, response.status_code)
+                return response
+
+            credentials = {"email": "startup@example.com", "password": "startup-pass"}
+            user_id = (await timed("signup_s", client.post("/api/v1/signup", json=credentials))).json()["userId"]
+            await timed("token_s", client.post("/api/v1/token", data={
+                "username": credentials["email"], "password": credentials["password"],
+            }))
+            headers = api_key_headers()
+            await client.post("/api/v1/profile", headers=headers, json={"id": user_id, "jobTitle": "Cashier"})
+            await timed("jobs_s", client.get(f"/api/v1/jobs/{user_id}", headers=headers))
+    return result
+
+
+def _run_child(warmup: bool) -> dict:
+    env = dict(os.environ, WARMUP_ON_STARTUP="true" if warmup else "false")
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--child"],
+        env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes per mode (medians are reported)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(_child())))
+        return
+
+    columns = ("import_s", "first_response_s", "ready_s", "signup_s", "token_s", "jobs_s")
+    print(f"{'warmup':<8}" + "".join(f"{name[:-2] + ' ms':>19}" for name in columns))
+    for warmup in (False, True):
+        runs = [_run_child(warmup) for _ in range(args.runs)]
+        medians = [statistics.median(run[name] for run in runs) * 1000 for name in columns]
+        print(f"{'on' if warmup else 'off':<8}" + "".join(f"{value:>19.1f}" for value in medians))
+
+
+if __name__ == "__main__":
+    main()
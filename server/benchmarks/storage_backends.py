@@ -0,0 +1,84 @@
+# benchmarks/storage_backends.py
+"""
+Compares the dict and SQLite user stores on lookups and updates, plus the
+shared store when --state-url points at a state backend (keys go under a
+fresh prefix, so an existing backend's data is left alone).
+
+    python -m benchmarks.storage_backends --sizes 10000 1000000 10000000
+    python -m benchmarks.storage_backends --state-url unix:///tmp/futureskills-state.sock
+
+Large sizes need a lot of RAM for the dict backend and several minutes of
+seeding; the default only runs 10k users.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+
+from benchmarks.common import summarize
+from database.resp import RespClient
+from database.shared_store import SharedUserStore
+from database.sqlite_store import SQLiteUserStore
+from database.storage import DictUserStore
+from models import UserDB
+
+
+def _users(count: int):
+    for i in range(count):
+        yield UserDB(
+            id=uuid.UUID(int=i + 1),
+            email=f"user{i}@example.com",
+            jobTitle=random.choice(["Cashier", "Teacher", "Nurse", "Driver"]),
+            interests="environment, eco",
+        )
+
+
+def _time_ops(op, keys, samples: int):
+    latencies = []
+    for key in random.sample(keys, min(samples, len(keys))):
+        start = time.perf_counter()
+        op(key)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def bench(store, size: int, samples: int) -> None:
+    start = time.perf_counter()
+    store.create_many(_users(size))
+    seed_seconds = time.perf_counter() - start
+
+    ids = [uuid.UUID(int=i + 1) for i in range(0, size, max(1, size // (samples * 4)))]
+    emails = [f"user{u.int - 1}@example.com" for u in ids]
+    by_id = _time_ops(store.get, ids, samples)
+    by_email = _time_ops(store.get_by_email, emails, samples)
+    updates = _time_ops(lambda key: store.update(key, UserDB(id=key, jobTitle="Updated")), ids, samples)
+
+    print(f"  {type(store).__name__:<16} seed={seed_seconds:.1f}s")
+    print(f"    get by id    {summarize(by_id)}")
+    print(f"    get by email {summarize(by_email)}")
+    print(f"    update       {summarize(updates)}")
+
+
+def main(sizes, samples: int, state_url=None) -> None:
+    for size in sizes:
+        print(f"{size} users")
+        bench(DictUserStore({}, {}), size, samples)
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SQLiteUserStore(os.path.join(tmp, "bench.db"))
+            bench(store, size, samples)
+            store.close()
+        if state_url:
+            store = SharedUserStore(RespClient(state_url), prefix=f"bench-{uuid.uuid4().hex[:8]}:")
+            bench(store, size, samples)
+            store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000])
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--state-url", help="also benchmark the shared store against this backend")
+    args = parser.parse_args()
+    main(args.sizes, args.samples, args.state_url)
@@ -0,0 +1,265 @@
+# benchmarks/suite.py
+"""
+Load and latency suite covering every router. Seeds users straight into the
+store (create_user_in_db), then runs a weighted mix of all routes from
+concurrent closed-loop workers against the in-process app (ASGI transport,
+no network); signup/token get their own workers. Reports throughput and p50/p95/p99 per route, optionally saves
+the results as JSON, and compares them with a saved baseline: the exit code
+is 1 when any route's p95 or throughput regresses by more than --threshold,
+or its error rate (4xx/5xx per request) does; a route that had no errors
+fails on its first one, since failing fast would otherwise pass as faster.
+
+    python -m benchmarks.suite --users 1000 --duration 10 --output results.json
+    python -m benchmarks.suite --baseline results.json --threshold 0.25
+
+Admission control is switched off so the suite measures capacity rather
+than load shedding (--keep-admission leaves it as configured). Per-route
+numbers come from one shared mix, so a slow route also lowers everyone
+else's throughput; compare like with like (same mix, users, concurrency).
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict
+from typing import Callable, Dict, List, NamedTuple
+
+from benchmarks.common import api_key_headers, make_client, summarize
+
+_TITLES = (
+    "Cashier", "Retail Associate", "Teacher", "Delivery Driver", "Data Entry Clerk", "Barista",
+    "Assembly Line Worker", "Accountant", "Nurse", "Software Developer", "Warehouse Picker", "Call Center Agent",
+)
+_INTERESTS = ("solar", "recycling", "gardening", "teaching", "coding", "environment", "design", "")
+_MESSAGES = ("what next?", "any courses?", "is my job at risk?", "side hustle ideas", "tell me more", "green jobs for me")
+_PASSWORD = "suite-password"
+
+
+class Operation(NamedTuple):
+    route: str # Reported name: method + route template
+    weight: int
+    send: Callable # (client, state, rng) -> awaitable response
+    auth: bool = False # bcrypt routes run in their own worker lane
+
+
+def _user(state, rng) -> str:
+    return rng.choice(state["user_ids"])
+
+
+async def _signup(client, state, rng):
+    return await client.post("/api/v1/signup", json={"email": f"suite-{uuid.uuid4().hex}@example.com", "password": _PASSWORD})
+
+async def _token(client, state, rng):
+    return await client.post("/api/v1/token", data={"username": rng.choice(state["emails"]), "password": _PASSWORD})
+
+async def _me(client, state, rng):
+    return await client.get("/api/v1/me", headers={"Authorization": f"Bearer {rng.choice(state['tokens'])}"})
+
+def _get_user_route(section: str):
+    async def send(client, state, rng):
+        return await client.get(f"/api/v1/{section}/{_user(state, rng)}", headers=state["headers"])
+    return send
+
+async def _profile_get(client, state, rng):
+    return await client.get(f"/api/v1/profile/{_user(state, rng)}", headers=state["headers"])
+
+async def _profile_write(client, state, rng):
+    return await client.post("/api/v1/profile", headers=state["headers"], json={
+        "id": _user(state, rng), "jobTitle": rng.choice(_TITLES), "interests": rng.choice(_INTERESTS),
+    })
+
+async def _resume(client, state, rng):
+    text = " ".join(rng.choice(("customer service", "recycling", "solar", "lesson planning", "excel", "logistics")) for _ in range(200))
+    return await client.post(
+        f"/api/v1/profile/{_user(state, rng)}/resume", headers={**state["headers"], "content-type": "text/plain"}, content=text,
+    )
+
+async def _chat(client, state, rng):
+    return await client.post("/api/v1/chat", headers=state["headers"], json={"userId": _user(state, rng), "message": rng.choice(_MESSAGES)})
+
+async def _chat_history(client, state, rng):
+    return await client.get(f"/api/v1/chat/history/{_user(state, rng)}", headers=state["headers"])
+
+def _batch(path: str):
+    async def send(client, state, rng):
+        items = [{"userId": _user(state, rng)} for _ in range(25)] + [{"jobTitle": rng.choice(_TITLES)} for _ in range(25)]
+        return await client.post(path, headers=state["headers"], json={"items": items})
+    return send
+
+
+OPERATIONS = (
+    Operation("POST /api/v1/signup", 1, _signup, auth=True),
+    Operation("POST /api/v1/token", 2, _token, auth=True),
+    Operation("GET /api/v1/me", 10, _me),
+    Operation("GET /api/v1/risk/{userId}", 10, _get_user_route("risk")),
+    Operation("GET /api/v1/jobs/{userId}", 10, _get_user_route("jobs")),
+    Operation("GET /api/v1/reskilling/{userId}", 10, _get_user_route("reskilling")),
+    Operation("GET /api/v1/hustles/{userId}", 10, _get_user_route("hustles")),
+    Operation("GET /api/v1/recommendations/{userId}", 5, _get_user_route("recommendations")),
+    Operation("POST /api/v1/risk/batch", 1, _batch("/api/v1/risk/batch")),
+    Operation("POST /api/v1/recommendations/batch", 1, _batch("/api/v1/recommendations/batch")),
+    Operation("GET /api/v1/profile/{user_id}", 5, _profile_get),
+    Operation("POST /api/v1/profile", 5, _profile_write),
+    Operation("POST /api/v1/profile/{userId}/resume", 1, _resume),
+    Operation("POST /api/v1/chat", 8, _chat),
+    Operation("GET /api/v1/chat/history/{userId}", 2, _chat_history),
+)
+
+
+def _seed(users: int, logins: int, rng) -> dict:
+    """Creates `users` profiles directly in the store; the first `logins` of them can log in."""
+    from database import create_user_in_db
+    from models import UserDB
+    from services.auth_utils import hash_password
+    from services.auth_service import create_access_token
+
+    hashed = hash_password(_PASSWORD) # One bcrypt hash shared by every seeded login
+    user_ids, emails, tokens = [], [], []
+    for i in range(users):
+        login = i < logins
+        user = create_user_in_db(UserDB(
+            email=f"seed-{i}@example.com" if login else None,
+            hashed_password=hashed if login else None,
+            jobTitle=rng.choice(_TITLES),
+            interests=rng.choice(_INTERESTS) or None,
+        ))
+        user_ids.append(str(user.id))
+        if login:
+            emails.append(user.email)
+            tokens.append(create_access_token({"sub": str(user.id), "email": user.email}))
+    return {"user_ids": user_ids, "emails": emails, "tokens": tokens, "headers": api_key_headers()}
+
+
+async def _worker(client, state, operations, deadline: float, samples, statuses, seed: int) -> None:
+    rng = random.Random(seed)
+    weights = [operation.weight for operation in operations]
+    while time.perf_counter() < deadline:
+        operation = rng.choices(operations, weights)[0]
+        start = time.perf_counter()
+        response = await operation.send(client, state, rng)
+        elapsed = time.perf_counter() - start
+        if samples is not None:
+            samples[operation.route].append(elapsed)
+            statuses[operation.route][response.status_code] += 1
+
+
+async def run_suite(
+    users: int, logins: int, concurrency: int, auth_concurrency: int, duration: float, warmup: float, seed: int,
+) -> dict:
+    from main import app
+
+    rng = random.Random(seed)
+    state = _seed(users, logins, rng)
+    samples: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+    # Signup/token take a bcrypt round each (hundreds of ms); in a shared lane
+    # they would soon occupy every worker and starve the rest of the mix
+    lanes = [[op for op in OPERATIONS if not op.auth]] * concurrency + [[op for op in OPERATIONS if op.auth]] * auth_concurrency
+
+    async def run_lanes(deadline: float, samples, statuses, seed: int):
+        await asyncio.gather(*(
+            _worker(client, state, operations, deadline, samples, statuses, seed + i) for i, operations in enumerate(lanes)
+        ))
+
+    async with make_client(app) as client:
+        if warmup > 0: # Fill caches and start pools; not recorded
+            await run_lanes(time.perf_counter() + warmup, None, None, seed + 1000)
+        start = time.perf_counter()
+        await run_lanes(start + duration, samples, statuses, seed)
+        elapsed = time.perf_counter() - start
+
+    routes = {}
+    for operation in OPERATIONS:
+        route_samples = samples.get(operation.route, [])
+        codes = statuses.get(operation.route, {})
+        routes[operation.route] = {
+            **summarize(route_samples),
+            "rps": len(route_samples) / elapsed,
+            "errors": sum(count for code, count in codes.items() if code >= 400),
+            "statuses": {str(code): count for code, count in sorted(codes.items())},
+        }
+    everything = [sample for route_samples in samples.values() for sample in route_samples]
+    return {
+        "meta": {
+            "users": users, "logins": logins, "concurrency": concurrency, "auth_concurrency": auth_concurrency,
+            "duration": duration, "seed": seed,
+            "python": platform.python_version(), "platform": platform.platform(), "timestamp": time.time(),
+        },
+        "total": {**summarize(everything), "rps": len(everything) / elapsed},
+        "routes": routes,
+    }
+
+
+def _error_rate(row: dict) -> float:
+    return row.get("errors", 0) / row["count"] if row["count"] else 0.0
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_count: int) -> List[str]:
+    """Regressions of p95 latency, throughput or error rate beyond `threshold` (a fraction), one line per finding."""
+    regressions = []
+    for route, current in results["routes"].items():
+        before = baseline.get("routes", {}).get(route)
+        if before is None or min(current["count"], before["count"]) < min_count:
+            continue # New route or too few samples to judge
+        if before["p95_ms"] and current["p95_ms"] > before["p95_ms"] * (1 + threshold):
+            regressions.append(f"{route}: p95 {before['p95_ms']:.2f} -> {current['p95_ms']:.2f} ms")
+        if before["rps"] and current["rps"] < before["rps"] * (1 - threshold):
+            regressions.append(f"{route}: throughput {before['rps']:.1f} -> {current['rps']:.1f} req/s")
+        errors_before, errors_now = _error_rate(before), _error_rate(current)
+        if errors_now > errors_before * (1 + threshold):
+            regressions.append(f"{route}: error rate {errors_before:.2%} -> {errors_now:.2%}")
+    return regressions
+
+
+def _print(results: dict) -> None:
+    print(f"{'route':<42} {'count':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for route, row in list(results["routes"].items()) + [("total", {**results["total"], "errors": ""})]:
+        print(f"{route:<42} {row['count']:>7} {row['rps']:>8.1f} {row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} {row['p99_ms']:>8.2f} {row['errors']:>7}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000, help="users seeded into the store")
+    parser.add_argument("--logins", type=int, default=50, help="seeded users with credentials (for /token and /me)")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent closed-loop workers")
+    parser.add_argument("--auth-concurrency", type=int, default=2, help="extra workers for signup/token only")
+    parser.add_argument("--duration", type=float, default=10, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=2, help="unmeasured seconds before the run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the results as JSON here")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed regression as a fraction (0.2 = 20%%)")
+    parser.add_argument("--min-count", type=int, default=30, help="routes with fewer samples are not compared")
+    parser.add_argument("--keep-admission", action="store_true", help="leave admission control as configured")
+    args = parser.parse_args()
+
+    if not args.keep_admission:
+        from services.admission import admission_controller
+        admission_controller.enabled = False
+
+    results = asyncio.run(run_suite(
+        args.users, args.logins, args.concurrency, args.auth_concurrency, args.duration, args.warmup, args.seed,
+    ))
+    _print(results)
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(results, handle, indent=2)
+        print(f"\nResults written to {args.output}")
+    if args.baseline:
+        with open(args.baseline) as handle:
+            regressions = compare(results, json.load(handle), args.threshold, args.min_count)
+        if regressions:
+            print(f"\nRegressions beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+# benchmarks/user_memory.py
+"""
+Resident bytes per user: dict of UserDB objects vs. the compact record store.
+
+    python -m benchmarks.user_memory --users 100000 --resume-chars 2000
+"""
+import argparse
+import gc
+import random
+import tracemalloc
+import uuid
+
+from database.compact_store import CompactUserStore
+from database.storage import DictUserStore
+from models import UserDB
+
+_TITLES = ["Cashier", "Retail Associate", "Teacher", "Educator", "Nurse", "Driver", "Warehouse Operative"]
+_EXPERIENCE = ["0-2 years", "3-5 years", "6-10 years", "10+ years"]
+_WORDS = "customer service inventory sales teamwork scheduling training recycling solar logistics".split()
+
+
+def _users(count: int, resume_chars: int):
+    rng = random.Random(42)
+    for i in range(count):
+        resume = " ".join(rng.choice(_WORDS) for _ in range(resume_chars // 8))[:resume_chars] if resume_chars else None
+        yield UserDB(
+            id=uuid.uuid4(),
+            email=f"user{i}@example.com",
+            hashed_password="$2b$12$" + "x" * 53,
+            full_name=f"User {i}",
+            jobTitle=rng.choice(_TITLES),
+            experience=rng.choice(_EXPERIENCE),
+            interests="environment, eco, solar",
+            resumeText=resume,
+        )
+
+
+def measure(make_store, users: int, resume_chars: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    store = make_store()
+    for user_data in _users(users, resume_chars):
+        # Copy the title/experience strings like request parsing would, so interning is exercised
+        user_data.jobTitle = "".join(user_data.jobTitle)
+        store.create(user_data)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / users
+
+
+def main(users: int, resume_chars: int) -> None:
+    before = measure(lambda: DictUserStore({}, {}), users, resume_chars)
+    after = measure(CompactUserStore, users, resume_chars)
+    print(f"{users} users, {resume_chars}-char resumes")
+    print(f"  dict of UserDB : {before:,.0f} bytes/user")
+    print(f"  compact records: {after:,.0f} bytes/user ({after / before:.0%})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--resume-chars", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.users, args.resume_chars)
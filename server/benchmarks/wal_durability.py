@@ -0,0 +1,60 @@
+# benchmarks/wal_durability.py
+"""
+Group-commit timing for the WAL-backed dict store: --threads writers doing
+--writes synchronous commits each (WAL_SYNC_COMMIT). Commits that arrive in
+the same flush window should share one fsync instead of being serialized.
+Crash recovery is covered by tests/test_wal_recovery.py.
+
+    python -m benchmarks.wal_durability --threads 8 --writes 20
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+
+from database.durable_store import DurableDictUserStore
+from database.wal import WriteAheadLog
+from models import UserDB
+
+
+def group_commit(base: str, threads: int, writes: int, flush_ms: float) -> None:
+    directory = os.path.join(base, "group-commit")
+    store = DurableDictUserStore({}, {}, WriteAheadLog(directory, flush_interval=flush_ms / 1000, sync_commit=True))
+
+    def writer(worker: int) -> None:
+        for i in range(writes):
+            store.create(UserDB(id=uuid.UUID(int=worker * 1_000_000 + i + 1), jobTitle="Cashier"))
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=writer, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    store.close()
+    total = threads * writes
+    print(f"  {threads} threads x {writes} sync writes: {elapsed:.2f}s "
+          f"({elapsed / total * 1000:.2f} ms per write, {elapsed / writes * 1000:.2f} ms per write per thread)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=20, help="synchronous writes per thread")
+    parser.add_argument("--flush-ms", type=float, default=10, help="group-commit window")
+    args = parser.parse_args()
+
+    base = tempfile.mkdtemp()
+    try:
+        print("group commit")
+        group_commit(base, args.threads, args.writes, args.flush_ms)
+    finally:
+        shutil.rmtree(base)
+
+
+if __name__ == "__main__":
+    main()
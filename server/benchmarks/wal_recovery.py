@@ -0,0 +1,41 @@
+# benchmarks/wal_recovery.py
+"""
+Cold-start time of the WAL-backed dict store: snapshot + log replay.
+
+    python -m benchmarks.wal_recovery --users 1000000 --log-records 100000
+"""
+import argparse
+import tempfile
+import time
+import uuid
+
+from database.durable_store import DurableDictUserStore
+from database.wal import WriteAheadLog
+from models import UserDB
+
+
+def main(users: int, log_records: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        store = DurableDictUserStore({}, {}, WriteAheadLog(directory))
+        start = time.perf_counter()
+        for i in range(users):
+            store.create(UserDB(id=uuid.UUID(int=i + 1), email=f"user{i}@example.com", jobTitle="Cashier"))
+        store.snapshot()
+        for i in range(log_records):
+            store.update(uuid.UUID(int=i % users + 1), UserDB(jobTitle="Teacher"))
+        store.close()
+        print(f"write {users} users + {log_records} log records: {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        recovered = DurableDictUserStore({}, {}, WriteAheadLog(directory))
+        elapsed = time.perf_counter() - start
+        print(f"recover {recovered.count()} users: {elapsed:.2f}s ({elapsed / max(1, users) * 1e6:.1f} us/user)")
+        recovered.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--log-records", type=int, default=10_000)
+    args = parser.parse_args()
+    main(args.users, args.log_records)
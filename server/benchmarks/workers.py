@@ -0,0 +1,201 @@
+# benchmarks/workers.py
+"""
+Runs the API as several uvicorn processes sharing one state backend
+(DATABASE_BACKEND=shared) and checks what broke with per-process dicts:
+
+- signup on one worker, /token on another, the token accepted by every worker;
+- the same email signed up on every worker at once creates exactly one user;
+- a profile update on one worker is served by the others, including their
+  cached /me users (dropped via the invalidation broadcast; the delay until
+  every worker shows it is reported);
+- every worker derives the same ETag for a user, so a 304 from one worker
+  holds on the others and a change made on one is never answered with 304;
+- chat history carries over from one worker to the next;
+
+then measures a read mix (risk/jobs/me/chat) across 1 and N workers.
+Each worker listens on its own port so requests can be aimed at a given
+one; with `uvicorn main:app --workers N` the kernel spreads them instead.
+A stand-in state server (database/resp_server.py) is started unless
+--state-url points at a running Redis.
+
+    python -m benchmarks.workers --workers 4 --duration 10
+"""
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+import httpx
+
+from benchmarks.common import api_key_headers, summarize
+
+_PASSWORD = "workers-password"
+
+
+def _wait_ready(url: str, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{url}/ready", timeout=1).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"{url} did not become ready")
+
+
+@contextlib.contextmanager
+def _state_server(state_url):
+    if state_url:
+        yield state_url
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "state.sock")
+        server = subprocess.Popen([sys.executable, "-m", "database.resp_server", "--unix", path])
+        try:
+            deadline = time.monotonic() + 10
+            while not os.path.exists(path):
+                if time.monotonic() > deadline:
+                    raise RuntimeError("state server did not start")
+                time.sleep(0.05)
+            yield f"unix://{path}"
+        finally:
+            server.terminate()
+            server.wait()
+
+
+@contextlib.contextmanager
+def _workers(count: int, state_url: str, base_port: int):
+    env = dict(
+        os.environ, DATABASE_BACKEND="shared", STATE_URL=state_url,
+        ADMISSION_CONTROL="false", PASSWORD_HASH_WORKERS="1",
+    )
+    processes, urls = [], []
+    try:
+        for i in range(count):
+            port = base_port + i
+            processes.append(subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"], env=env,
+            ))
+            urls.append(f"http://127.0.0.1:{port}")
+        for url in urls:
+            _wait_ready(url)
+        yield urls
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+
+
+async def check_sharing(urls) -> None:
+    headers = api_key_headers()
+    first, second, last = urls[0], urls[1 % len(urls)], urls[-1]
+    email = f"workers-{uuid.uuid4().hex}@example.com"
+    async with httpx.AsyncClient(timeout=30) as client:
+        signup = await client.post(f"{first}/api/v1/signup", json={"email": email, "password": _PASSWORD})
+        token = await client.post(f"{second}/api/v1/token", data={"username": email, "password": _PASSWORD})
+        print(f"signup on worker 0: {signup.status_code}, token on worker {urls.index(second)}: {token.status_code}")
+        user_id = signup.json()["userId"]
+        auth = {"Authorization": f"Bearer {token.json()['access_token']}"}
+        statuses = [(await client.get(f"{url}/api/v1/me", headers=auth)).status_code for url in urls]
+        print(f"/me on every worker: {statuses}") # Also fills each worker's token cache
+
+        duplicate = f"workers-{uuid.uuid4().hex}@example.com"
+        racing = await asyncio.gather(*(
+            client.post(f"{url}/api/v1/signup", json={"email": duplicate, "password": _PASSWORD}) for url in urls * 2
+        ))
+        print(f"same email signed up {len(racing)} times at once: {sorted(r.status_code for r in racing)} (one 201 expected)")
+
+        await client.post(f"{last}/api/v1/profile", headers=headers, json={"id": user_id, "jobTitle": "Solar Installer"})
+        start = time.perf_counter()
+        pending = set(urls)
+        while pending and time.perf_counter() - start < 5:
+            for url in list(pending):
+                me = (await client.get(f"{url}/api/v1/me", headers=auth)).json()
+                if me.get("jobTitle") == "Solar Installer":
+                    pending.discard(url)
+        print(f"profile update on worker {len(urls) - 1} visible in every worker's cached /me after "
+              f"{(time.perf_counter() - start) * 1000:.1f} ms" if not pending else f"stale on {sorted(pending)}")
+
+        etags = [(await client.get(f"{url}/api/v1/jobs/{user_id}", headers=headers)).headers.get("etag") for url in urls]
+        await client.post(f"{first}/api/v1/profile", headers=headers, json={"id": user_id, "jobTitle": "Wind Technician"})
+        after = [
+            (await client.get(f"{url}/api/v1/jobs/{user_id}", headers={**headers, "If-None-Match": etags[0]})).status_code
+            for url in urls
+        ]
+        print(f"ETag on every worker the same: {len(set(etags)) == 1}; after a change on worker 0, "
+              f"the old ETag gets {after} (200 expected everywhere)")
+
+        await client.post(f"{first}/api/v1/chat", headers=headers, json={"userId": user_id, "message": "any courses?"})
+        history = (await client.get(f"{last}/api/v1/chat/history/{user_id}", headers=headers)).json()
+        print(f"chat on worker 0, history read on worker {len(urls) - 1}: {len(history['turns'])} turns")
+
+
+async def _signup(url: str):
+    """A fresh user and their token, for the read mix."""
+    async with httpx.AsyncClient(timeout=30) as client:
+        email = f"workers-{uuid.uuid4().hex}@example.com"
+        signup = await client.post(f"{url}/api/v1/signup", json={"email": email, "password": _PASSWORD})
+        token = await client.post(f"{url}/api/v1/token", data={"username": email, "password": _PASSWORD})
+        await client.post(f"{url}/api/v1/profile", headers=api_key_headers(), json={"id": signup.json()["userId"], "jobTitle": "Cashier"})
+        return signup.json()["userId"], token.json()["access_token"]
+
+
+async def _load(urls, user_id, token, concurrency: int, duration: float):
+    headers = api_key_headers()
+    auth = {"Authorization": f"Bearer {token}"}
+    samples = []
+    limits = httpx.Limits(max_connections=concurrency * len(urls))
+
+    async def worker(client, seed: int):
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            url = rng.choice(urls)
+            kind = rng.random()
+            start = time.perf_counter()
+            if kind < 0.3:
+                await client.get(f"{url}/api/v1/risk/{user_id}", headers=headers)
+            elif kind < 0.6:
+                await client.get(f"{url}/api/v1/jobs/{user_id}", headers=headers)
+            elif kind < 0.9:
+                await client.get(f"{url}/api/v1/me", headers=auth)
+            else:
+                await client.post(f"{url}/api/v1/chat", headers=headers, json={"userId": user_id, "message": "what next?"})
+            samples.append(time.perf_counter() - start)
+
+    async with httpx.AsyncClient(timeout=30, limits=limits) as client:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(worker(client, i) for i in range(concurrency)))
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=10, help="seconds per throughput run")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent client connections")
+    parser.add_argument("--port", type=int, default=8701, help="first worker port")
+    parser.add_argument("--state-url", help="existing state backend (default: start a stand-in)")
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs")
+    with _state_server(args.state_url) as state_url:
+        with _workers(args.workers, state_url, args.port) as urls:
+            asyncio.run(check_sharing(urls))
+            user_id, token = asyncio.run(_signup(urls[0]))
+            for count in sorted({1, args.workers}):
+                samples = asyncio.run(_load(urls[:count], user_id, token, args.concurrency, args.duration))
+                stats = summarize(samples)
+                print(f"{count} worker(s): {len(samples) / args.duration:8.0f} req/s  "
+                      f"p50 {stats['p50_ms']:.2f} ms  p95 {stats['p95_ms']:.2f} ms  p99 {stats['p99_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,4 +12,107 @@ API_KEY_NAME: str = "X-API-Key"
 # JWT Settings (For signup, login, me)
 SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "another-super-secret-random-key-replace-me") # *** IMPORTANT: CHANGE THIS ***
 ALGORITHM: str = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
\ No newline at end of file
+ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
+
+# Password hashing pool (bcrypt runs off the event loop)
+PASSWORD_HASH_EXECUTOR: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread") # "thread" or "process"
+PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 2))
+PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 64)) # Queued + running jobs before we return 503
+
+# Verified-token cache used by get_current_user
+TOKEN_CACHE_MAX_ENTRIES: int = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", 10000))
+
+# User storage backend: "memory" (process-local dicts), "sharded" (lock-striped dicts with job title /
+# interest indexes), "compact" (memory-lean records), "sqlite" or "shared" (users and chat sessions in
+# the state backend at STATE_URL, for running several workers)
+DATABASE_BACKEND: str = os.getenv("DATABASE_BACKEND", "memory")
+SHARDED_STORE_SHARDS: int = int(os.getenv("SHARDED_STORE_SHARDS", 16)) # Lock stripes for users and for the indexes
+SQLITE_PATH: str = os.getenv("SQLITE_PATH", "green_careers.db")
+SQLITE_POOL_SIZE: int = int(os.getenv("SQLITE_POOL_SIZE", 8))
+
+# Shared state backend (Redis, or `python -m database.resp_server` on one host), e.g.
+# "unix:///tmp/futureskills-state.sock" or "redis://localhost:6379/0". Also carries the
+# cross-worker cache invalidation broadcast; empty = single process, nothing shared
+STATE_URL: str = os.getenv("STATE_URL", "")
+STATE_POOL_SIZE: int = int(os.getenv("STATE_POOL_SIZE", 8)) # Connections per worker
+STATE_TIMEOUT_SECONDS: float = float(os.getenv("STATE_TIMEOUT_SECONDS", 2))
+
+# Write-ahead log + snapshots for the in-memory store (disabled when WAL_DIR is empty)
+WAL_DIR: str = os.getenv("WAL_DIR", "")
+WAL_FLUSH_INTERVAL_MS: int = int(os.getenv("WAL_FLUSH_INTERVAL_MS", 10)) # Group-commit window
+WAL_SYNC_COMMIT: bool = os.getenv("WAL_SYNC_COMMIT", "false").lower() == "true" # Wait for fsync before returning
+SNAPSHOT_INTERVAL_SECONDS: int = int(os.getenv("SNAPSHOT_INTERVAL_SECONDS", 300))
+SNAPSHOT_MAX_RECORDS: int = int(os.getenv("SNAPSHOT_MAX_RECORDS", 1_000_000)) # Snapshot early after this many log records
+
+# Batch scoring (POST /risk/batch, /recommendations/batch)
+BATCH_MAX_ITEMS: int = int(os.getenv("BATCH_MAX_ITEMS", 5000))
+
+# Shared recommendation cache (keyed by normalized profile features)
+RECOMMENDATION_CACHE_MAX_ENTRIES: int = int(os.getenv("RECOMMENDATION_CACHE_MAX_ENTRIES", 10000))
+RECOMMENDATION_CACHE_TTL_SECONDS: int = int(os.getenv("RECOMMENDATION_CACHE_TTL_SECONDS", 3600))
+
+# Serve cached recommendation lists as pre-encoded JSON, skipping response_model re-validation
+FAST_JSON_RESPONSES: bool = os.getenv("FAST_JSON_RESPONSES", "false").lower() == "true"
+
+# Chat streaming (/chat/stream)
+CHAT_STREAM_CHUNK_WORDS: int = int(os.getenv("CHAT_STREAM_CHUNK_WORDS", 3)) # Words per SSE event from the local mock producer
+
+# Chat backend: "inline" (call mock_chat_response directly) or "stub" (simulated
+# inference server behind the micro-batching scheduler)
+CHAT_BACKEND: str = os.getenv("CHAT_BACKEND", "inline")
+CHAT_MAX_BATCH_SIZE: int = int(os.getenv("CHAT_MAX_BATCH_SIZE", 16))
+CHAT_MAX_WAIT_MS: int = int(os.getenv("CHAT_MAX_WAIT_MS", 5)) # How long the first request in a batch waits for company
+CHAT_TIMEOUT_SECONDS: float = float(os.getenv("CHAT_TIMEOUT_SECONDS", 10))
+CHAT_STUB_CALL_LATENCY_MS: int = int(os.getenv("CHAT_STUB_CALL_LATENCY_MS", 50)) # Fixed cost per backend call
+CHAT_STUB_ITEM_LATENCY_MS: int = int(os.getenv("CHAT_STUB_ITEM_LATENCY_MS", 2)) # Extra cost per prompt in a batch
+CHAT_STUB_CONCURRENCY: int = int(os.getenv("CHAT_STUB_CONCURRENCY", 4)) # Backend calls the stub serves at once
+
+# Server-side chat history (per user, in memory)
+CHAT_HISTORY_MAX_TURNS: int = int(os.getenv("CHAT_HISTORY_MAX_TURNS", 20)) # Ring buffer size per user
+CHAT_HISTORY_MAX_CHARS: int = int(os.getenv("CHAT_HISTORY_MAX_CHARS", 8000)) # Older turns are trimmed past this
+CHAT_HISTORY_MAX_SESSIONS: int = int(os.getenv("CHAT_HISTORY_MAX_SESSIONS", 100_000))
+CHAT_HISTORY_MAX_TOTAL_CHARS: int = int(os.getenv("CHAT_HISTORY_MAX_TOTAL_CHARS", 200_000_000)) # Global cap, LRU eviction past this
+
+# Resume uploads (POST /profile/{userId}/resume)
+RESUME_MAX_BYTES: int = int(os.getenv("RESUME_MAX_BYTES", 5 * 1024 * 1024))
+RESUME_SPILL_DIR: str = os.getenv("RESUME_SPILL_DIR", "") # Keep raw resumes on disk here instead of in memory (empty = memory)
+
+# Catalog relevance ranking (BM25) for job titles no occupation rule covers
+RELEVANCE_RANKING: bool = os.getenv("RELEVANCE_RANKING", "true").lower() == "true"
+RELEVANCE_TOP_K: int = int(os.getenv("RELEVANCE_TOP_K", 2)) # Entries returned per section (0 = rule entries only)
+
+# Occupation dataset for automation risk (CSV: title,risk_score,explanation[,synonyms]); empty = rule table only
+OCCUPATIONS_CSV: str = os.getenv("OCCUPATIONS_CSV", "")
+OCCUPATION_MIN_SIMILARITY: float = float(os.getenv("OCCUPATION_MIN_SIMILARITY", 0.6)) # Fuzzy match threshold (trigram Dice)
+OCCUPATION_MEMO_SIZE: int = int(os.getenv("OCCUPATION_MEMO_SIZE", 50_000)) # Resolved titles kept in memory
+
+# Startup: build catalogs, indexes and crypto contexts before reporting ready (GET /ready)
+WARMUP_ON_STARTUP: bool = os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true"
+
+# Admission control / load shedding (see services/admission.py)
+ADMISSION_CONTROL: bool = os.getenv("ADMISSION_CONTROL", "true").lower() == "true"
+LOOP_LAG_INTERVAL_MS: int = int(os.getenv("LOOP_LAG_INTERVAL_MS", 50)) # Event-loop lag sampling period
+ADMISSION_LAG_SHED_LOW_MS: int = int(os.getenv("ADMISSION_LAG_SHED_LOW_MS", 100)) # Shed auth/chat/bulk routes above this lag
+ADMISSION_LAG_SHED_NORMAL_MS: int = int(os.getenv("ADMISSION_LAG_SHED_NORMAL_MS", 500)) # Shed everything but /me and health checks
+ADMISSION_MAX_INFLIGHT_AUTH: int = int(os.getenv("ADMISSION_MAX_INFLIGHT_AUTH", 128)) # Per route class, 0 = unlimited
+ADMISSION_MAX_INFLIGHT_CHAT: int = int(os.getenv("ADMISSION_MAX_INFLIGHT_CHAT", 256))
+ADMISSION_MAX_INFLIGHT_BULK: int = int(os.getenv("ADMISSION_MAX_INFLIGHT_BULK", 16))
+ADMISSION_MAX_INFLIGHT_DEFAULT: int = int(os.getenv("ADMISSION_MAX_INFLIGHT_DEFAULT", 0))
+ADMISSION_KEY_RATE: float = float(os.getenv("ADMISSION_KEY_RATE", 0)) # Requests/s per API key (or client address), 0 = off
+ADMISSION_KEY_BURST: float = float(os.getenv("ADMISSION_KEY_BURST", 0)) # 0 = same as the rate
+ADMISSION_USER_RATE: float = float(os.getenv("ADMISSION_USER_RATE", 0)) # Requests/s per user, 0 = off
+ADMISSION_USER_BURST: float = float(os.getenv("ADMISSION_USER_BURST", 0))
+ADMISSION_SHARDS: int = int(os.getenv("ADMISSION_SHARDS", 16)) # Lock shards of the token bucket maps
+
+# Prometheus metrics (GET /metrics); off removes the middleware and the service function timers
+METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+# Per-request profiling (off = no middleware at all). Profiles land in a ring of files, listed at /api/v1/admin/profiles
+PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILING_TOKEN: str = os.getenv("PROFILING_TOKEN", "") # Debug header value and admin credential (empty = header trigger and admin routes off)
+PROFILING_HEADER: str = "X-Debug-Profile"
+ADMIN_TOKEN_HEADER: str = "X-Admin-Token" # Admin routes take PROFILING_TOKEN in this header
+PROFILING_SAMPLE_RATE: float = float(os.getenv("PROFILING_SAMPLE_RATE", 0)) # Fraction of requests profiled at random
+PROFILING_ROUTE_RATES: str = os.getenv("PROFILING_ROUTE_RATES", "") # Per path prefix, e.g. "/api/v1/chat=0.01,/api/v1/jobs=0.05"
+PROFILING_DIR: str = os.getenv("PROFILING_DIR", "profiles")
+PROFILING_MAX_FILES: int = int(os.getenv("PROFILING_MAX_FILES", 100)) # Oldest profiles are deleted past this
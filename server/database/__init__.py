@@ -1,2 +1,6 @@
 # database/__init__.py
-from .database import fake_users_by_email,  fake_db, get_user_by_email_from_db, get_user_from_db, create_user_in_db, update_user_in_db
\ No newline at end of file
+from .database import fake_users_by_email,  fake_db, get_user_by_email_from_db, get_user_from_db, create_user_in_db, update_user_in_db, register_user_change_listener
+from .database import get_user_from_db_async, get_user_by_email_from_db_async, create_user_in_db_async, update_user_in_db_async, get_user_store, set_user_store
+from .database import get_state_client, invalidation_bus
+from .database import find_users_by_job_title, find_users_by_interest
+from .storage import UserStore, DictUserStore, EmailTaken
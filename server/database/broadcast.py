@@ -0,0 +1,102 @@
+# database/broadcast.py
+import logging
+import queue
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+from uuid import uuid4
+
+from .resp import RespClient, RespError, Subscription
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidationBus:
+    """
+    Cross-worker cache invalidation over the state backend's pub/sub.
+
+    Caches stay per process; when one worker changes something others may
+    have cached, it handles the change locally and calls broadcast(), and
+    every other worker runs the handlers subscribed to that topic. Messages
+    are "origin topic payload"; a worker ignores its own. Delivery is best
+    effort and asynchronous (a worker may serve a stale cache entry for a
+    moment), which is fine for caches that also expire on their own.
+
+    Pub/sub keeps no backlog, so a worker misses whatever was broadcast
+    while its subscription was down. Handlers registered with on_connect()
+    run each time the subscription is (re)established and should drop
+    everything the missed messages might have invalidated.
+
+    Without a state backend (single process) broadcast() does nothing.
+    """
+
+    def __init__(self, client: Optional[RespClient], channel: str = "futureskills:invalidate"):
+        self.client = client
+        self.channel = channel
+        self.origin = uuid4().hex[:12]
+        self._handlers: Dict[str, List[Callable[[str], None]]] = defaultdict(list)
+        self._connect_handlers: List[Callable[[], None]] = []
+        self._outbox: "queue.SimpleQueue[Optional[str]]" = queue.SimpleQueue()
+        self._sender: Optional[threading.Thread] = None
+        self._sender_lock = threading.Lock()
+        self._subscription: Optional[Subscription] = None
+        self.sent = 0
+        self.received = 0
+        self.failed = 0
+
+    def subscribe(self, topic: str, handler: Callable[[str], None]) -> None:
+        """Runs handler(payload) for every `topic` message from another worker (on the subscriber thread)."""
+        self._handlers[topic].append(handler)
+
+    def on_connect(self, handler: Callable[[], None]) -> None:
+        """Runs handler() whenever the subscription is (re)established (on the subscriber thread)."""
+        self._connect_handlers.append(handler)
+
+    def _on_connect(self) -> None:
+        for handler in self._connect_handlers:
+            handler()
+
+    def broadcast(self, topic: str, payload: str = "") -> None:
+        """Tells the other workers; never blocks the caller on the network."""
+        if self.client is None:
+            return
+        if self._sender is None:
+            with self._sender_lock:
+                if self._sender is None:
+                    self._sender = threading.Thread(target=self._send_loop, name="invalidation-sender", daemon=True)
+                    self._sender.start()
+        self._outbox.put(f"{self.origin} {topic} {payload}")
+
+    def _send_loop(self) -> None:
+        while True:
+            message = self._outbox.get()
+            if message is None:
+                return
+            try:
+                self.client.publish(self.channel, message)
+                self.sent += 1
+            except (OSError, RespError):
+                self.failed += 1
+                logger.warning("Could not broadcast cache invalidation %r", message, exc_info=True)
+
+    def _on_message(self, channel: str, message: bytes) -> None:
+        origin, topic, payload = message.decode().split(" ", 2)
+        if origin == self.origin:
+            return
+        self.received += 1
+        for handler in self._handlers.get(topic, ()):
+            handler(payload)
+
+    def start(self) -> None:
+        """Starts listening for other workers' messages (idempotent)."""
+        if self.client is not None and self._subscription is None:
+            self._subscription = self.client.subscribe([self.channel], self._on_message, self._on_connect)
+
+    def stop(self) -> None:
+        if self._subscription is not None:
+            self._subscription.stop()
+            self._subscription = None
+        if self._sender is not None:
+            self._outbox.put(None) # Sends what is queued, then exits
+            self._sender.join(timeout=1)
+            self._sender = None
@@ -0,0 +1,186 @@
+# database/compact_store.py
+import sys
+import zlib
+from typing import Dict, Iterator, Optional
+from uuid import UUID
+
+from pydantic import PrivateAttr, model_serializer
+
+from models import UserDB
+from .storage import UserStore
+
+# Resumes shorter than this are kept as plain UTF-8; compression doesn't pay off
+_COMPRESS_MIN_BYTES = 256
+
+
+class _UserRecord:
+    """Resident form of a user: no per-instance __dict__, no pydantic overhead."""
+    __slots__ = (
+        "email", "hashed_password", "full_name", "job_title", "experience", "interests", "resume", "resume_file", "skills",
+        "revision",
+    )
+
+    def __init__(self, email, hashed_password, full_name, job_title, experience, interests, resume, resume_file, skills, revision):
+        self.email = email
+        self.hashed_password = hashed_password
+        self.full_name = full_name
+        self.job_title = job_title
+        self.experience = experience
+        self.interests = interests
+        self.resume = resume
+        self.resume_file = resume_file
+        self.skills = skills # Tuple of interned skill names
+        self.revision = revision
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    # Job titles and experience ranges repeat across many users; share one copy
+    return sys.intern(value) if value is not None else None
+
+
+def _pack_resume(text: Optional[str]):
+    if text is None:
+        return None
+    raw = text.encode()
+    if len(raw) < _COMPRESS_MIN_BYTES:
+        return text
+    return zlib.compress(raw, 6)
+
+
+def _unpack_resume(resume) -> Optional[str]:
+    if resume is None or isinstance(resume, str):
+        return resume
+    return zlib.decompress(resume).decode()
+
+
+# Fields declared after resumeText, moved back behind it once the resume is inflated
+_AFTER_RESUME = tuple(UserDB.model_fields)[tuple(UserDB.model_fields).index("resumeText") + 1:]
+
+
+class _LazyResumeUser(UserDB):
+    """
+    A UserDB whose compressed resume is only inflated when resumeText is read
+    (or the user is serialized); most reads (/risk, /jobs, tokens) never touch it.
+    """
+    _packed_resume: Optional[bytes] = PrivateAttr(None)
+
+    def __getattr__(self, name):
+        # Only reached while resumeText is missing from the instance dict
+        if name != "resumeText":
+            return super().__getattr__(name)
+        values = self.__dict__
+        values["resumeText"] = _unpack_resume(self._packed_resume)
+        for field in _AFTER_RESUME: # Keep declaration order, so dumps match a plain UserDB
+            if field in values:
+                values[field] = values.pop(field)
+        return values["resumeText"]
+
+    @model_serializer(mode="wrap")
+    def _inflate_resume(self, handler):
+        self.resumeText
+        return handler(self)
+
+
+class CompactUserStore(UserStore):
+    """
+    Memory-lean user storage.
+
+    Users are kept as slotted records keyed by the 16-byte UUID, with interned
+    job titles / experience, ASCII bcrypt hashes stored as bytes and long
+    resumes zlib-compressed. The email index points at the key, not a second
+    object. A UserDB is only built when a caller asks for one.
+    """
+
+    def __init__(self):
+        self.records: Dict[bytes, _UserRecord] = {}
+        self.keys_by_email: Dict[str, bytes] = {}
+
+    @staticmethod
+    def _to_record(user_data: UserDB) -> _UserRecord:
+        if isinstance(user_data, _LazyResumeUser) and "resumeText" not in user_data.__dict__:
+            resume = user_data._packed_resume # Written back untouched: no inflate / recompress
+        else:
+            resume = _pack_resume(user_data.resumeText)
+        return _UserRecord(
+            email=str(user_data.email) if user_data.email else None,
+            hashed_password=user_data.hashed_password.encode("ascii") if user_data.hashed_password else None,
+            full_name=user_data.full_name,
+            job_title=_intern(user_data.jobTitle),
+            experience=_intern(user_data.experience),
+            interests=user_data.interests,
+            resume=resume,
+            resume_file=user_data.resumeFile,
+            skills=tuple(sys.intern(skill) for skill in user_data.skills) if user_data.skills is not None else None,
+            revision=user_data.revision,
+        )
+
+    @staticmethod
+    def _to_user(key: bytes, record: _UserRecord) -> UserDB:
+        # Trusted data (validated on the way in), so skip re-validation
+        compressed = isinstance(record.resume, bytes)
+        user = (_LazyResumeUser if compressed else UserDB).model_construct(
+            id=UUID(bytes=key),
+            email=record.email,
+            hashed_password=record.hashed_password.decode("ascii") if record.hashed_password else None,
+            full_name=record.full_name,
+            jobTitle=record.job_title,
+            experience=record.experience,
+            interests=record.interests,
+            resumeText=None if compressed else record.resume,
+            resumeFile=record.resume_file,
+            skills=list(record.skills) if record.skills is not None else None,
+            revision=record.revision,
+        )
+        if compressed:
+            del user.__dict__["resumeText"] # Inflated on first read
+            user._packed_resume = record.resume
+        return user
+
+    def _put(self, key: bytes, record: _UserRecord) -> None:
+        previous = self.records.get(key)
+        if previous is not None and previous.email and previous.email.lower() != (record.email or "").lower():
+            if self.keys_by_email.get(previous.email.lower()) == key:
+                del self.keys_by_email[previous.email.lower()]
+        self.records[key] = record
+        if record.email:
+            self.keys_by_email[record.email.lower()] = key
+
+    def get(self, user_id: UUID) -> Optional[UserDB]:
+        key = user_id.bytes
+        record = self.records.get(key)
+        return self._to_user(key, record) if record is not None else None
+
+    def get_by_email(self, email: str) -> Optional[UserDB]:
+        key = self.keys_by_email.get(email.lower())
+        return self._to_user(key, self.records[key]) if key is not None else None
+
+    def create(self, user_data: UserDB) -> UserDB:
+        self._put(user_data.id.bytes, self._to_record(user_data))
+        return user_data
+
+    def update(self, user_id: UUID, user_data: UserDB) -> Optional[UserDB]:
+        key = user_id.bytes
+        if key not in self.records:
+            return None
+        user_data.id = user_id
+        self._put(key, self._to_record(user_data))
+        return user_data
+
+    def count(self) -> int:
+        return len(self.records)
+
+    def scan(self) -> Iterator[UserDB]:
+        return (self._to_user(key, record) for key, record in list(self.records.items()))
+
+    # Pure in-memory work, no thread hop needed
+    async def get_async(self, user_id: UUID) -> Optional[UserDB]:
+        return self.get(user_id)
+
+    async def get_by_email_async(self, email: str) -> Optional[UserDB]:
+        return self.get_by_email(email)
+
+    async def create_async(self, user_data: UserDB) -> UserDB:
+        return self.create(user_data)
+
+    async def update_async(self, user_id: UUID, user_data: UserDB) -> Optional[UserDB]:
+        return self.update(user_id, user_data)
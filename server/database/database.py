@@ -1,7 +1,13 @@
 # database/database.py
-from typing import Dict, Optional
+import secrets
+from typing import Callable, Dict, List, Optional, Union
 from uuid import UUID
 from models import UserDB # Import the UserDB model
+from config import DATABASE_BACKEND, SHARDED_STORE_SHARDS, SQLITE_PATH, SQLITE_POOL_SIZE, STATE_URL, STATE_POOL_SIZE, STATE_TIMEOUT_SECONDS
+from config import WAL_DIR, WAL_FLUSH_INTERVAL_MS, WAL_SYNC_COMMIT, SNAPSHOT_INTERVAL_SECONDS, SNAPSHOT_MAX_RECORDS
+from .storage import UserStore, DictUserStore
+from .broadcast import InvalidationBus
+from .resp import RespClient
 
 # Mock Database (In-Memory Dictionary) - UPDATED
 # Key is now user ID (UUID)
@@ -10,39 +16,155 @@ fake_db: Dict[UUID, UserDB] = {}
 # Added an index for quick lookup by email
 fake_users_by_email: Dict[str, UserDB] = {}
 
+# Callbacks run with the user ID after a user entry is created or updated.
+# Caches that hold UserDB objects register here to drop stale entries.
+_user_change_listeners: List[Callable[[UUID], None]] = []
 
-def get_user_from_db(user_id: str) -> Optional[UserDB]:
-    """Retrieves a user by ID from the mock database."""
+# Connection pool to the shared state backend (None when STATE_URL is unset)
+_state_client: Optional[RespClient] = (
+    RespClient(STATE_URL, pool_size=STATE_POOL_SIZE, timeout=STATE_TIMEOUT_SECONDS) if STATE_URL else None
+)
+
+# Tells other worker processes about writes so they drop cached copies
+invalidation_bus = InvalidationBus(_state_client)
+
+
+def get_state_client() -> Optional[RespClient]:
+    """The shared state backend client, or None when running as a single process."""
+    return _state_client
+
+
+def _create_store() -> UserStore:
+    """Builds the storage backend selected by DATABASE_BACKEND."""
+    if DATABASE_BACKEND == "shared":
+        if _state_client is None:
+            raise RuntimeError("DATABASE_BACKEND=shared needs STATE_URL (e.g. unix:///tmp/futureskills-state.sock)")
+        from .shared_store import SharedUserStore
+        return SharedUserStore(_state_client)
+    if DATABASE_BACKEND == "sqlite":
+        from .sqlite_store import SQLiteUserStore
+        return SQLiteUserStore(SQLITE_PATH, pool_size=SQLITE_POOL_SIZE)
+    if DATABASE_BACKEND == "sharded":
+        from .sharded_store import ShardedUserStore
+        return ShardedUserStore(SHARDED_STORE_SHARDS)
+    if DATABASE_BACKEND == "compact":
+        from .compact_store import CompactUserStore
+        return CompactUserStore()
+    if WAL_DIR:
+        # In-memory dicts made durable by a write-ahead log + snapshots
+        from .durable_store import DurableDictUserStore
+        from .wal import WriteAheadLog
+        wal = WriteAheadLog(WAL_DIR, flush_interval=WAL_FLUSH_INTERVAL_MS / 1000, sync_commit=WAL_SYNC_COMMIT)
+        return DurableDictUserStore(
+            fake_db, fake_users_by_email, wal,
+            snapshot_interval=SNAPSHOT_INTERVAL_SECONDS,
+            snapshot_max_records=SNAPSHOT_MAX_RECORDS,
+        )
+    # Default: the in-memory dicts above
+    return DictUserStore(fake_db, fake_users_by_email)
+
+
+_store: UserStore = _create_store()
+
+
+def get_user_store() -> UserStore:
+    """Returns the active storage backend."""
+    return _store
+
+
+def set_user_store(store: UserStore) -> UserStore:
+    """Swaps the storage backend (benchmarks, tooling). Returns the previous one."""
+    global _store
+    previous, _store = _store, store
+    return previous
+
+
+def register_user_change_listener(listener: Callable[[UUID], None]) -> None:
+    """Registers a callback invoked whenever a user entry is written."""
+    _user_change_listeners.append(listener)
+
+
+def _new_revision(user_data: UserDB) -> UserDB:
+    # Stored with the user, so every worker derives the same ETag from it. A
+    # random id rather than a counter: writers in different processes need no
+    # read-modify-write to pick one, and a reused value is practically ruled out.
+    user_data.revision = secrets.randbits(63)
+    return user_data
+
+
+def _apply_user_change(user_id: UUID) -> None:
+    for listener in _user_change_listeners:
+        listener(user_id)
+
+
+def _notify_user_changed(user_id: UUID) -> None:
+    _apply_user_change(user_id)
+    invalidation_bus.broadcast("user", user_id.hex) # Other workers drop their cached tokens for this user
+
+
+# Writes made by other workers
+invalidation_bus.subscribe("user", lambda payload: _apply_user_change(UUID(hex=payload)))
+
+
+def _to_uuid(user_id: Union[str, UUID]) -> Optional[UUID]:
     try:
-        # Convert string to UUID and use .get() for safe access
-        user_uuid = UUID(user_id)
-        return fake_db.get(user_uuid)
+        # Convert string to UUID
+        return user_id if isinstance(user_id, UUID) else UUID(str(user_id))
     except ValueError:
         # Handle cases where user_id is not a valid UUID string
         return None
-    
+
+
+def get_user_from_db(user_id: Union[str, UUID]) -> Optional[UserDB]:
+    """Retrieves a user by ID from the database."""
+    user_uuid = _to_uuid(user_id)
+    return _store.get(user_uuid) if user_uuid else None
+
 
 def get_user_by_email_from_db(email: str) -> Optional[UserDB]:
-    """Retrieves a user by email from the mock database index."""
-    return fake_users_by_email.get(email.lower()) # Store/lookup lowercase email
+    """Retrieves a user by email from the database index."""
+    return _store.get_by_email(email)
 
 def create_user_in_db(user_data: UserDB) -> UserDB:
-    """Adds a new user to the mock database and updates index."""
-    fake_db[user_data.id] = user_data
-    fake_users_by_email[user_data.email.lower()] = user_data # Add to email index
-    return user_data
+    """Adds a new user to the database and updates index."""
+    user = _store.create(_new_revision(user_data))
+    _notify_user_changed(user.id)
+    return user
 
 def update_user_in_db(user_id: UUID, user_data: UserDB) -> Optional[UserDB]:
-    """Updates an existing user in the mock database and index."""
-    if user_id in fake_db:
-        # Ensure the ID in user_data matches the user_id being updated
-        # (or handle potential mismatches if necessary)
-        user_data.id = user_id 
-        
-        # Update the main database entry
-        fake_db[user_id] = user_data
-
-        return user_data
-    return None
-
-# Add other database interaction functions here as needed
\ No newline at end of file
+    """Updates an existing user in the database and index."""
+    user = _store.update(user_id, _new_revision(user_data))
+    if user is not None:
+        _notify_user_changed(user_id)
+    return user
+
+def find_users_by_job_title(job_title: str) -> List[UserDB]:
+    """All users with this job title (case/whitespace-insensitive). Indexed on the sharded backend, a full scan elsewhere."""
+    return _store.find_by_job_title(job_title)
+
+def find_users_by_interest(interest: str) -> List[UserDB]:
+    """All users whose interests mention every word of `interest`. Indexed on the sharded backend, a full scan elsewhere."""
+    return _store.find_by_interest(interest)
+
+
+# --- Async variants (don't block the event loop on disk-backed stores) ---
+
+async def get_user_from_db_async(user_id: Union[str, UUID]) -> Optional[UserDB]:
+    user_uuid = _to_uuid(user_id)
+    return await _store.get_async(user_uuid) if user_uuid else None
+
+async def get_user_by_email_from_db_async(email: str) -> Optional[UserDB]:
+    return await _store.get_by_email_async(email)
+
+async def create_user_in_db_async(user_data: UserDB) -> UserDB:
+    user = await _store.create_async(_new_revision(user_data))
+    _notify_user_changed(user.id)
+    return user
+
+async def update_user_in_db_async(user_id: UUID, user_data: UserDB) -> Optional[UserDB]:
+    user = await _store.update_async(user_id, _new_revision(user_data))
+    if user is not None:
+        _notify_user_changed(user_id)
+    return user
+
+# Add other database interaction functions here as needed
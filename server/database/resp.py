@@ -0,0 +1,304 @@
+# database/resp.py
+import logging
+import queue
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterable, List, Optional, Sequence, Union
+from urllib.parse import unquote, urlparse
+
+logger = logging.getLogger(__name__)
+
+# Minimal client for the Redis protocol (RESP2), enough for the shared state
+# backend: plain commands, pipelines, MULTI/EXEC transactions (optionally
+# under WATCH) and pub/sub.
+# Works against Redis itself or the stand-in in database/resp_server.py.
+#
+# Addresses: "redis://[:password@]host:port/db" or "unix:///path/to.sock".
+
+Arg = Union[str, bytes, int, float]
+
+
+class RespError(Exception):
+    """Error reply from the server (e.g. "WRONGTYPE ...")."""
+
+
+class RespConnection:
+    """One socket to the server. Not thread-safe; the client pools them."""
+
+    def __init__(self, url: str, timeout: float):
+        parsed = urlparse(url)
+        if parsed.scheme == "unix":
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            self.sock.connect(parsed.path)
+        elif parsed.scheme in ("redis", "tcp"):
+            self.sock = socket.create_connection((parsed.hostname or "localhost", parsed.port or 6379), timeout=timeout)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        else:
+            raise ValueError(f"Unsupported state backend address: {url!r}")
+        self._reader = self.sock.makefile("rb")
+        if parsed.password:
+            self.execute("AUTH", unquote(parsed.password))
+        database = parsed.path.strip("/") if parsed.scheme != "unix" else ""
+        if database and database != "0":
+            self.execute("SELECT", database)
+
+    @staticmethod
+    def encode(args: Sequence[Arg]) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if isinstance(arg, str):
+                arg = arg.encode()
+            elif not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(parts)
+
+    def send(self, commands: Iterable[Sequence[Arg]]) -> None:
+        self.sock.sendall(b"".join(self.encode(args) for args in commands))
+
+    def read_reply(self):
+        """Next reply; error replies are returned as RespError instances, not raised."""
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("State backend closed the connection")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            return RespError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            if len(data) != length + 2:
+                raise ConnectionError("State backend closed the connection")
+            return data[:-2]
+        if kind == b"*":
+            length = int(rest)
+            return None if length < 0 else [self.read_reply() for _ in range(length)]
+        raise ConnectionError(f"Malformed reply from state backend: {line!r}")
+
+    def execute(self, *args: Arg):
+        self.send([args])
+        reply = self.read_reply()
+        if isinstance(reply, RespError):
+            raise reply
+        return reply
+
+    def close(self) -> None:
+        try:
+            self._reader.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class RespClient:
+    """
+    Thread-safe client with a pool of up to `pool_size` connections (opened
+    on demand). A connection that fails mid-command is thrown away together
+    with the idle ones, which are likely dead too (e.g. the server restarted).
+    """
+
+    def __init__(self, url: str, pool_size: int = 8, timeout: float = 5.0):
+        self.url = url
+        self.timeout = timeout
+        self._pool: "queue.LifoQueue[RespConnection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max(1, pool_size))
+
+    @contextmanager
+    def _connection(self):
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                conn = RespConnection(self.url, self.timeout)
+            healthy = False
+            try:
+                yield conn
+                healthy = True
+            except RespError: # The reply was read in full, the connection is fine
+                healthy = True
+                raise
+            except OSError: # Includes ConnectionError and timeouts
+                self._drain()
+                raise
+            finally:
+                if healthy:
+                    self._pool.put(conn)
+                else:
+                    conn.close()
+        finally:
+            self._slots.release()
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def execute(self, *args: Arg):
+        with self._connection() as conn:
+            return conn.execute(*args)
+
+    def pipeline(self, commands: Sequence[Sequence[Arg]]) -> List:
+        """Sends all commands in one write and returns their replies in order. Raises the first error reply."""
+        if not commands:
+            return []
+        with self._connection() as conn:
+            conn.send(commands)
+            replies = [conn.read_reply() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    def transaction(self, commands: Sequence[Sequence[Arg]]) -> List:
+        """Runs the commands atomically (MULTI/EXEC) in one round trip; returns their replies."""
+        replies = self.pipeline([("MULTI",), *commands, ("EXEC",)])
+        results = replies[-1]
+        if results is None:
+            raise RespError("Transaction aborted")
+        for result in results:
+            if isinstance(result, RespError):
+                raise result
+        return results
+
+    def watch_transaction(
+        self,
+        keys: Sequence[str],
+        plan: Callable[[Callable[..., object]], Optional[Sequence[Sequence[Arg]]]],
+        attempts: int = 20,
+    ) -> Optional[List]:
+        """
+        Optimistic read-modify-write: WATCHes `keys`, calls plan(execute) to
+        read what it needs and return the commands to run (None to write
+        nothing), then runs them in MULTI/EXEC. If a watched key changed in
+        between, EXEC runs nothing and the whole thing starts over. Returns
+        the EXEC replies, or None if plan() returned None.
+        """
+        for _ in range(attempts):
+            with self._connection() as conn:
+                conn.execute("WATCH", *keys)
+                try:
+                    commands = plan(conn.execute)
+                except Exception:
+                    conn.execute("UNWATCH") # The connection goes back to the pool
+                    raise
+                if commands is None:
+                    conn.execute("UNWATCH")
+                    return None
+                conn.send([("MULTI",), *commands, ("EXEC",)])
+                replies = [conn.read_reply() for _ in range(len(commands) + 2)]
+            for reply in replies[:-1]:
+                if isinstance(reply, RespError):
+                    raise reply
+            if replies[-1] is not None:
+                for result in replies[-1]:
+                    if isinstance(result, RespError):
+                        raise result
+                return replies[-1]
+        raise RespError(f"Transaction on {list(keys)} kept conflicting, gave up after {attempts} attempts")
+
+    def publish(self, channel: str, message: Union[str, bytes]) -> int:
+        return self.execute("PUBLISH", channel, message)
+
+    def subscribe(
+        self,
+        channels: Sequence[str],
+        callback: Callable[[str, bytes], None],
+        on_connect: Optional[Callable[[], None]] = None,
+    ) -> "Subscription":
+        """
+        Calls callback(channel, message) from a background thread for every
+        message published on `channels`, and on_connect() each time the
+        subscription is (re)established.
+        """
+        subscription = Subscription(self.url, self.timeout, channels, callback, on_connect)
+        subscription.start()
+        return subscription
+
+    def close(self) -> None:
+        self._drain()
+
+
+class Subscription:
+    """
+    Dedicated pub/sub connection read by a daemon thread; reconnects with
+    backoff. Pub/sub keeps no history: messages published while the
+    connection was down are lost, which is what on_connect is for.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        timeout: float,
+        channels: Sequence[str],
+        callback: Callable[[str, bytes], None],
+        on_connect: Optional[Callable[[], None]] = None,
+    ):
+        self.url = url
+        self.timeout = timeout
+        self.channels = list(channels)
+        self.callback = callback
+        self.on_connect = on_connect
+        self.connected = threading.Event()
+        self._conn: Optional[RespConnection] = None
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="resp-subscription", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def _run(self) -> None:
+        backoff = 0.1
+        while not self._stopped:
+            try:
+                self._conn = RespConnection(self.url, self.timeout)
+                self._conn.sock.settimeout(None) # Messages can be far apart
+                self._conn.send([("SUBSCRIBE", *self.channels)])
+                for _ in self.channels:
+                    self._conn.read_reply() # Subscription confirmations
+                self.connected.set()
+                if self.on_connect is not None:
+                    try:
+                        self.on_connect()
+                    except Exception:
+                        logger.exception("State backend on-connect handler failed")
+                backoff = 0.1
+                while not self._stopped:
+                    reply = self._conn.read_reply()
+                    if isinstance(reply, list) and len(reply) == 3 and reply[0] == b"message":
+                        try:
+                            self.callback(reply[1].decode(), reply[2])
+                        except Exception:
+                            logger.exception("State backend message handler failed")
+            except (OSError, ValueError):
+                self.connected.clear()
+                if self._stopped:
+                    break
+                logger.warning("State backend subscription lost; retrying in %.1fs", backoff)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 5.0)
+            finally:
+                if self._conn is not None:
+                    self._conn.close()
+                    self._conn = None
+
+    def stop(self) -> None:
+        self._stopped = True
+        conn = self._conn
+        if conn is not None:
+            try:
+                conn.sock.shutdown(socket.SHUT_RDWR) # Wakes the reader thread
+            except OSError:
+                pass
+        self._thread.join(timeout=1)
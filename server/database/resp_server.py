@@ -0,0 +1,330 @@
+# database/resp_server.py
+"""
+Local stand-in for Redis: a single process holding the shared state in
+memory and serving the subset of the Redis protocol our client uses
+(strings, sets, lists, MULTI/EXEC with WATCH, pub/sub) over a Unix socket
+or TCP. Each command runs to completion on one event loop, so every command
+and every MULTI/EXEC block is atomic, like in Redis. Nothing is persisted.
+
+    python -m database.resp_server --unix /tmp/futureskills-state.sock
+    python -m database.resp_server --port 6380
+
+Start it before the API workers and point them at it with
+DATABASE_BACKEND=shared STATE_URL=unix:///tmp/futureskills-state.sock.
+"""
+import argparse
+import asyncio
+import logging
+import os
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class _Reply:
+    """Pre-encoded replies."""
+    OK = b"+OK\r\n"
+    QUEUED = b"+QUEUED\r\n"
+    NULL = b"$-1\r\n"
+    NULL_ARRAY = b"*-1\r\n" # EXEC aborted by WATCH
+
+    @staticmethod
+    def error(message: str) -> bytes:
+        return b"-" + message.encode() + b"\r\n"
+
+    @staticmethod
+    def integer(value: int) -> bytes:
+        return b":%d\r\n" % value
+
+    @staticmethod
+    def bulk(value: Optional[bytes]) -> bytes:
+        return _Reply.NULL if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+    @staticmethod
+    def array(items: List[bytes]) -> bytes:
+        return b"*%d\r\n" % len(items) + b"".join(items)
+
+
+_WRONGTYPE = "WRONGTYPE Operation against a key holding the wrong kind of value"
+
+# Commands that may change their key(s); WATCH treats any of them as a change
+_WRITES_FIRST_KEY = frozenset({b"SET", b"INCR", b"SADD", b"SREM", b"RPUSH", b"LTRIM"})
+_WRITES_ALL_KEYS = frozenset({b"DEL"})
+
+
+class CommandError(Exception):
+    pass
+
+
+class RespServer:
+    """The keyspace plus the command table. One instance serves every connection."""
+
+    def __init__(self):
+        self.data: Dict[bytes, object] = {} # bytes (string), set or list
+        self.channels: Dict[bytes, Set[asyncio.StreamWriter]] = defaultdict(set)
+        self.versions: Dict[bytes, int] = {} # Per-key write counter for WATCH (never shrinks, fine for a stand-in)
+        self.flushes = 0 # FLUSHALL/FLUSHDB count; a flush touches every watched key
+
+    # --- Keyspace helpers ---
+
+    def _typed(self, key: bytes, kind: type, create: bool = False):
+        value = self.data.get(key)
+        if value is None:
+            if not create:
+                return None
+            value = self.data[key] = kind()
+        elif not isinstance(value, kind):
+            raise CommandError(_WRONGTYPE)
+        return value
+
+    def _drop_if_empty(self, key: bytes, value) -> None:
+        if not value:
+            self.data.pop(key, None)
+
+    # --- Commands; each takes the raw arguments and returns an encoded reply ---
+
+    def cmd_ping(self, *args):
+        return _Reply.bulk(args[0]) if args else b"+PONG\r\n"
+
+    def cmd_select(self, index):
+        return _Reply.OK # One keyspace; run one server per application
+
+    def cmd_auth(self, *args):
+        return _Reply.OK
+
+    def cmd_get(self, key):
+        return _Reply.bulk(self._typed(key, bytes))
+
+    def cmd_mget(self, *keys):
+        return _Reply.array([_Reply.bulk(value if isinstance(value, bytes) else None) for value in map(self.data.get, keys)])
+
+    def cmd_set(self, key, value, *options):
+        options = {option.upper() for option in options}
+        if b"NX" in options and key in self.data or b"XX" in options and key not in self.data:
+            return _Reply.NULL
+        self.data[key] = value
+        return _Reply.OK
+
+    def cmd_del(self, *keys):
+        return _Reply.integer(sum(self.data.pop(key, None) is not None for key in keys))
+
+    def cmd_exists(self, *keys):
+        return _Reply.integer(sum(key in self.data for key in keys))
+
+    def cmd_incr(self, key):
+        try:
+            value = int(self._typed(key, bytes) or b"0") + 1
+        except ValueError:
+            raise CommandError("ERR value is not an integer or out of range")
+        self.data[key] = str(value).encode()
+        return _Reply.integer(value)
+
+    def cmd_sadd(self, key, *members):
+        members_set = self._typed(key, set, create=True)
+        before = len(members_set)
+        members_set.update(members)
+        return _Reply.integer(len(members_set) - before)
+
+    def cmd_srem(self, key, *members):
+        members_set = self._typed(key, set)
+        if members_set is None:
+            return _Reply.integer(0)
+        before = len(members_set)
+        members_set.difference_update(members)
+        self._drop_if_empty(key, members_set)
+        return _Reply.integer(before - len(members_set))
+
+    def cmd_scard(self, key):
+        return _Reply.integer(len(self._typed(key, set) or ()))
+
+    def cmd_sismember(self, key, member):
+        return _Reply.integer(member in (self._typed(key, set) or ()))
+
+    def cmd_smembers(self, key):
+        return _Reply.array([_Reply.bulk(member) for member in self._typed(key, set) or ()])
+
+    def cmd_rpush(self, key, *values):
+        items = self._typed(key, list, create=True)
+        items.extend(values)
+        return _Reply.integer(len(items))
+
+    @staticmethod
+    def _range(length: int, start: bytes, stop: bytes) -> slice:
+        start, stop = int(start), int(stop)
+        start = max(0, start + length if start < 0 else start)
+        stop = stop + length if stop < 0 else stop
+        return slice(start, max(start, stop + 1))
+
+    def cmd_lrange(self, key, start, stop):
+        items = self._typed(key, list) or []
+        return _Reply.array([_Reply.bulk(item) for item in items[self._range(len(items), start, stop)]])
+
+    def cmd_ltrim(self, key, start, stop):
+        items = self._typed(key, list)
+        if items is not None:
+            items[:] = items[self._range(len(items), start, stop)]
+            self._drop_if_empty(key, items)
+        return _Reply.OK
+
+    def cmd_llen(self, key):
+        return _Reply.integer(len(self._typed(key, list) or ()))
+
+    def cmd_dbsize(self):
+        return _Reply.integer(len(self.data))
+
+    def cmd_flushall(self, *args):
+        self.data.clear()
+        self.flushes += 1
+        return _Reply.OK
+
+    cmd_flushdb = cmd_flushall
+
+    def cmd_publish(self, channel, message):
+        payload = _Reply.array([_Reply.bulk(b"message"), _Reply.bulk(channel), _Reply.bulk(message)])
+        subscribers = list(self.channels.get(channel, ()))
+        for writer in subscribers:
+            writer.write(payload) # Buffered; a dead subscriber is dropped when its connection closes
+        return _Reply.integer(len(subscribers))
+
+    def _touch(self, args: List[bytes]) -> None:
+        name = args[0].upper()
+        if name in _WRITES_FIRST_KEY and len(args) > 1:
+            keys = args[1:2]
+        elif name in _WRITES_ALL_KEYS:
+            keys = args[1:]
+        else:
+            return
+        for key in keys:
+            self.versions[key] = self.versions.get(key, 0) + 1
+
+    def execute(self, args: List[bytes]) -> bytes:
+        handler = getattr(self, "cmd_" + args[0].decode("latin-1").lower(), None)
+        if handler is None:
+            return _Reply.error(f"ERR unknown command '{args[0].decode('latin-1')}'")
+        self._touch(args)
+        try:
+            return handler(*args[1:])
+        except TypeError:
+            return _Reply.error(f"ERR wrong number of arguments for '{args[0].decode('latin-1').lower()}' command")
+        except (CommandError, ValueError) as e:
+            return _Reply.error(str(e) if isinstance(e, CommandError) else "ERR syntax error")
+
+    # --- Connections ---
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        queued: Optional[List[List[bytes]]] = None # Commands between MULTI and EXEC
+        watched: Dict[bytes, int] = {} # Key under WATCH -> its version when watched
+        watched_flushes: Optional[int] = None
+        subscribed: Set[bytes] = set()
+        try:
+            while True:
+                args = await _read_command(reader)
+                if args is None:
+                    break
+                name = args[0].upper()
+                if name == b"QUIT":
+                    writer.write(_Reply.OK)
+                    break
+                if name in (b"SUBSCRIBE", b"UNSUBSCRIBE"):
+                    channels = args[1:] or list(subscribed)
+                    for channel in channels:
+                        if name == b"SUBSCRIBE":
+                            subscribed.add(channel)
+                            self.channels[channel].add(writer)
+                        else:
+                            subscribed.discard(channel)
+                            self.channels[channel].discard(writer)
+                        writer.write(_Reply.array([
+                            _Reply.bulk(name.lower()), _Reply.bulk(channel), _Reply.integer(len(subscribed)),
+                        ]))
+                elif name == b"WATCH":
+                    if queued is not None:
+                        writer.write(_Reply.error("ERR WATCH inside MULTI is not allowed"))
+                    elif len(args) < 2:
+                        writer.write(_Reply.error("ERR wrong number of arguments for 'watch' command"))
+                    else:
+                        for key in args[1:]:
+                            watched.setdefault(key, self.versions.get(key, 0))
+                        watched_flushes = self.flushes if watched_flushes is None else watched_flushes
+                        writer.write(_Reply.OK)
+                elif name == b"UNWATCH":
+                    watched, watched_flushes = {}, None
+                    writer.write(_Reply.OK)
+                elif name == b"MULTI":
+                    writer.write(_Reply.error("ERR MULTI calls can not be nested") if queued is not None else _Reply.OK)
+                    queued = queued if queued is not None else []
+                elif name == b"EXEC":
+                    if queued is None:
+                        writer.write(_Reply.error("ERR EXEC without MULTI"))
+                    elif watched_flushes is not None and (
+                        watched_flushes != self.flushes
+                        or any(self.versions.get(key, 0) != version for key, version in watched.items())
+                    ):
+                        writer.write(_Reply.NULL_ARRAY) # A watched key changed: run nothing
+                    else:
+                        # No await in between: nothing else runs until the block is done
+                        writer.write(_Reply.array([self.execute(command) for command in queued]))
+                    if queued is not None:
+                        queued, watched, watched_flushes = None, {}, None
+                elif name == b"DISCARD":
+                    writer.write(_Reply.OK if queued is not None else _Reply.error("ERR DISCARD without MULTI"))
+                    queued, watched, watched_flushes = None, {}, None
+                elif queued is not None:
+                    queued.append(args)
+                    writer.write(_Reply.QUEUED)
+                else:
+                    writer.write(self.execute(args))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for channel in subscribed:
+                self.channels[channel].discard(writer)
+            writer.close()
+
+
+async def _read_command(reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+    """One request (an array of bulk strings). None on a clean disconnect."""
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        return line.split() or [b"PING"] # Inline command (e.g. typed into nc)
+    args = []
+    for _ in range(int(line[1:-2])):
+        header = await reader.readline()
+        length = int(header[1:-2])
+        args.append((await reader.readexactly(length + 2))[:-2])
+    return args
+
+
+async def serve(unix_path: Optional[str] = None, host: str = "127.0.0.1", port: int = 6380) -> None:
+    server = RespServer()
+    if unix_path:
+        if os.path.exists(unix_path):
+            os.remove(unix_path) # Left over from a previous run
+        listener = await asyncio.start_unix_server(server.handle, path=unix_path)
+        logger.info("State backend listening on unix://%s", unix_path)
+    else:
+        listener = await asyncio.start_server(server.handle, host, port)
+        logger.info("State backend listening on redis://%s:%d", host, port)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--unix", help="Unix socket path (preferred on a single host)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6380)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(serve(args.unix, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+# database/sharded_store.py
+import threading
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Set
+from uuid import UUID
+
+from models import UserDB
+from .storage import UserStore, interest_tokens, normalize_job_title
+
+# Index kinds
+EMAIL = "email"
+JOB_TITLE = "job_title"
+INTEREST = "interest"
+
+
+class _IndexKeys(NamedTuple):
+    email: Optional[str]
+    job_title: Optional[str]
+    interests: FrozenSet[str]
+
+    @classmethod
+    def of(cls, user: Optional[UserDB]) -> "_IndexKeys":
+        if user is None:
+            return _NO_KEYS
+        return cls(
+            user.email.lower() if user.email else None,
+            normalize_job_title(user.jobTitle) if user.jobTitle else None,
+            interest_tokens(user.interests),
+        )
+
+
+_NO_KEYS = _IndexKeys(None, None, frozenset())
+
+
+class _Shard:
+    __slots__ = ("lock", "users")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users: Dict[UUID, UserDB] = {}
+
+
+class _Stripe:
+    """One lock-striped part of the secondary indexes; an index key lives in exactly one stripe."""
+    __slots__ = ("lock", "email", "job_title", "interest")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.email: Dict[str, Dict[UUID, None]] = {} # Insertion-ordered: the last user to take an address wins lookups
+        self.job_title: Dict[str, Set[UUID]] = {}
+        self.interest: Dict[str, Set[UUID]] = {}
+
+
+class ShardedUserStore(UserStore):
+    """
+    Thread-safe in-memory store with secondary indexes.
+
+    Users live in `shards` dicts keyed by UUID, each behind its own lock.
+    The email, normalized job title and interest token indexes are split
+    into `stripes` parts by key hash, also one lock each. A write holds its
+    user's shard lock and then every stripe it touches, always in ascending
+    order (so writers never deadlock), and changes the user and all index
+    entries before letting go: readers never see a half-applied write.
+
+    Indexed reads hold the stripe of the key they look up; a write that
+    would move a user in or out of that key needs the same stripe, so the
+    users returned always match the query. get() takes no lock at all: a
+    dict lookup is atomic, and writes replace UserDB objects rather than
+    mutating them.
+    """
+
+    def __init__(self, shards: int = 16, stripes: Optional[int] = None):
+        self._shards = [_Shard() for _ in range(max(1, shards))]
+        self._stripes = [_Stripe() for _ in range(max(1, stripes or shards))]
+
+    def _shard(self, user_id: UUID) -> _Shard:
+        return self._shards[user_id.int % len(self._shards)]
+
+    def _stripe_index(self, kind: str, key: str) -> int:
+        return hash((kind, key)) % len(self._stripes)
+
+    def _stripe(self, kind: str, key: str) -> _Stripe:
+        return self._stripes[self._stripe_index(kind, key)]
+
+    # --- Writes ---
+
+    @staticmethod
+    def _index_changes(old: _IndexKeys, new: _IndexKeys):
+        """(kind, key, add) operations turning the old index entries into the new ones."""
+        changes = []
+        if old.email != new.email:
+            if old.email:
+                changes.append((EMAIL, old.email, False))
+            if new.email:
+                changes.append((EMAIL, new.email, True))
+        if old.job_title != new.job_title:
+            if old.job_title:
+                changes.append((JOB_TITLE, old.job_title, False))
+            if new.job_title:
+                changes.append((JOB_TITLE, new.job_title, True))
+        changes.extend((INTEREST, token, False) for token in old.interests - new.interests)
+        changes.extend((INTEREST, token, True) for token in new.interests - old.interests)
+        return changes
+
+    def _apply(self, user_id: UUID, kind: str, key: str, add: bool) -> None:
+        # Caller holds the key's stripe lock
+        stripe = self._stripe(kind, key)
+        if kind == EMAIL:
+            # Signup keeps addresses unique, but the store doesn't enforce it; with
+            # duplicates, every holder stays indexed and the latest one is returned
+            holders = stripe.email.setdefault(key, {})
+            if add:
+                holders[user_id] = None
+            else:
+                holders.pop(user_id, None)
+                if not holders:
+                    del stripe.email[key]
+            return
+        index = stripe.job_title if kind == JOB_TITLE else stripe.interest
+        if add:
+            index.setdefault(key, set()).add(user_id)
+        else:
+            members = index.get(key)
+            if members is not None:
+                members.discard(user_id)
+                if not members:
+                    del index[key]
+
+    def _write(self, user_data: UserDB, must_exist: bool) -> Optional[UserDB]:
+        shard = self._shard(user_data.id)
+        with shard.lock:
+            old = shard.users.get(user_data.id)
+            if old is None and must_exist:
+                return None
+            changes = self._index_changes(_IndexKeys.of(old), _IndexKeys.of(user_data))
+            locks = [self._stripes[i].lock for i in sorted({self._stripe_index(kind, key) for kind, key, _ in changes})]
+            for lock in locks:
+                lock.acquire()
+            try:
+                shard.users[user_data.id] = user_data
+                for kind, key, add in changes:
+                    self._apply(user_data.id, kind, key, add)
+            finally:
+                for lock in reversed(locks):
+                    lock.release()
+        return user_data
+
+    def create(self, user_data: UserDB) -> UserDB:
+        return self._write(user_data, must_exist=False)
+
+    def update(self, user_id: UUID, user_data: UserDB) -> Optional[UserDB]:
+        user_data.id = user_id
+        return self._write(user_data, must_exist=True)
+
+    # --- Reads ---
+
+    def get(self, user_id: UUID) -> Optional[UserDB]:
+        return self._shard(user_id).users.get(user_id)
+
+    def get_by_email(self, email: str) -> Optional[UserDB]:
+        key = email.lower()
+        stripe = self._stripe(EMAIL, key)
+        with stripe.lock:
+            holders = stripe.email.get(key)
+            return self.get(next(reversed(holders))) if holders else None
+
+    def _find(self, kind: str, key: str) -> List[UserDB]:
+        stripe = self._stripe(kind, key)
+        index = stripe.job_title if kind == JOB_TITLE else stripe.interest
+        with stripe.lock:
+            return [self.get(user_id) for user_id in index.get(key, ())]
+
+    def find_by_job_title(self, job_title: str) -> List[UserDB]:
+        return self._find(JOB_TITLE, normalize_job_title(job_title))
+
+    def find_by_interest(self, interest: str) -> List[UserDB]:
+        tokens = interest_tokens(interest)
+        if not tokens:
+            return []
+        if len(tokens) == 1:
+            return self._find(INTEREST, next(iter(tokens)))
+        matches = None
+        for token in tokens:
+            stripe = self._stripe(INTEREST, token)
+            with stripe.lock:
+                members = stripe.interest.get(token, set())
+                matches = members & matches if matches is not None else set(members)
+        # Each token's stripe was read on its own, so recheck against the current users
+        users = (self.get(user_id) for user_id in matches)
+        return [user for user in users if tokens <= interest_tokens(user.interests)]
+
+    def count(self) -> int:
+        return sum(len(shard.users) for shard in self._shards)
+
+    def scan(self) -> List[UserDB]:
+        return [user for shard in self._shards for user in list(shard.users.values())]
+
+    def check_indexes(self) -> List[str]:
+        """
+        Compares every index with what the stored users say it should hold.
+        Returns one line per inconsistency (empty when all is well). Holds
+        every lock while it runs, so only use it in checks and tooling.
+        """
+        locks = [shard.lock for shard in self._shards] + [stripe.lock for stripe in self._stripes]
+        for lock in locks:
+            lock.acquire()
+        try:
+            users = {user_id: user for shard in self._shards for user_id, user in shard.users.items()}
+            expected: Dict[str, Dict[str, Set[UUID]]] = {EMAIL: {}, JOB_TITLE: {}, INTEREST: {}}
+            problems = []
+            for user_id, user in users.items():
+                keys = _IndexKeys.of(user)
+                if keys.job_title:
+                    expected[JOB_TITLE].setdefault(keys.job_title, set()).add(user_id)
+                for token in keys.interests:
+                    expected[INTEREST].setdefault(token, set()).add(user_id)
+                if keys.email:
+                    expected[EMAIL].setdefault(keys.email, set()).add(user_id)
+            for stripe_number, stripe in enumerate(self._stripes):
+                for kind, index in ((EMAIL, stripe.email), (JOB_TITLE, stripe.job_title), (INTEREST, stripe.interest)):
+                    for key, members in index.items():
+                        if set(members) != expected[kind].pop(key, set()):
+                            problems.append(f"{kind} index {key!r} does not match the users")
+                        if self._stripe_index(kind, key) != stripe_number:
+                            problems.append(f"{kind} index {key!r} is in the wrong stripe")
+            for kind, missing in expected.items():
+                problems.extend(f"{kind} {key!r} is not indexed" for key in missing)
+            return problems
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    # Locks are only held for dict operations, so skip the thread hop
+    async def get_async(self, user_id: UUID) -> Optional[UserDB]:
+        return self.get(user_id)
+
+    async def get_by_email_async(self, email: str) -> Optional[UserDB]:
+        return self.get_by_email(email)
+
+    async def create_async(self, user_data: UserDB) -> UserDB:
+        return self.create(user_data)
+
+    async def update_async(self, user_id: UUID, user_data: UserDB) -> Optional[UserDB]:
+        return self.update(user_id, user_data)
@@ -0,0 +1,111 @@
+# database/shared_store.py
+from typing import Iterable, Iterator, Optional
+from uuid import UUID
+
+from models import UserDB
+from .resp import RespClient
+from .storage import EmailTaken, UserStore
+
+# Users kept in a Redis-protocol server (Redis, or database/resp_server.py on
+# one host) so every worker process sees the same set:
+#   {prefix}user:{uuid hex}    -> UserDB as JSON
+#   {prefix}email:{lowercase}  -> uuid hex
+#   {prefix}users              -> set of uuid hex (for count() and scan())
+# Multi-key writes go in one MULTI/EXEC, so the email index never points at
+# a user that isn't there. Workers create users concurrently, so create()
+# first claims the address with SET NX (one winner per email), and update()
+# re-reads the user under WATCH so the old email it unindexes is current.
+
+
+class SharedUserStore(UserStore):
+    """User storage shared by every worker through the state backend."""
+
+    def __init__(self, client: RespClient, prefix: str = "futureskills:"):
+        self.client = client
+        self.prefix = prefix
+        self._users_key = f"{prefix}users"
+
+    def _user_key(self, user_id: UUID) -> str:
+        return f"{self.prefix}user:{user_id.hex}"
+
+    def _email_key(self, email: str) -> str:
+        return f"{self.prefix}email:{email.lower()}"
+
+    def _write_commands(self, user_data: UserDB, old_email: Optional[str] = None):
+        commands = [
+            ("SET", self._user_key(user_data.id), user_data.model_dump_json()),
+            ("SADD", self._users_key, user_data.id.hex),
+        ]
+        if old_email and (not user_data.email or old_email.lower() != user_data.email.lower()):
+            commands.append(("DEL", self._email_key(old_email))) # Email changed: drop the stale index entry
+        if user_data.email:
+            commands.append(("SET", self._email_key(user_data.email), user_data.id.hex))
+        return commands
+
+    def get(self, user_id: UUID) -> Optional[UserDB]:
+        data = self.client.execute("GET", self._user_key(user_id))
+        return UserDB.model_validate_json(data) if data is not None else None
+
+    def get_by_email(self, email: str) -> Optional[UserDB]:
+        user_hex = self.client.execute("GET", self._email_key(email))
+        return self.get(UUID(hex=user_hex.decode())) if user_hex is not None else None
+
+    def _claim_email(self, user_data: UserDB) -> bool:
+        """Takes the address for this user; True if it was free, False if it was already theirs."""
+        key, user_hex = self._email_key(user_data.email), user_data.id.hex
+        if self.client.execute("SET", key, user_hex, "NX") is not None:
+            return True
+        if self.client.execute("GET", key) != user_hex.encode():
+            raise EmailTaken(user_data.email)
+        return False
+
+    def create(self, user_data: UserDB) -> UserDB:
+        claimed = self._claim_email(user_data) if user_data.email else False
+        try:
+            self.client.transaction(self._write_commands(user_data))
+        except Exception:
+            if claimed: # Give the address back; nothing points at this user
+                self.client.execute("DEL", self._email_key(user_data.email))
+            raise
+        return user_data
+
+    def create_many(self, users: Iterable[UserDB], chunk_size: int = 500) -> int:
+        written, commands = 0, []
+        for user_data in users:
+            commands.extend(self._write_commands(user_data))
+            written += 1
+            if written % chunk_size == 0:
+                self.client.transaction(commands)
+                commands = []
+        if commands:
+            self.client.transaction(commands)
+        return written
+
+    def update(self, user_id: UUID, user_data: UserDB) -> Optional[UserDB]:
+        user_data.id = user_id
+        keys = [self._user_key(user_id)]
+        if user_data.email:
+            keys.append(self._email_key(user_data.email))
+
+        def plan(execute):
+            data = execute("GET", keys[0])
+            if data is None:
+                return None
+            if user_data.email and execute("GET", keys[1]) not in (None, user_id.hex.encode()):
+                raise EmailTaken(user_data.email)
+            return self._write_commands(user_data, old_email=UserDB.model_validate_json(data).email)
+
+        return user_data if self.client.watch_transaction(keys, plan) is not None else None
+
+    def count(self) -> int:
+        return self.client.execute("SCARD", self._users_key)
+
+    def scan(self, chunk_size: int = 500) -> Iterator[UserDB]:
+        user_keys = [f"{self.prefix}user:{user_hex.decode()}" for user_hex in self.client.execute("SMEMBERS", self._users_key)]
+        for start in range(0, len(user_keys), chunk_size):
+            for data in self.client.execute("MGET", *user_keys[start:start + chunk_size]):
+                if data is not None:
+                    yield UserDB.model_validate_json(data)
+
+    def close(self) -> None:
+        self.client.close()
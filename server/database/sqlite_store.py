@@ -0,0 +1,119 @@
+# database/sqlite_store.py
+import queue
+import sqlite3
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional
+from uuid import UUID
+
+from models import UserDB
+from .storage import UserStore
+
+# Statements are kept as module constants so sqlite3's per-connection
+# statement cache reuses the compiled (prepared) form on every call.
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS users ("
+    " id BLOB PRIMARY KEY,"     # 16-byte UUID
+    " email_lower TEXT,"        # NULL for profile-only entries
+    " data TEXT NOT NULL"       # UserDB serialized as JSON
+    ")",
+    "CREATE INDEX IF NOT EXISTS users_email_lower ON users (email_lower)",
+)
+_SELECT_BY_ID = "SELECT data FROM users WHERE id = ?"
+_SELECT_BY_EMAIL = "SELECT data FROM users WHERE email_lower = ? ORDER BY rowid DESC LIMIT 1"
+_UPSERT = "INSERT OR REPLACE INTO users (id, email_lower, data) VALUES (?, ?, ?)"
+_UPDATE = "UPDATE users SET email_lower = ?, data = ? WHERE id = ?"
+_COUNT = "SELECT COUNT(*) FROM users"
+_SELECT_ALL = "SELECT data FROM users"
+
+
+class SQLiteUserStore(UserStore):
+    """
+    Durable user storage in a single SQLite file.
+
+    Runs in WAL mode so readers never wait on the writer, and hands out
+    connections from a fixed-size pool so threads (including the ones used by
+    the async variants) don't share a connection.
+    """
+
+    def __init__(self, path: str, pool_size: int = 8):
+        self.path = path
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(max(1, pool_size)):
+            self._pool.put(self._connect())
+        with self._connection() as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False, # Connections move between threads via the pool
+            isolation_level=None,    # Autocommit; explicit BEGIN for bulk writes
+            cached_statements=64,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL") # fsync on checkpoint, safe in WAL mode
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @staticmethod
+    def _row_params(user_data: UserDB):
+        email_lower = user_data.email.lower() if user_data.email else None
+        return user_data.id.bytes, email_lower, user_data.model_dump_json()
+
+    def get(self, user_id: UUID) -> Optional[UserDB]:
+        with self._connection() as conn:
+            row = conn.execute(_SELECT_BY_ID, (user_id.bytes,)).fetchone()
+        return UserDB.model_validate_json(row[0]) if row else None
+
+    def get_by_email(self, email: str) -> Optional[UserDB]:
+        with self._connection() as conn:
+            row = conn.execute(_SELECT_BY_EMAIL, (email.lower(),)).fetchone()
+        return UserDB.model_validate_json(row[0]) if row else None
+
+    def create(self, user_data: UserDB) -> UserDB:
+        with self._connection() as conn:
+            conn.execute(_UPSERT, self._row_params(user_data))
+        return user_data
+
+    def create_many(self, users: Iterable[UserDB]) -> int:
+        with self._connection() as conn:
+            conn.execute("BEGIN")
+            try:
+                cursor = conn.executemany(_UPSERT, (self._row_params(u) for u in users))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return cursor.rowcount
+
+    def update(self, user_id: UUID, user_data: UserDB) -> Optional[UserDB]:
+        user_data.id = user_id
+        user_key, email_lower, data = self._row_params(user_data)
+        with self._connection() as conn:
+            cursor = conn.execute(_UPDATE, (email_lower, data, user_key))
+        return user_data if cursor.rowcount else None
+
+    def count(self) -> int:
+        with self._connection() as conn:
+            return conn.execute(_COUNT).fetchone()[0]
+
+    def scan(self) -> Iterator[UserDB]:
+        with self._connection() as conn:
+            rows = conn.execute(_SELECT_ALL).fetchall()
+        return (UserDB.model_validate_json(data) for data, in rows)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
@@ -0,0 +1,151 @@
+# database/storage.py
+import asyncio
+import re
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional
+from uuid import UUID
+
+from models import UserDB
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def normalize_job_title(job_title: str) -> str:
+    """Case- and whitespace-insensitive form job titles are compared (and indexed) by."""
+    return " ".join(job_title.lower().split())
+
+
+def interest_tokens(interests: Optional[str]) -> FrozenSet[str]:
+    """Lowercased word tokens of the free-text interests ("Solar, eco-design" -> solar, eco, design)."""
+    return frozenset(_TOKEN.findall(interests.lower())) if interests else frozenset()
+
+
+class EmailTaken(Exception):
+    """Raised by create() in backends that enforce unique emails themselves (see SharedUserStore)."""
+
+
+class UserStore:
+    """
+    Storage backend interface behind the functions in database.py.
+
+    Backends only deal with normalized input (UUID ids, raw emails); the
+    module-level functions take care of parsing and change notifications.
+    The async variants default to running the sync call in a worker thread,
+    backends that never block (e.g. the dict store) override them.
+    """
+
+    def get(self, user_id: UUID) -> Optional[UserDB]:
+        raise NotImplementedError
+
+    def get_by_email(self, email: str) -> Optional[UserDB]:
+        raise NotImplementedError
+
+    def create(self, user_data: UserDB) -> UserDB:
+        raise NotImplementedError
+
+    def update(self, user_id: UUID, user_data: UserDB) -> Optional[UserDB]:
+        raise NotImplementedError
+
+    def count(self) -> int:
+        raise NotImplementedError
+
+    def scan(self) -> Iterable[UserDB]:
+        """Every stored user, in no particular order."""
+        raise NotImplementedError
+
+    # The queries below scan every user; indexed backends (sharded) override them
+
+    def find_by_job_title(self, job_title: str) -> List[UserDB]:
+        """Users with this job title (case/whitespace-insensitive)."""
+        key = normalize_job_title(job_title)
+        return [user for user in self.scan() if user.jobTitle and normalize_job_title(user.jobTitle) == key]
+
+    def find_by_interest(self, interest: str) -> List[UserDB]:
+        """Users whose interests contain every word of `interest` ("Solar Energy", "eco-design")."""
+        tokens = interest_tokens(interest)
+        if not tokens:
+            return []
+        return [user for user in self.scan() if tokens <= interest_tokens(user.interests)]
+
+    def create_many(self, users: Iterable[UserDB]) -> int:
+        """Bulk insert used for seeding; returns the number of users written."""
+        written = 0
+        for user_data in users:
+            self.create(user_data)
+            written += 1
+        return written
+
+    def close(self) -> None:
+        pass
+
+    async def get_async(self, user_id: UUID) -> Optional[UserDB]:
+        return await asyncio.to_thread(self.get, user_id)
+
+    async def get_by_email_async(self, email: str) -> Optional[UserDB]:
+        return await asyncio.to_thread(self.get_by_email, email)
+
+    async def create_async(self, user_data: UserDB) -> UserDB:
+        return await asyncio.to_thread(self.create, user_data)
+
+    async def update_async(self, user_id: UUID, user_data: UserDB) -> Optional[UserDB]:
+        return await asyncio.to_thread(self.update, user_id, user_data)
+
+
+class DictUserStore(UserStore):
+    """The original process-local dict storage. Writes are serialized so both dicts change together."""
+
+    def __init__(self, users: Dict[UUID, UserDB], users_by_email: Dict[str, UserDB]):
+        self.users = users
+        self.users_by_email = users_by_email
+        self._lock = threading.Lock()
+
+    def get(self, user_id: UUID) -> Optional[UserDB]:
+        return self.users.get(user_id)
+
+    def get_by_email(self, email: str) -> Optional[UserDB]:
+        return self.users_by_email.get(email.lower()) # Store/lookup lowercase email
+
+    def _put(self, user_data: UserDB) -> None:
+        # Caller holds the lock. Keeps the email index pointing at the current entry.
+        old = self.users.get(user_data.id)
+        self.users[user_data.id] = user_data
+        if old is not None and old.email:
+            old_email = old.email.lower()
+            if self.users_by_email.get(old_email) is old and (not user_data.email or user_data.email.lower() != old_email):
+                del self.users_by_email[old_email] # Address changed or removed
+        if user_data.email:
+            self.users_by_email[user_data.email.lower()] = user_data # Add to email index
+
+    def create(self, user_data: UserDB) -> UserDB:
+        with self._lock:
+            self._put(user_data)
+        return user_data
+
+    def update(self, user_id: UUID, user_data: UserDB) -> Optional[UserDB]:
+        with self._lock:
+            if user_id not in self.users:
+                return None
+            # Ensure the ID in user_data matches the user_id being updated
+            user_data.id = user_id
+            self._put(user_data)
+        return user_data
+
+    def count(self) -> int:
+        return len(self.users)
+
+    def scan(self) -> List[UserDB]:
+        with self._lock:
+            return list(self.users.values())
+
+    # Dict access never blocks, so skip the thread hop
+    async def get_async(self, user_id: UUID) -> Optional[UserDB]:
+        return self.get(user_id)
+
+    async def get_by_email_async(self, email: str) -> Optional[UserDB]:
+        return self.get_by_email(email)
+
+    async def create_async(self, user_data: UserDB) -> UserDB:
+        return self.create(user_data)
+
+    async def update_async(self, user_id: UUID, user_data: UserDB) -> Optional[UserDB]:
+        return self.update(user_id, user_data)
@@ -1,22 +1,30 @@
 # dependencies.py
-from fastapi import Header, HTTPException, status, Depends
+import asyncio
+import secrets
+from fastapi import Header, HTTPException, status, Depends, Request, Response
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError # Import JWTError
-from typing import Optional # Import Optional
+from typing import Optional, Union # Import Optional
+from uuid import UUID
 
 from models import UserDB, TokenData, ErrorResponse
 from database import get_user_from_db # get_user_from_db gets user by ID
 from database import get_user_by_email_from_db # Need this for get_current_user as well
+from database import get_user_from_db_async
 from services.auth_service import verify_token # Import verify_token function # Note: auth_service imports this, consider moving verify_token *into* dependencies? Let's keep it in auth_service for now.
-from config import API_KEY, API_KEY_NAME
+from services.token_cache import token_cache
+from services.admission import admission_controller, classify
+from services.recommendation_service import CATALOG_VERSION
+from config import API_KEY, API_KEY_NAME, PROFILING_TOKEN, ADMIN_TOKEN_HEADER
 
 # Define the OAuth2 scheme for Bearer tokens (for JWT)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/token")
 
 # Dependency to check API Key (For original endpoints)
-def get_api_key(api_key_header: str = Header(None, name=API_KEY_NAME)):
+# Header(name=...) is silently ignored, so the header is matched through alias=
+async def get_api_key(api_key_header: Optional[str] = Header(None, alias=API_KEY_NAME)):
     """Dependency to check for the API key in the header."""
-    if api_key_header is None or api_key_header != API_KEY:
+    # async so FastAPI runs it inline instead of dispatching to its threadpool
+    if api_key_header is None or not secrets.compare_digest(api_key_header.encode(), API_KEY.encode()):
          raise HTTPException(
              status_code=status.HTTP_401_UNAUTHORIZED,
              detail="API Key header missing or invalid",
@@ -24,12 +32,32 @@ def get_api_key(api_key_header: str = Header(None, name=API_KEY_NAME)):
          )
     return api_key_header
 
+# Dependency for admin routes (profile listing)
+async def get_admin_token(admin_token_header: str = Header(None, alias=ADMIN_TOKEN_HEADER)):
+    """Admin routes exist only when PROFILING_TOKEN is set, and require it in the X-Admin-Token header."""
+    if not PROFILING_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if admin_token_header is None or not secrets.compare_digest(admin_token_header.encode(), PROFILING_TOKEN.encode()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin token missing or invalid")
+    return admin_token_header
+
 # Dependency to get the current authenticated user from the JWT token (For /me)
-def get_current_user(token: str = Depends(oauth2_scheme)) -> UserDB:
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> UserDB:
     """
     Dependency to get the current authenticated user from the JWT token.
     Requires 'Authorization: Bearer <token>' header.
+    Tokens are verified once and then served from the verified-token cache
+    until they expire or the user entry changes.
     """
+    # async so a cache hit is answered inline; only a miss (signature check
+    # and DB lookup) goes to a worker thread
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached.user
+    return await asyncio.to_thread(_load_current_user, token)
+
+def _load_current_user(token: str) -> UserDB:
+    """Verifies a token that is not in the cache, loads its user and caches both."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -53,13 +81,68 @@ def get_current_user(token: str = Depends(oauth2_scheme)) -> UserDB:
         # If the user was only created via /profile, they won't have auth data but will have profile data
         # The UserDB model must handle optional fields correctly.
 
+        token_cache.put(token, token_data, user)
         return user # Return the full UserDB object
 
-    except JWTError:
-        raise credentials_exception # Token is malformed or invalid signature
+    except HTTPException:
+        raise # verify_token already turned a malformed or invalid token into a 401
     except Exception:
          # Catch any other unexpected errors
          raise HTTPException(
              status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
              detail="Internal server error during authentication"
-         )
\ No newline at end of file
+         )
+
+# Conditional GET support for per-user read routes
+def user_etag(user: UserDB, variant: str = "") -> str:
+    """
+    Strong ETag for everything derived from a user's profile and the catalog.
+    `variant` tells apart different representations of the same resource
+    (e.g. the sections a /recommendations request asked for).
+    """
+    suffix = f"-{variant}" if variant else ""
+    return f'"{user.id.hex[:8]}-{user.revision or 0:x}-{CATALOG_VERSION}{suffix}"'
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+def check_not_modified(request: Request, response: Response, user: UserDB, variant: str = "") -> str:
+    """
+    Sets the ETag header, or answers 304 right away when the client's
+    If-None-Match already matches (no service calls). The ETag comes from
+    the revision stored with the user, so every worker agrees on it.
+    """
+    etag = user_etag(user, variant)
+    if _etag_matches(request.headers.get("If-None-Match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return etag
+
+# Per-user admission budget for routes that name a user in their path
+def charge_user(request: Request, user: UserDB) -> None:
+    """
+    Takes one token from the user's admission bucket, once the route has found
+    the user (unknown IDs never get a bucket). 429 with Retry-After when over budget.
+    """
+    user_id = str(user.id)
+    if request.scope.get("state", {}).get("admission_user") == user_id:
+        return # The middleware already charged this user (verified bearer token)
+    rejection = admission_controller.charge_user(classify(request.url.path), user_id)
+    if rejection is not None:
+        raise HTTPException(status_code=rejection.status, detail=rejection.detail, headers={"Retry-After": str(rejection.retry_after)})
+
+async def conditional_user_get(request: Request, response: Response, userId: UUID) -> UserDB:
+    """
+    Dependency for routes with a {userId} path parameter: looks the user up
+    (404 if there is none), charges it (charge_user), then applies
+    check_not_modified. Returns the user.
+    """
+    user = await get_user_from_db_async(userId)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    charge_user(request, user)
+    check_not_modified(request, response, user)
+    return user
@@ -1,23 +1,97 @@
 # main.py
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-import uvicorn
+from fastapi.responses import JSONResponse, PlainTextResponse
 from api.v1.api import api_router
-from config import API_KEY, SECRET_KEY # Import keys to print (optional)
+from api.v1.middleware import AdmissionMiddleware, MetricsMiddleware, ProfilingMiddleware
+from config import API_KEY, SECRET_KEY, WARMUP_ON_STARTUP, METRICS_ENABLED, PROFILING_ENABLED # Import keys to print (optional)
+from services.auth_utils import shutdown_password_pool
+from services.warmup import warm_up, mark_ready, is_ready, warmup_timings
+from services.loop_monitor import loop_monitor
+from services.admission import admission_controller
+from services.metrics import registry
+from services.recommendation_service import recommendation_cache
+from database import get_user_store, invalidation_bus
+
+logger = logging.getLogger(__name__)
+
+async def _warm_up():
+    # Runs in a thread so the server accepts connections (and answers /ready with 503) meanwhile
+    try:
+        timings = await asyncio.to_thread(warm_up)
+        logger.info("Warmup finished in %.3fs: %s", sum(timings.values()), timings)
+    except Exception:
+        logger.exception("Warmup failed; remaining work happens on first use")
+        mark_ready()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warmup = asyncio.create_task(_warm_up()) if WARMUP_ON_STARTUP else None
+    if warmup is None:
+        mark_ready()
+    loop_monitor.ensure_started() # Lag is measured from startup, not from the first request
+    invalidation_bus.start() # Listens for other workers' writes (no-op without STATE_URL)
+    yield
+    loop_monitor.stop()
+    invalidation_bus.stop()
+    if warmup is not None and not warmup.done():
+        warmup.cancel()
+    shutdown_password_pool()
+    get_user_store().close() # Flushes the write-ahead log / closes DB connections
 
 app = FastAPI(
     title="Green Careers API (Hackathon Mock)",
     description="API for user profiles and green career recommendations with mock AI.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.include_router(api_router, prefix="/api/v1")
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware) # Innermost, so profiles cover the request itself
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware) # Inside admission control: shed requests are counted separately below
+app.add_middleware(AdmissionMiddleware) # Sheds low-priority routes under load (ADMISSION_* in config.py)
+
+# Gauges read at scrape time
+registry.gauge("http_requests_in_flight", "Requests being served, by admission route class.",
+               lambda: {(name,): count for name, count in admission_controller.inflight.items()}, ("route_class",))
+registry.counter("http_requests_shed_total", "Requests rejected by admission control.",
+                 lambda: {key: count for key, count in admission_controller.shed.items()}, ("route_class", "status"))
+registry.gauge("event_loop_lag_seconds", "Current event-loop lag estimate.", loop_monitor.lag)
+registry.gauge("event_loop_lag_max_seconds", "Worst event-loop lag since startup.", loop_monitor.max_lag)
+registry.gauge("users", "Users in the active store.", lambda: get_user_store().count())
+registry.gauge("recommendation_cache_entries", "Entries in the shared recommendation cache.",
+               lambda: recommendation_cache.stats()["size"])
+registry.counter("recommendation_cache_hits_total", "Recommendation cache hits.", lambda: recommendation_cache.hits)
+registry.counter("recommendation_cache_misses_total", "Recommendation cache misses.", lambda: recommendation_cache.misses)
+registry.counter("cache_invalidations_total", "Cross-worker invalidation messages.",
+                 lambda: {("sent",): invalidation_bus.sent, ("received",): invalidation_bus.received,
+                          ("failed",): invalidation_bus.failed}, ("direction",))
 
 @app.get("/")
 async def read_root():
     return {"message": "Green Careers API is running!", "version": app.version}
 
+@app.get("/ready")
+async def read_ready():
+    """Readiness probe: 503 until startup warmup has finished."""
+    if not is_ready():
+        return JSONResponse({"status": "warming_up"}, status_code=503, headers={"Retry-After": "1"})
+    return {"status": "ready", "warmup": warmup_timings()}
+
+@app.get("/metrics", include_in_schema=False)
+async def read_metrics():
+    """Prometheus scrape endpoint."""
+    # Rendered in a thread: gauges may block (e.g. the user count is a round trip on the shared backend)
+    text = await asyncio.to_thread(registry.render)
+    return PlainTextResponse(text, media_type="text/plain; version=0.0.4; charset=utf-8")
+
 if __name__ == "__main__":
     print(f"Using API Key: {API_KEY}")
     print(f"Using JWT SECRET KEY (first 8 chars): {SECRET_KEY[:8]}...")
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -1,5 +1,7 @@
 # models/__init__.py
-from .user import UserDB, UserProfileRequest, UserProfileResponse, ErrorResponse
-from .recommendation import AutomationRiskResponse, GreenJob, ReskillingCourse, SideHustle
-from .chat import ChatRequest, ChatResponse # Import updated ChatRequest
-from .auth import UserCreate, Token, TokenData
\ No newline at end of file
+from .user import UserDB, UserResponse, UserProfileRequest, UserProfileResponse, ResumeUploadResponse, ErrorResponse
+from .recommendation import AutomationRiskResponse, GreenJob, ReskillingCourse, SideHustle, RecommendationsResponse
+from .chat import ChatRequest, ChatResponse, ChatTurn, ChatHistoryResponse # Import updated ChatRequest
+from .auth import UserCreate, Token, TokenData
+from .batch import BatchItem, BatchRequest, BatchRiskResult, BatchRiskResponse, BatchRecommendationsResult, BatchRecommendationsResponse
+from .admin import ProfileInfo
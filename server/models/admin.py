@@ -0,0 +1,13 @@
+# models/admin.py
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+# One stored request profile (GET /admin/profiles)
+class ProfileInfo(BaseModel):
+    id: str
+    method: str
+    path: str = Field(..., description="Request path with non-alphanumerics replaced by '_'")
+    durationMs: float
+    sizeBytes: int
+    createdAt: datetime
+    format: str = Field(..., description="'pstats' (cProfile, load with pstats/snakeviz) or 'speedscope' (pyinstrument flame data)")
@@ -20,4 +20,5 @@ class Token(BaseModel):
 # Model for data stored inside the JWT token
 class TokenData(BaseModel):
     id: Optional[UUID] = None # User ID stored in token
-    email: Optional[EmailStr] = None # Or email, depending on what you store
\ No newline at end of file
+    email: Optional[EmailStr] = None # Or email, depending on what you store
+    exp: Optional[int] = None # Expiry (unix timestamp), used by the verified-token cache
\ No newline at end of file
@@ -0,0 +1,42 @@
+# models/batch.py
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from uuid import UUID
+
+from config import BATCH_MAX_ITEMS
+from .recommendation import GreenJob, ReskillingCourse, SideHustle
+
+# One entry of a batch request: either a stored user or a raw job title
+class BatchItem(BaseModel):
+    userId: Optional[UUID] = Field(None, description="Score a stored user profile")
+    jobTitle: Optional[str] = Field(None, description="Score a raw job title (ignored when userId is set)")
+    interests: Optional[str] = Field(None, description="Comma-separated interests for raw job titles")
+
+# Model for API Request (POST /risk/batch, POST /recommendations/batch)
+class BatchRequest(BaseModel):
+    items: List[BatchItem] = Field(..., min_length=1, max_length=BATCH_MAX_ITEMS)
+
+# Per-item result of POST /risk/batch; `error` is set instead of the score on failure
+class BatchRiskResult(BaseModel):
+    userId: Optional[UUID] = None
+    jobTitle: Optional[str] = None
+    riskScore: Optional[int] = Field(None, ge=0, le=100)
+    explanation: Optional[str] = None
+    error: Optional[str] = None
+
+class BatchRiskResponse(BaseModel):
+    results: List[BatchRiskResult] # Same order as the request items
+
+# Per-item result of POST /recommendations/batch
+class BatchRecommendationsResult(BaseModel):
+    userId: Optional[UUID] = None
+    jobTitle: Optional[str] = None
+    riskScore: Optional[int] = Field(None, ge=0, le=100)
+    explanation: Optional[str] = None
+    jobs: Optional[List[GreenJob]] = None
+    reskilling: Optional[List[ReskillingCourse]] = None
+    hustles: Optional[List[SideHustle]] = None
+    error: Optional[str] = None
+
+class BatchRecommendationsResponse(BaseModel):
+    results: List[BatchRecommendationsResult] # Same order as the request items
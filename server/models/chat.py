@@ -1,5 +1,6 @@
 # models/chat.py - Revert ChatRequest to include userId
 from pydantic import BaseModel, Field
+from typing import List, Literal
 from uuid import UUID # userId is back in the request body
 
 # Model for API Request (POST /chat) - REVERTED
@@ -9,4 +10,13 @@ class ChatRequest(BaseModel):
 
 # Model for API Response (POST /chat)
 class ChatResponse(BaseModel):
-    response: str
\ No newline at end of file
+    response: str
+
+# Models for chat history (GET /chat/history/{userId})
+class ChatTurn(BaseModel):
+    role: Literal["user", "assistant"]
+    text: str
+
+class ChatHistoryResponse(BaseModel):
+    userId: UUID
+    turns: List[ChatTurn] # Oldest first
@@ -1,4 +1,5 @@
 # models/recommendation.py
+from typing import List, Optional
 from pydantic import BaseModel, Field
 from uuid import UUID
 
@@ -30,4 +31,13 @@ class SideHustle(BaseModel):
     title: str
     description: str
     skills: str
-    earnings: str
\ No newline at end of file
+    earnings: str
+
+# Model for API Response (GET /recommendations/{userId})
+# Sections the caller did not ask for are left out of the response.
+class RecommendationsResponse(BaseModel):
+    userId: UUID
+    risk: Optional[AutomationRiskResponse] = None
+    jobs: Optional[List[GreenJob]] = None
+    reskilling: Optional[List[ReskillingCourse]] = None
+    hustles: Optional[List[SideHustle]] = None
@@ -1,8 +1,8 @@
 # models/user.py
 import uuid
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, ConfigDict, Field, EmailStr
 
 
 # Model for storing user data internally (mock DB) - UPDATED
@@ -15,6 +15,24 @@ class UserDB(BaseModel):
     experience: Optional[str] = Field(None) # Remains optional
     interests: Optional[str] = Field(None) # Remains optional
     resumeText: Optional[str] = Field(None) # Remains optional
+    resumeFile: Optional[str] = Field(None) # File name of the raw resume when spilled to disk (under RESUME_SPILL_DIR)
+    skills: Optional[List[str]] = Field(None) # Sorted skills extracted from the resume
+    revision: Optional[int] = Field(None) # Random id set on every write (database.py); ETags derive from it
+
+# Public view of a user (GET /me): UserDB without the internal write revision
+class UserResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True) # Built from a UserDB by reading its attributes
+
+    id: UUID
+    email: Optional[str] = Field(None) # Validated as EmailStr when stored; not re-checked per response
+    hashed_password: Optional[str] = Field(None)
+    full_name: Optional[str] = Field(None)
+    jobTitle: Optional[str] = Field(None)
+    experience: Optional[str] = Field(None)
+    interests: Optional[str] = Field(None)
+    resumeText: Optional[str] = Field(None)
+    resumeFile: Optional[str] = Field(None)
+    skills: Optional[List[str]] = Field(None)
 
 class UserProfileRequest(BaseModel):
     id: Optional[UUID] = Field(None, description="User ID")
@@ -27,5 +45,11 @@ class UserProfileResponse(BaseModel):
     userId: UUID
     message: str
 
+class ResumeUploadResponse(BaseModel):
+    userId: UUID
+    skills: List[str]
+    bytesRead: int
+    storedOnDisk: bool
+
 class ErrorResponse(BaseModel):
     error: str
\ No newline at end of file
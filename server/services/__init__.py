@@ -1,6 +1,8 @@
 # services/__init__.py
-from .user_service import create_user_profile, get_user
-from .recommendation_service import mock_get_risk_score, mock_get_green_jobs, mock_get_reskilling_courses, mock_get_side_hustles
-from .chat_service import mock_chat_response
-from .auth_service import create_user, authenticate_user, create_access_token, verify_token
-# Note: verify_token is used by get_current_user dependency
\ No newline at end of file
+from .user_service import create_user_profile, get_user, create_user_profile_async, get_user_async
+from .resume_service import extract_skills, ingest_resume
+from .recommendation_service import mock_get_risk_score, mock_get_green_jobs, mock_get_reskilling_courses, mock_get_side_hustles, get_recommendation_bundle
+from .recommendation_service import get_green_jobs, get_reskilling_courses, get_side_hustles
+from .chat_service import mock_chat_response, generate_chat_response, conversation_store, get_response_producer, set_response_producer
+from .auth_service import create_user, authenticate_user, create_user_async, authenticate_user_async, create_access_token, verify_token
+# Note: verify_token is used by get_current_user dependencyfrom .batch_service import score_risk_batch, recommend_batch
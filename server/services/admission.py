@@ -0,0 +1,240 @@
+# services/admission.py
+import math
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from .loop_monitor import LoopLagMonitor, loop_monitor
+from .token_cache import VerifiedTokenCache, token_cache
+from config import (
+    API_KEY,
+    ADMISSION_CONTROL, ADMISSION_LAG_SHED_LOW_MS, ADMISSION_LAG_SHED_NORMAL_MS,
+    ADMISSION_MAX_INFLIGHT_AUTH, ADMISSION_MAX_INFLIGHT_CHAT, ADMISSION_MAX_INFLIGHT_BULK, ADMISSION_MAX_INFLIGHT_DEFAULT,
+    ADMISSION_KEY_RATE, ADMISSION_KEY_BURST, ADMISSION_USER_RATE, ADMISSION_USER_BURST, ADMISSION_SHARDS,
+)
+
+# Priorities: critical routes are never shed, low ones go first under load
+CRITICAL, NORMAL, LOW = 0, 1, 2
+
+
+class RouteClass(NamedTuple):
+    name: str
+    priority: int
+    max_inflight: int # 0 = unlimited
+
+
+class Rejection(NamedTuple):
+    status: int # 429 (client over its budget) or 503 (server overloaded)
+    retry_after: int # Seconds
+    detail: str
+
+
+class TokenBuckets:
+    """
+    Token buckets keyed by client identity (API key, user, address), spread
+    over `shards` independently locked LRU maps so concurrent callers rarely
+    share a lock. Idle keys are evicted past `max_keys` per shard; an evicted
+    bucket simply starts over full.
+    """
+
+    def __init__(self, rate: float, burst: float, shards: int = 16, max_keys: int = 10_000):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.max_keys = max_keys
+        self._shards = [(threading.Lock(), OrderedDict()) for _ in range(shards)]
+
+    def take(self, key: str, now: Optional[float] = None) -> float:
+        """Takes one token for `key`. Returns 0 if allowed, else seconds until a token is available."""
+        now = time.monotonic() if now is None else now
+        lock, buckets = self._shards[hash(key) % len(self._shards)]
+        with lock:
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = [self.burst, now] # [tokens, last refill]
+                if len(buckets) > self.max_keys:
+                    buckets.popitem(last=False)
+            else:
+                buckets.move_to_end(key)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] >= 1.0:
+                bucket[0] -= 1.0
+                return 0.0
+            return (1.0 - bucket[0]) / self.rate
+
+    def __len__(self) -> int:
+        return sum(len(buckets) for _, buckets in self._shards)
+
+
+_CRITICAL_CLASS = RouteClass("critical", CRITICAL, 0)
+_AUTH_CLASS = RouteClass("auth", LOW, ADMISSION_MAX_INFLIGHT_AUTH) # bcrypt
+_CHAT_CLASS = RouteClass("chat", LOW, ADMISSION_MAX_INFLIGHT_CHAT)
+_BULK_CLASS = RouteClass("bulk", LOW, ADMISSION_MAX_INFLIGHT_BULK) # Batches and resume uploads
+_DEFAULT_CLASS = RouteClass("default", NORMAL, ADMISSION_MAX_INFLIGHT_DEFAULT)
+
+_CRITICAL_PATHS = frozenset({"/", "/ready", "/metrics", "/api/v1/me"})
+
+# Longest matching prefix wins; anything unmatched is "default"
+_PREFIXES: Tuple[Tuple[str, RouteClass], ...] = tuple(sorted({
+    "/api/v1/token": _AUTH_CLASS,
+    "/api/v1/signup": _AUTH_CLASS,
+    "/api/v1/chat": _CHAT_CLASS,
+    "/api/v1/chat/history": _DEFAULT_CLASS, # History reads are cheap
+    "/api/v1/risk/batch": _BULK_CLASS,
+    "/api/v1/recommendations/batch": _BULK_CLASS,
+}.items(), key=lambda item: -len(item[0])))
+
+def classify(path: str) -> RouteClass:
+    """Route class of a request path."""
+    if path in _CRITICAL_PATHS:
+        return _CRITICAL_CLASS
+    for prefix, route_class in _PREFIXES:
+        if path.startswith(prefix):
+            return route_class
+    if path.endswith("/resume"):
+        return _BULK_CLASS
+    return _DEFAULT_CLASS
+
+
+_INVALID_KEY = "invalid-key" # One bucket shared by every request with an unrecognised API key
+
+
+def client_key(route_class: RouteClass, api_key: Optional[str], address: Optional[str]) -> Optional[str]:
+    """
+    Identity charged to the per-key buckets. Signup and token take no API key
+    and are budgeted per client address; elsewhere the configured API key has
+    its own bucket, any other key value shares _INVALID_KEY, and requests
+    without a key fall back to the address. Header values only become bucket
+    keys once validated, so sending a fresh key per request neither gets a
+    full bucket nor pushes real buckets out of the LRU.
+    """
+    if route_class is not _AUTH_CLASS and api_key is not None:
+        return f"key:{api_key}" if secrets.compare_digest(api_key.encode(), API_KEY.encode()) else _INVALID_KEY
+    return f"addr:{address}" if address else None
+
+
+def user_key(authorization: Optional[str], tokens: VerifiedTokenCache = token_cache) -> Optional[str]:
+    """
+    Per-user identity known before routing: the user of a bearer token that
+    already passed verification (None otherwise; the request is still charged
+    to its client key). A userId in the path is only charged once the route
+    has found that user (see AdmissionController.charge_user), so made-up IDs
+    never get a fresh bucket or push real users' buckets out of the LRU.
+    """
+    if authorization and authorization[:7].lower() == "bearer ":
+        user_id = tokens.user_id_of(authorization[7:])
+        if user_id is not None:
+            return str(user_id)
+    return None
+
+
+class AdmissionController:
+    """
+    Decides per request whether to admit it, based on:
+
+    - event-loop lag: LOW routes are shed above `lag_low`, NORMAL ones above
+      `lag_high` (503);
+    - in-flight requests per route class (503);
+    - per-client (validated API key or address, see client_key) and
+      per-user token buckets (429). Users are charged here when a verified
+      bearer token names them, or by the route through charge_user once it
+      has found the user its path refers to.
+
+    CRITICAL routes (/me, health checks, metrics) are only counted. All state
+    is touched from the event loop except the buckets, which are sharded.
+    """
+
+    def __init__(
+        self,
+        monitor: LoopLagMonitor,
+        lag_low: float,
+        lag_high: float,
+        key_buckets: Optional[TokenBuckets] = None,
+        user_buckets: Optional[TokenBuckets] = None,
+        enabled: bool = True,
+    ):
+        self.monitor = monitor
+        self.lag_low = lag_low
+        self.lag_high = lag_high
+        self.key_buckets = key_buckets
+        self.user_buckets = user_buckets
+        self.enabled = enabled
+        self.inflight: Dict[str, int] = {}
+        self.admitted: Dict[str, int] = {}
+        self.shed: Dict[Tuple[str, int], int] = {} # (route class, status) -> count
+
+    def admit(self, route_class: RouteClass, api_key: Optional[str], user: Optional[str]) -> Optional[Rejection]:
+        """None if the request may proceed, else why not. Call `enter`/`leave` around admitted requests."""
+        if not self.enabled or route_class.priority == CRITICAL:
+            return None
+        rejection = self._check_load(route_class) or self._check_budgets(api_key, user)
+        if rejection is not None:
+            self._count_shed(route_class, rejection)
+        return rejection
+
+    def charge_user(self, route_class: RouteClass, user: str) -> Optional[Rejection]:
+        """
+        Per-user budget for a user a route has looked up (a userId in the path).
+        None if the request may proceed, else the 429 to answer with.
+        """
+        if not self.enabled or route_class.priority == CRITICAL:
+            return None
+        rejection = self._check_budgets(None, user)
+        if rejection is not None:
+            self._count_shed(route_class, rejection)
+        return rejection
+
+    def _count_shed(self, route_class: RouteClass, rejection: Rejection) -> None:
+        key = (route_class.name, rejection.status)
+        self.shed[key] = self.shed.get(key, 0) + 1
+
+    def _check_load(self, route_class: RouteClass) -> Optional[Rejection]:
+        lag = self.monitor.lag()
+        threshold = self.lag_low if route_class.priority == LOW else self.lag_high
+        if lag > threshold:
+            return Rejection(503, max(1, math.ceil(lag)), "Server is overloaded, please retry shortly")
+        if route_class.max_inflight and self.inflight.get(route_class.name, 0) >= route_class.max_inflight:
+            return Rejection(503, 1, "Too many concurrent requests, please retry shortly")
+        return None
+
+    def _check_budgets(self, api_key: Optional[str], user: Optional[str]) -> Optional[Rejection]:
+        for buckets, key in ((self.key_buckets, api_key), (self.user_buckets, user)):
+            if buckets is not None and key is not None:
+                wait = buckets.take(key)
+                if wait:
+                    return Rejection(429, max(1, math.ceil(wait)), "Rate limit exceeded")
+        return None
+
+    def enter(self, route_class: RouteClass) -> None:
+        self.inflight[route_class.name] = self.inflight.get(route_class.name, 0) + 1
+        self.admitted[route_class.name] = self.admitted.get(route_class.name, 0) + 1
+
+    def leave(self, route_class: RouteClass) -> None:
+        self.inflight[route_class.name] -= 1
+
+    def reset_counters(self) -> None:
+        self.admitted.clear()
+        self.shed.clear()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "lag_ms": self.monitor.lag() * 1000,
+            "inflight": dict(self.inflight),
+            "admitted": dict(self.admitted),
+            "shed": {f"{name}:{status}": count for (name, status), count in self.shed.items()},
+        }
+
+
+def _buckets(rate: float, burst: float) -> Optional[TokenBuckets]:
+    return TokenBuckets(rate, burst or rate, ADMISSION_SHARDS) if rate > 0 else None
+
+admission_controller = AdmissionController(
+    loop_monitor,
+    ADMISSION_LAG_SHED_LOW_MS / 1000,
+    ADMISSION_LAG_SHED_NORMAL_MS / 1000,
+    key_buckets=_buckets(ADMISSION_KEY_RATE, ADMISSION_KEY_BURST),
+    user_buckets=_buckets(ADMISSION_USER_RATE, ADMISSION_USER_BURST),
+    enabled=ADMISSION_CONTROL,
+)
@@ -3,34 +3,65 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 from uuid import UUID
 
-from jose import JWTError, jwt
 from fastapi import HTTPException, status
 
 from models import UserCreate, UserDB, TokenData
 from database import get_user_by_email_from_db, create_user_in_db
-from services.auth_utils import hash_password, verify_password
+from database import get_user_by_email_from_db_async, create_user_in_db_async
+from database import EmailTaken
+from services.auth_utils import hash_password, verify_password, hash_password_async, verify_password_async
 from config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
 
 
-def create_user(user_data: UserCreate) -> UserDB:
-    """Creates a new user with a hashed password."""
-    existing_user = get_user_by_email_from_db(user_data.email)
+def _ensure_email_available(email: str) -> None:
+    """Raises 400 if the email already belongs to a user."""
+    existing_user = get_user_by_email_from_db(email)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
 
-    hashed_password = hash_password(user_data.password)
+def _email_conflict() -> HTTPException:
+    # Another signup for the address won the backend's claim between our check and the write
+    return HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already registered")
 
-    user_db_data = UserDB(
+def _build_auth_user(user_data: UserCreate, hashed_password: str) -> UserDB:
+    """Builds the UserDB entry for a freshly registered user."""
+    return UserDB(
         email=user_data.email,
         hashed_password=hashed_password,
         full_name=user_data.full_name,
         # jobTitle, experience, interests, resumeText are optional and can be added later via /profile
         jobTitle=None, experience=None, interests=None, resumeText=None
     )
-    return create_user_in_db(user_db_data)
+
+def create_user(user_data: UserCreate) -> UserDB:
+    """Creates a new user with a hashed password."""
+    _ensure_email_available(user_data.email)
+    hashed_password = hash_password(user_data.password)
+    try:
+        return create_user_in_db(_build_auth_user(user_data, hashed_password))
+    except EmailTaken:
+        raise _email_conflict()
+
+async def _ensure_email_available_async(email: str) -> None:
+    if await get_user_by_email_from_db_async(email):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
+
+async def create_user_async(user_data: UserCreate) -> UserDB:
+    """Same as create_user, but hashes the password in the bcrypt worker pool."""
+    await _ensure_email_available_async(user_data.email)
+    hashed_password = await hash_password_async(user_data.password)
+    # Re-check: another signup for the same email may have finished while we were hashing
+    await _ensure_email_available_async(user_data.email)
+    try:
+        return await create_user_in_db_async(_build_auth_user(user_data, hashed_password))
+    except EmailTaken:
+        raise _email_conflict()
 
 def authenticate_user(email: str, password: str) -> Optional[UserDB]:
     """Authenticates a user by email and password."""
@@ -43,6 +74,17 @@ def authenticate_user(email: str, password: str) -> Optional[UserDB]:
 
     return user # Authentication successful
 
+async def authenticate_user_async(email: str, password: str) -> Optional[UserDB]:
+    """Same as authenticate_user, but verifies the password in the bcrypt worker pool."""
+    user = await get_user_by_email_from_db_async(email)
+    if not user or not user.hashed_password:
+        return None
+
+    if not await verify_password_async(password, user.hashed_password):
+        return None
+
+    return user
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Creates a JWT access token."""
     to_encode = data.copy()
@@ -51,11 +93,13 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
+    from jose import jwt # Imported on first use (or during warmup) to keep startup fast
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 def verify_token(token: str) -> TokenData:
     """Verifies a JWT token and returns the payload."""
+    from jose import JWTError, jwt
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         # Extract data from the payload, e.g., user ID or email
@@ -64,7 +108,7 @@ def verify_token(token: str) -> TokenData:
             raise JWTError("Invalid payload")
 
         # Optionally, validate the token payload further (e.g., check expiry is handled by jwt.decode)
-        token_data = TokenData(id=UUID(user_id)) # Assuming user ID (UUID) is stored in 'sub' claim
+        token_data = TokenData(id=UUID(user_id), exp=payload.get("exp")) # Assuming user ID (UUID) is stored in 'sub' claim
         return token_data
     except JWTError:
         raise HTTPException(
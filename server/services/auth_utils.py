@@ -1,13 +1,107 @@
 # services/auth_utils.py
-from passlib.context import CryptContext
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional
 
-# Context for password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from fastapi import HTTPException, status
+
+from services.metrics import registry
+from config import PASSWORD_HASH_EXECUTOR, PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING
+
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    """Context for password hashing. passlib is imported on first use (or during warmup), not at startup."""
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifies a plain password against a hashed password."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 def hash_password(password: str) -> str:
     """Hashes a plain password."""
-    return pwd_context.hash(password)
\ No newline at end of file
+    return get_pwd_context().hash(password)
+
+
+# --- Async variants ---
+# bcrypt is deliberately slow (~100-300ms per call). Running it inline in an
+# async endpoint stalls every other request on the worker, so the async
+# variants hand the work to a dedicated pool. The number of queued + running
+# jobs is capped; once the cap is hit we fail fast with a 503 instead of
+# letting a login storm build an unbounded backlog.
+
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+_pending = threading.BoundedSemaphore(PASSWORD_HASH_MAX_PENDING)
+
+password_hash_seconds = registry.histogram(
+    "password_hash_seconds", "bcrypt work time per pooled operation, excluding queueing.", ("operation",),
+)
+
+
+def _timed_call(func, *args):
+    # Top-level so process pools can pickle it; the duration travels back with the result
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def _get_executor() -> Executor:
+    """Lazily creates the hashing pool configured in config.py."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                if PASSWORD_HASH_EXECUTOR == "process":
+                    from concurrent.futures import ProcessPoolExecutor # Pulls in multiprocessing; only when configured
+                    _executor = ProcessPoolExecutor(max_workers=PASSWORD_HASH_WORKERS)
+                else:
+                    _executor = ThreadPoolExecutor(
+                        max_workers=PASSWORD_HASH_WORKERS,
+                        thread_name_prefix="password-hash",
+                    )
+    return _executor
+
+
+async def _run_in_pool(func, *args):
+    """Runs a blocking hash function in the pool, rejecting work when the queue is full."""
+    if not _pending.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        future = _get_executor().submit(_timed_call, func, *args)
+    except BaseException:
+        _pending.release()
+        raise
+    # Released when the job finishes (or is cancelled before it starts), not
+    # when the caller stops waiting: a disconnected client's hash still
+    # occupies the pool, so it must keep counting against the limit
+    future.add_done_callback(lambda _: _pending.release())
+    result, elapsed = await asyncio.wrap_future(future)
+    password_hash_seconds.observe(elapsed, func.__name__)
+    return result
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verifies a password without blocking the event loop."""
+    return await _run_in_pool(verify_password, plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hashes a password without blocking the event loop."""
+    return await _run_in_pool(hash_password, password)
+
+
+def shutdown_password_pool() -> None:
+    """Stops the hashing pool (e.g. on application shutdown)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
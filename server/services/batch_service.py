@@ -0,0 +1,97 @@
+# services/batch_service.py
+import asyncio
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+from models import BatchItem, BatchRiskResult, BatchRecommendationsResult
+from database import get_user_from_db_async
+from database.storage import normalize_job_title # Same key as the job-title index, so batch dedup can't drift from it
+from .recommendation_service import (
+    mock_get_risk_score, get_green_jobs, get_reskilling_courses, get_side_hustles,
+)
+
+
+class _ResolvedItem(NamedTuple):
+    user_id: Optional[UUID]
+    job_title: Optional[str]
+    interests: Optional[str]
+    error: Optional[str]
+    skills: Optional[List[str]] = None
+
+
+def _normalize_interests(interests: Optional[str]) -> str:
+    if not interests:
+        return ""
+    return ",".join(sorted({part.strip().lower() for part in interests.split(",") if part.strip()}))
+
+
+async def _resolve_items(items: List[BatchItem]) -> List[_ResolvedItem]:
+    """Turns request items into (userId, jobTitle, interests) or an error, preserving order."""
+    user_ids = {item.userId for item in items if item.userId is not None}
+    found = await asyncio.gather(*(get_user_from_db_async(user_id) for user_id in user_ids))
+    users = dict(zip(user_ids, found))
+
+    resolved = []
+    for item in items:
+        if item.userId is None:
+            if item.jobTitle and item.jobTitle.strip():
+                resolved.append(_ResolvedItem(None, item.jobTitle.strip(), item.interests, None))
+            else:
+                resolved.append(_ResolvedItem(None, None, None, "Each item needs a userId or a non-empty jobTitle"))
+            continue
+        user = users.get(item.userId)
+        if user is None:
+            resolved.append(_ResolvedItem(item.userId, None, None, "User not found"))
+        elif not user.jobTitle:
+            resolved.append(_ResolvedItem(item.userId, None, None, "User profile incomplete. Job title not found for this user ID."))
+        else:
+            resolved.append(_ResolvedItem(item.userId, user.jobTitle, user.interests, None, user.skills))
+    return resolved
+
+
+async def score_risk_batch(items: List[BatchItem]) -> List[BatchRiskResult]:
+    """Automation risk for every item; each distinct normalized title is scored once."""
+    resolved = await _resolve_items(items)
+    scores: Dict[str, Tuple[int, str]] = {}
+    results = []
+    for item in resolved:
+        if item.error:
+            results.append(BatchRiskResult(userId=item.user_id, error=item.error))
+            continue
+        key = normalize_job_title(item.job_title)
+        if key not in scores:
+            scores[key] = mock_get_risk_score(item.job_title)
+        risk_score, explanation = scores[key]
+        results.append(BatchRiskResult(
+            userId=item.user_id, jobTitle=item.job_title, riskScore=risk_score, explanation=explanation,
+        ))
+    return results
+
+
+async def recommend_batch(items: List[BatchItem], sections: Iterable[str]) -> List[BatchRecommendationsResult]:
+    """
+    Recommendation sections for every item. Results are computed once per
+    distinct (normalized title, normalized interests, skills) and shared.
+    """
+    sections = set(sections)
+    resolved = await _resolve_items(items)
+    computed: Dict[tuple, dict] = {}
+    results = []
+    for item in resolved:
+        if item.error:
+            results.append(BatchRecommendationsResult(userId=item.user_id, error=item.error))
+            continue
+        key = (normalize_job_title(item.job_title), _normalize_interests(item.interests), tuple(item.skills or ()))
+        if key not in computed:
+            fields = {}
+            if "risk" in sections:
+                fields["riskScore"], fields["explanation"] = mock_get_risk_score(item.job_title)
+            if "jobs" in sections:
+                fields["jobs"] = get_green_jobs(item.job_title, item.interests, item.skills)
+            if "reskilling" in sections:
+                fields["reskilling"] = get_reskilling_courses(item.job_title, item.interests, item.skills)
+            if "hustles" in sections:
+                fields["hustles"] = get_side_hustles(item.job_title, item.interests, item.skills)
+            computed[key] = fields
+        results.append(BatchRecommendationsResult(userId=item.user_id, jobTitle=item.job_title, **computed[key]))
+    return results
@@ -0,0 +1,175 @@
+# services/chat_backend.py
+import asyncio
+from typing import Dict, Hashable, List, NamedTuple, Optional, Set
+
+from .conversation_store import History
+
+
+class ChatPrompt(NamedTuple):
+    message: str
+    job_title: str
+    interests: Optional[str]
+    history: Optional[History] = None
+
+
+class ChatTimeoutError(Exception):
+    """The backend did not answer within the per-request timeout."""
+
+
+class ChatBackend:
+    """Async inference backend. Gets a batch of prompts, returns one answer per prompt in order."""
+
+    async def generate_batch(self, prompts: List[ChatPrompt]) -> List[str]:
+        raise NotImplementedError
+
+
+class LocalStubBackend(ChatBackend):
+    """
+    Offline stand-in for an inference server: answers with mock_chat_response
+    after sleeping a fixed per-call latency plus a small per-prompt cost, which
+    is the cost shape that makes batching pay off. Like a single model replica
+    it serves at most `concurrency` calls at a time.
+    """
+
+    def __init__(self, call_latency: float = 0.05, item_latency: float = 0.002, concurrency: int = 1):
+        self.call_latency = call_latency
+        self.item_latency = item_latency
+        self.concurrency = concurrency
+        self.calls = 0
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def generate_batch(self, prompts: List[ChatPrompt]) -> List[str]:
+        from .chat_service import mock_chat_response # Avoid a circular import at module load
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._slots = loop, asyncio.Semaphore(self.concurrency)
+        async with self._slots:
+            self.calls += 1
+            await asyncio.sleep(self.call_latency + self.item_latency * len(prompts))
+        return [mock_chat_response(p.message, p.job_title, p.interests, p.history) for p in prompts]
+
+
+class _Pending(NamedTuple):
+    prompt: ChatPrompt
+    key: Hashable
+    future: asyncio.Future
+
+
+class MicroBatchScheduler:
+    """
+    Collects concurrent chat requests into micro-batches for a ChatBackend.
+
+    A batch is sent once it has `max_batch_size` prompts or the oldest prompt
+    has waited `max_wait` seconds. Requests whose prompt and profile context
+    match one already queued or in flight share its answer instead of being
+    sent again. Each caller waits at most `timeout` seconds; a timeout does
+    not cancel the batch, so other callers sharing it still get their answer.
+    """
+
+    def __init__(self, backend: ChatBackend, max_batch_size: int = 16, max_wait: float = 0.005, timeout: float = 10.0):
+        self.backend = backend
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait
+        self.timeout = timeout
+        self._pending: List[_Pending] = []
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._dispatches: Set[asyncio.Task] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.batches = 0
+        self.coalesced = 0
+        self.timeouts = 0
+
+    @staticmethod
+    def _key(prompt: ChatPrompt) -> Hashable:
+        return (
+            " ".join(prompt.message.lower().split()),
+            prompt.job_title.strip().lower(),
+            (prompt.interests or "").strip().lower(),
+            # A prompt with history only matches others with the same earlier turns
+            prompt.history,
+        )
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            # First use, or a new event loop (e.g. test clients): start fresh on this loop
+            self._loop = loop
+            self._pending, self._inflight = [], {}
+            self._wakeup = asyncio.Event()
+            self._worker = loop.create_task(self._run())
+
+    async def submit(self, prompt: ChatPrompt) -> str:
+        """Queues a prompt and waits for its answer."""
+        self._ensure_worker()
+        key = self._key(prompt)
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            future = self._loop.create_future()
+            future.add_done_callback(_consume_exception)
+            self._inflight[key] = future
+            self._pending.append(_Pending(prompt, key, future))
+            self._wakeup.set()
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise ChatTimeoutError(f"Chat backend did not answer within {self.timeout:g}s")
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            deadline = loop.time() + self.max_wait
+            while len(self._pending) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            batch = self._pending[:self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size:]
+            if not self._pending:
+                self._wakeup.clear()
+            if batch:
+                task = loop.create_task(self._dispatch(batch))
+                self._dispatches.add(task)
+                task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: List[_Pending]) -> None:
+        self.batches += 1
+        try:
+            answers = await self.backend.generate_batch([item.prompt for item in batch])
+            for item, answer in zip(batch, answers):
+                if not item.future.done():
+                    item.future.set_result(answer)
+        except Exception as exc:
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(exc)
+        finally:
+            for item in batch:
+                if self._inflight.get(item.key) is item.future:
+                    del self._inflight[item.key]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "batches": self.batches,
+            "coalesced": self.coalesced,
+            "timeouts": self.timeouts,
+            "queued": len(self._pending),
+            "in_flight": len(self._inflight),
+        }
+
+
+def _consume_exception(future: asyncio.Future) -> None:
+    # Mark errors as retrieved even if every waiter already timed out
+    if not future.cancelled():
+        future.exception()
@@ -1,49 +1,173 @@
 # services/chat_service.py
-from typing import Optional
-from .recommendation_service import mock_get_risk_score # Import needed mock logic
-
-def mock_chat_response(message: str, job_title: str, interests: Optional[str]) -> str:
-    """Mocks AI chat responses based on message and user context."""
-    message_lower = message.lower()
-    job_title_lower = job_title.lower()
-    interests_lower = interests.lower() if interests else ""
-
-    default_response = "I'm a demo AI mentor. I can tell you about automation risk, green job ideas, reskilling courses, or side hustles based on your profile."
-
-    if any(keyword in message_lower for keyword in ["next", "future", "path", "transition"]):
-        if "cashier" in job_title_lower or "retail" in job_title_lower:
-             return f"Considering your {job_title} background and potential interest in green fields, a good next step could be exploring roles like Solar Sales Support or Eco-Retail Coordinator. Look into courses like 'Sustainable Business Practices'."
-        elif "teacher" in job_title_lower or "educator" in job_title_lower:
-             return f"For an {job_title}, you could transition into environmental education or sustainability training. Courses on climate change education or urban sustainability could be beneficial."
-        else:
-             return f"Based on your {job_title} role, exploring green jobs in areas like green building or renewable energy project administration could be a good direction. Consider introductory courses in environmental science."
-
-    elif any(keyword in message_lower for keyword in ["green job", "eco job", "sustainable career"]):
-        if "cashier" in job_title_lower or "retail" in job_title_lower:
-            return "Green jobs like Solar Sales Support Specialist or Eco-Retail Coordinator are good fits for someone with your skills, especially if you have interests in the environment."
-        elif "teacher" in job_title_lower or "educator" in job_title_lower:
-            return "You could leverage your skills in roles like Environmental Education Program Manager or Sustainability Training Coordinator."
-        else:
-            return "Many industries need green skills now. Roles in renewable energy, sustainable consulting, or environmental program management are growing."
-
-    elif any(keyword in message_lower for keyword in ["reskilling", "courses", "learn", "train"]):
-        if "cashier" in job_title_lower or "retail" in job_title_lower:
-            return "Consider online courses such as 'Sustainable Business Practices' (Coursera) or 'Solar Energy Fundamentals' (edX) to build new skills."
-        elif "teacher" in job_title_lower or "educator" in job_title_lower:
-            return "Courses like 'Climate Change Education' (Coursera) or 'Urban Sustainability' (edX) can enhance your profile for green roles."
-        else:
-            return "Look into courses related to your specific interests within the green sector, such as circular economy or environmental science basics."
-
-    elif any(keyword in message_lower for keyword in ["side hustle", "extra income", "part-time"]):
-         if "cashier" in job_title_lower or "retail" in job_title_lower:
-            return "Ideas include selling eco-friendly crafts on Etsy or starting a green-themed blog, especially if you have related interests."
-         elif "teacher" in job_title_lower or "educator" in job_title_lower:
-            return "You could offer online tutoring in environmental subjects or lead workshops on sustainable living."
-         else:
-            return "Consider freelance green copywriting or sustainable product affiliate marketing."
-
-    elif any(keyword in message_lower for keyword in ["risk", "automate", "obsolete"]):
-         risk, explanation = mock_get_risk_score(job_title) # Use imported mock function
-         return f"Based on your role as a {job_title}, the automation risk score is {risk}%. {explanation}"
-
-    return default_response
\ No newline at end of file
+import asyncio
+from typing import AsyncIterator, Callable, Dict, Optional
+from .recommendation_service import mock_get_risk_score, occupation_for # Import needed mock logic
+from .intent_classifier import ChatContext, IntentClassifier
+from .conversation_store import ConversationStore, History, SharedConversationStore, USER
+from .chat_backend import ChatPrompt, LocalStubBackend, MicroBatchScheduler
+from .metrics import timed
+from config import CHAT_STREAM_CHUNK_WORDS, CHAT_BACKEND, CHAT_MAX_BATCH_SIZE, CHAT_MAX_WAIT_MS, CHAT_TIMEOUT_SECONDS
+from config import CHAT_STUB_CALL_LATENCY_MS, CHAT_STUB_ITEM_LATENCY_MS, CHAT_STUB_CONCURRENCY
+from config import CHAT_HISTORY_MAX_TURNS, CHAT_HISTORY_MAX_CHARS, CHAT_HISTORY_MAX_SESSIONS, CHAT_HISTORY_MAX_TOTAL_CHARS
+from config import DATABASE_BACKEND
+from database import get_state_client
+
+DEFAULT_RESPONSE = "I'm a demo AI mentor. I can tell you about automation risk, green job ideas, reskilling courses, or side hustles based on your profile."
+
+# Register new intents here (or from other modules) instead of growing an if/elif chain.
+intent_classifier = IntentClassifier()
+
+
+def _by_occupation(templates: Dict[str, str]) -> Callable[[ChatContext], str]:
+    """Response handler that picks a template by occupation ({job_title} is filled in)."""
+    def respond(context: ChatContext) -> str:
+        template = templates.get(context.occupation, templates["default"])
+        return template.format(job_title=context.job_title)
+    return respond
+
+
+def _risk_response(context: ChatContext) -> str:
+    risk, explanation = mock_get_risk_score(context.job_title) # Use imported mock function
+    return f"Based on your role as a {context.job_title}, the automation risk score is {risk}%. {explanation}"
+
+
+intent_classifier.register("career_path", ["next", "future", "path", "transition"], _by_occupation({
+    "retail": "Considering your {job_title} background and potential interest in green fields, a good next step could be exploring roles like Solar Sales Support or Eco-Retail Coordinator. Look into courses like 'Sustainable Business Practices'.",
+    "education": "For an {job_title}, you could transition into environmental education or sustainability training. Courses on climate change education or urban sustainability could be beneficial.",
+    "default": "Based on your {job_title} role, exploring green jobs in areas like green building or renewable energy project administration could be a good direction. Consider introductory courses in environmental science.",
+}))
+
+intent_classifier.register("green_jobs", ["green job", "eco job", "sustainable career"], _by_occupation({
+    "retail": "Green jobs like Solar Sales Support Specialist or Eco-Retail Coordinator are good fits for someone with your skills, especially if you have interests in the environment.",
+    "education": "You could leverage your skills in roles like Environmental Education Program Manager or Sustainability Training Coordinator.",
+    "default": "Many industries need green skills now. Roles in renewable energy, sustainable consulting, or environmental program management are growing.",
+}))
+
+intent_classifier.register("reskilling", ["reskilling", "courses", "learn", "train"], _by_occupation({
+    "retail": "Consider online courses such as 'Sustainable Business Practices' (Coursera) or 'Solar Energy Fundamentals' (edX) to build new skills.",
+    "education": "Courses like 'Climate Change Education' (Coursera) or 'Urban Sustainability' (edX) can enhance your profile for green roles.",
+    "default": "Look into courses related to your specific interests within the green sector, such as circular economy or environmental science basics.",
+}))
+
+intent_classifier.register("side_hustles", ["side hustle", "extra income", "part-time"], _by_occupation({
+    "retail": "Ideas include selling eco-friendly crafts on Etsy or starting a green-themed blog, especially if you have related interests.",
+    "education": "You could offer online tutoring in environmental subjects or lead workshops on sustainable living.",
+    "default": "Consider freelance green copywriting or sustainable product affiliate marketing.",
+}))
+
+intent_classifier.register("automation_risk", ["risk", "automate", "obsolete"], _risk_response)
+
+
+if DATABASE_BACKEND == "shared":
+    # Several workers: history must follow the user from one worker to the next
+    conversation_store = SharedConversationStore(get_state_client(), CHAT_HISTORY_MAX_TURNS, CHAT_HISTORY_MAX_CHARS)
+else:
+    conversation_store = ConversationStore(
+        CHAT_HISTORY_MAX_TURNS, CHAT_HISTORY_MAX_CHARS, CHAT_HISTORY_MAX_SESSIONS, CHAT_HISTORY_MAX_TOTAL_CHARS,
+    )
+
+
+@timed()
+def mock_chat_response(
+    message: str, job_title: str, interests: Optional[str], history: Optional[History] = None,
+) -> str:
+    """Mocks AI chat responses based on message, user context and (optionally) earlier turns."""
+    intent = intent_classifier.classify(message)
+    if intent is None and history:
+        # Follow-ups like "tell me more" continue the topic of the previous question
+        previous = history.last(USER)
+        if previous is not None:
+            intent = intent_classifier.classify(previous.text)
+    if intent is None:
+        return DEFAULT_RESPONSE
+    return intent.respond(ChatContext(message, job_title, occupation_for(job_title), interests, history))
+
+
+# --- Async backend ---
+# With CHAT_BACKEND=inline (default) answers are computed in-process. Any other
+# setting routes requests through the micro-batching scheduler.
+
+def _create_scheduler() -> Optional[MicroBatchScheduler]:
+    if CHAT_BACKEND == "stub":
+        backend = LocalStubBackend(
+            CHAT_STUB_CALL_LATENCY_MS / 1000, CHAT_STUB_ITEM_LATENCY_MS / 1000, CHAT_STUB_CONCURRENCY,
+        )
+    else:
+        return None
+    return MicroBatchScheduler(
+        backend, max_batch_size=CHAT_MAX_BATCH_SIZE, max_wait=CHAT_MAX_WAIT_MS / 1000, timeout=CHAT_TIMEOUT_SECONDS,
+    )
+
+chat_scheduler: Optional[MicroBatchScheduler] = _create_scheduler()
+
+@timed()
+async def generate_chat_response(
+    message: str, job_title: str, interests: Optional[str], history: Optional[History] = None,
+) -> str:
+    """Answers a chat message through the configured backend. May raise ChatTimeoutError."""
+    if chat_scheduler is None:
+        return mock_chat_response(message, job_title, interests, history)
+    return await chat_scheduler.submit(ChatPrompt(message, job_title, interests, history))
+
+
+# --- Streaming response producers ---
+
+class ChatResponseProducer:
+    """
+    Produces a chat answer incrementally. Implementations yield text chunks
+    as they become available (e.g. tokens from a model server); the SSE
+    endpoint forwards each chunk as soon as it is yielded. Consumers stop
+    iterating (closing the generator) when the client goes away, so
+    implementations should release resources in a finally block.
+    """
+
+    def stream(
+        self, message: str, job_title: str, interests: Optional[str], history: Optional[History] = None,
+    ) -> AsyncIterator[str]:
+        raise NotImplementedError
+
+
+class LocalMockProducer(ChatResponseProducer):
+    """Streams mock_chat_response in word chunks. No network, for demos and tests."""
+
+    def __init__(self, chunk_words: int = CHAT_STREAM_CHUNK_WORDS, delay: float = 0.0):
+        self.chunk_words = max(1, chunk_words)
+        self.delay = delay # Optional pause between chunks to mimic a slow generator
+
+    async def _answer(self, message: str, job_title: str, interests: Optional[str], history: Optional[History]) -> str:
+        return mock_chat_response(message, job_title, interests, history)
+
+    async def stream(
+        self, message: str, job_title: str, interests: Optional[str], history: Optional[History] = None,
+    ) -> AsyncIterator[str]:
+        words = (await self._answer(message, job_title, interests, history)).split(" ")
+        for start in range(0, len(words), self.chunk_words):
+            chunk = " ".join(words[start:start + self.chunk_words])
+            yield chunk if start == 0 else " " + chunk
+            await asyncio.sleep(self.delay) # Also yields to the event loop between chunks
+
+
+class BackendProducer(LocalMockProducer):
+    """
+    Streams the answer of the configured backend (generate_chat_response), so
+    /chat/stream goes through CHAT_BACKEND, micro-batching and the backend's
+    concurrency limit like /chat. Batch backends return whole answers, so the
+    first chunk is sent once the answer is ready. May raise ChatTimeoutError.
+    """
+
+    async def _answer(self, message: str, job_title: str, interests: Optional[str], history: Optional[History]) -> str:
+        return await generate_chat_response(message, job_title, interests, history)
+
+
+_producer: ChatResponseProducer = BackendProducer()
+
+
+def get_response_producer() -> ChatResponseProducer:
+    return _producer
+
+
+def set_response_producer(producer: ChatResponseProducer) -> ChatResponseProducer:
+    """Swaps the streaming producer (e.g. a real model backend). Returns the previous one."""
+    global _producer
+    previous, _producer = _producer, producer
+    return previous
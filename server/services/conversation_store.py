@@ -0,0 +1,205 @@
+# services/conversation_store.py
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, NamedTuple, Optional
+from uuid import UUID
+
+USER = "user"
+ASSISTANT = "assistant"
+
+
+class Turn(NamedTuple):
+    role: str # USER or ASSISTANT
+    text: str
+
+
+class History(tuple):
+    """
+    A conversation's turns as of one moment, oldest first. Immutable, so it
+    can be read after the store's lock is released (worker threads, the
+    batch scheduler) while new turns are being appended, and hashable.
+    """
+    __slots__ = ()
+
+    def last(self, role: str) -> Optional[Turn]:
+        """Most recent turn by `role`, if any."""
+        for turn in reversed(self):
+            if turn.role == role:
+                return turn
+        return None
+
+
+class Conversation:
+    """
+    One user's recent turns, oldest first. A fixed-size ring buffer: appending
+    to a full conversation drops the oldest turn. Only touched under the
+    store's lock; readers get a History snapshot.
+    """
+    __slots__ = ("_turns", "chars", "last_used")
+
+    def __init__(self, max_turns: int):
+        self._turns: Deque[Turn] = deque(maxlen=max_turns)
+        self.chars = 0 # Total text length of the buffered turns
+        self.last_used = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._turns)
+
+
+class ConversationStore:
+    """
+    Per-user chat history with three bounds:
+    - `max_turns` turns per user (ring buffer),
+    - `max_chars` characters per user (older turns are trimmed first),
+    - `max_total_chars` / `max_sessions` across all users; the least recently
+      used conversations are evicted when either is exceeded.
+    """
+
+    def __init__(self, max_turns: int, max_chars: int, max_sessions: int, max_total_chars: int):
+        self.max_turns = max(1, max_turns)
+        self.max_chars = max(1, max_chars)
+        self.max_sessions = max_sessions
+        self.max_total_chars = max_total_chars
+        self._sessions: "OrderedDict[UUID, Conversation]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_chars = 0
+        self.evictions = 0
+
+    def get(self, user_id: UUID) -> Optional[History]:
+        """Snapshot of the user's conversation, or None."""
+        with self._lock:
+            conversation = self._sessions.get(user_id)
+            if conversation is None:
+                return None
+            self._sessions.move_to_end(user_id)
+            conversation.last_used = time.monotonic()
+            return History(conversation._turns) # Copies at most max_turns references
+
+    def append(self, user_id: UUID, role: str, text: str) -> None:
+        """Adds a turn, trimming this conversation and evicting idle ones as needed."""
+        text = text[-self.max_chars:] # A single oversized turn keeps its most recent part
+        with self._lock:
+            conversation = self._sessions.get(user_id)
+            if conversation is None:
+                conversation = self._sessions[user_id] = Conversation(self.max_turns)
+            else:
+                self._sessions.move_to_end(user_id)
+            conversation.last_used = time.monotonic()
+
+            turns = conversation._turns
+            freed = 0
+            if len(turns) == self.max_turns:
+                freed += len(turns[0].text) # Pushed out by the append below
+            turns.append(Turn(role, text))
+            conversation.chars += len(text) - freed
+            while conversation.chars > self.max_chars and len(turns) > 1:
+                dropped = len(turns.popleft().text)
+                conversation.chars -= dropped
+                freed += dropped
+            self.total_chars += len(text) - freed
+            self._evict(keep=user_id)
+
+    def record_exchange(self, user_id: UUID, message: str, reply: str) -> None:
+        self.append(user_id, USER, message)
+        self.append(user_id, ASSISTANT, reply)
+
+    def _evict(self, keep: UUID) -> None:
+        # Caller holds the lock. Oldest sessions are at the front.
+        while len(self._sessions) > 1 and (
+            len(self._sessions) > self.max_sessions or self.total_chars > self.max_total_chars
+        ):
+            user_id, conversation = next(iter(self._sessions.items()))
+            if user_id == keep:
+                break
+            del self._sessions[user_id]
+            self.total_chars -= conversation.chars
+            self.evictions += 1
+
+    def clear(self, user_id: UUID) -> bool:
+        """Forgets a user's history. Returns False if there was none."""
+        with self._lock:
+            conversation = self._sessions.pop(user_id, None)
+            if conversation is None:
+                return False
+            self.total_chars -= conversation.chars
+            return True
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"sessions": len(self._sessions), "total_chars": self.total_chars, "evictions": self.evictions}
+
+    # Async variants for endpoints; the lock is only held for in-memory work, so no thread hop
+    async def get_async(self, user_id: UUID) -> Optional[History]:
+        return self.get(user_id)
+
+    async def record_exchange_async(self, user_id: UUID, message: str, reply: str) -> None:
+        self.record_exchange(user_id, message, reply)
+
+    async def clear_async(self, user_id: UUID) -> bool:
+        return self.clear(user_id)
+
+
+class SharedConversationStore:
+    """
+    Chat history in the shared state backend (DATABASE_BACKEND=shared), so a
+    conversation follows the user to whichever worker serves the next
+    message. Same interface as ConversationStore.
+
+    Each user's turns are one list, trimmed to `max_turns` on every write;
+    the per-user character bound is applied on read. The global bounds
+    (sessions, total characters) are left to the backend's memory policy.
+    """
+
+    def __init__(self, client, max_turns: int, max_chars: int, prefix: str = "futureskills:"):
+        self.client = client
+        self.max_turns = max(1, max_turns)
+        self.max_chars = max(1, max_chars)
+        self.prefix = prefix
+
+    def _key(self, user_id: UUID) -> str:
+        return f"{self.prefix}chat:{user_id.hex}"
+
+    def get(self, user_id: UUID) -> Optional[History]:
+        items = self.client.execute("LRANGE", self._key(user_id), -self.max_turns, -1)
+        if not items:
+            return None
+        kept, chars = [], 0
+        for item in reversed(items): # Newest first, so the character bound drops the oldest turns
+            role, text = item.decode().split("\n", 1)
+            if kept and chars + len(text) > self.max_chars:
+                break
+            kept.append(Turn(role, text))
+            chars += len(text)
+        return History(reversed(kept))
+
+    def _push(self, user_id: UUID, turns) -> None:
+        key = self._key(user_id)
+        self.client.transaction([
+            ("RPUSH", key, *(f"{role}\n{text[-self.max_chars:]}" for role, text in turns)),
+            ("LTRIM", key, -self.max_turns, -1),
+        ])
+
+    def append(self, user_id: UUID, role: str, text: str) -> None:
+        self._push(user_id, [(role, text)])
+
+    def record_exchange(self, user_id: UUID, message: str, reply: str) -> None:
+        self._push(user_id, [(USER, message), (ASSISTANT, reply)]) # Both turns in one round trip
+
+    def clear(self, user_id: UUID) -> bool:
+        """Forgets a user's history. Returns False if there was none."""
+        return self.client.execute("DEL", self._key(user_id)) > 0
+
+    # Every call is a blocking round trip to the backend, so endpoints run them in a worker thread
+    async def get_async(self, user_id: UUID) -> Optional[History]:
+        return await asyncio.to_thread(self.get, user_id)
+
+    async def record_exchange_async(self, user_id: UUID, message: str, reply: str) -> None:
+        await asyncio.to_thread(self.record_exchange, user_id, message, reply)
+
+    async def clear_async(self, user_id: UUID) -> bool:
+        return await asyncio.to_thread(self.clear, user_id)
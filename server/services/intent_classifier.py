@@ -0,0 +1,82 @@
+# services/intent_classifier.py
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Union
+
+from .keyword_matcher import KeywordMatcher
+from .conversation_store import History
+
+
+class ChatContext(NamedTuple):
+    """What a response handler gets to work with."""
+    message: str
+    job_title: str
+    occupation: str # Rule name from the recommendation rule table ("retail", "education", "default", ...)
+    interests: Optional[str]
+    history: Optional[History] = None # Earlier turns, oldest first (snapshot)
+
+
+@dataclass(frozen=True)
+class Intent:
+    name: str
+    keywords: Mapping[str, float] # keyword -> weight
+    respond: Callable[[ChatContext], str]
+
+
+class IntentClassifier:
+    """
+    Registry of chat intents with a weighted classifier.
+
+    All keywords of all intents are compiled into one KeywordMatcher. Each
+    intent scores the summed weight of its distinct keywords found in the
+    message; the highest score wins and ties go to the intent registered
+    first.
+    """
+
+    def __init__(self):
+        self._intents: List[Intent] = []
+        self._matcher: Optional[KeywordMatcher] = None
+
+    def register(
+        self,
+        name: str,
+        keywords: Union[Iterable[str], Mapping[str, float]],
+        respond: Callable[[ChatContext], str],
+    ) -> Intent:
+        """Adds an intent. Plain keyword lists get a weight of 1.0 each."""
+        if not isinstance(keywords, Mapping):
+            keywords = {keyword: 1.0 for keyword in keywords}
+        intent = Intent(name, {k.lower(): w for k, w in keywords.items()}, respond)
+        self._intents.append(intent)
+        self._matcher = None # Recompiled on next use
+        return intent
+
+    def _compiled(self) -> KeywordMatcher:
+        if self._matcher is None:
+            self._matcher = KeywordMatcher(
+                (keyword, (index, keyword, weight))
+                for index, intent in enumerate(self._intents)
+                for keyword, weight in intent.keywords.items()
+            )
+        return self._matcher
+
+    def _totals(self, message: str) -> Dict[int, float]:
+        totals: Dict[int, float] = {}
+        for index, _, weight in self._compiled().find_all(message.lower()):
+            totals[index] = totals.get(index, 0.0) + weight
+        return totals
+
+    def scores(self, message: str) -> Dict[str, float]:
+        """Score per intent (only intents with at least one keyword hit)."""
+        return {self._intents[index].name: score for index, score in sorted(self._totals(message).items())}
+
+    def classify(self, message: str) -> Optional[Intent]:
+        """Best matching intent, or None when no keyword occurs in the message."""
+        totals = self._totals(message)
+        if not totals:
+            return None
+        best = max(totals, key=lambda index: (totals[index], -index))
+        return self._intents[best]
+
+    @property
+    def intents(self) -> List[Intent]:
+        return list(self._intents)
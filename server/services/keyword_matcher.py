@@ -0,0 +1,90 @@
+# services/keyword_matcher.py
+from collections import deque
+from typing import Dict, Generic, Iterable, Iterator, List, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Below this many keywords CPython's C-level substring search (one `in` per
+# keyword) beats walking the automaton character by character in Python.
+# The crossover depends on text length; this default is the one measured on
+# 4 KB chat messages: about 180 keywords (python -m benchmarks.chat_intents --crossover).
+# Callers matching short strings pass their own (see rule_engine.py).
+SMALL_SET_THRESHOLD = 180
+
+
+class KeywordMatcher(Generic[T]):
+    """
+    Aho-Corasick automaton over a fixed set of keywords.
+
+    Built once from (keyword, value) pairs; afterwards a single pass over the
+    text reports every keyword that occurs in it as a substring, regardless of
+    how many keywords were compiled in. Keywords are matched as given, so
+    callers lowercase both keywords and text for case-insensitive matching.
+
+    Keyword sets smaller than `small_set_threshold` are answered with plain
+    substring tests instead; see SMALL_SET_THRESHOLD.
+    """
+
+    def __init__(self, pairs: Iterable[Tuple[str, T]], small_set_threshold: int = SMALL_SET_THRESHOLD):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[T]] = [[]]
+        self._values_by_keyword: Dict[str, List[T]] = {}
+        for keyword, value in pairs:
+            if keyword:
+                self._add(keyword, value)
+                self._values_by_keyword.setdefault(keyword, []).append(value)
+        self._build_fail_links()
+        self.substring_scan = len(self._values_by_keyword) < small_set_threshold
+
+    def _add(self, keyword: str, value: T) -> None:
+        node = 0
+        for char in keyword:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(value)
+
+    def _build_fail_links(self) -> None:
+        # Breadth-first, so a node's fail target is always finished before it
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                # Inherit the outputs of the longest proper suffix that is a keyword
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def iter_matches(self, text: str) -> Iterator[T]:
+        """Yields the value of every keyword occurrence in `text`."""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if out[node]:
+                yield from out[node]
+
+    def find_all(self, text: str) -> Set[T]:
+        """Values of all keywords that occur in `text` at least once."""
+        if self.substring_scan:
+            return {
+                value
+                for keyword, values in self._values_by_keyword.items() if keyword in text
+                for value in values
+            }
+        return set(self.iter_matches(text))
+
+    def __len__(self) -> int:
+        return len(self._values_by_keyword)
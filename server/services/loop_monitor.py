@@ -0,0 +1,61 @@
+# services/loop_monitor.py
+import asyncio
+import time
+from typing import Optional
+
+from config import LOOP_LAG_INTERVAL_MS
+
+
+class LoopLagMonitor:
+    """
+    Measures event-loop lag: a background task sleeps `interval` seconds and
+    records how late it wakes up. Work that blocks the loop (or too many
+    ready callbacks) shows up as lag long before request latency is measured.
+
+    `lag()` rises immediately on a late tick and decays slowly afterwards, so a
+    single spike keeps load shedding engaged for a few intervals. A tick that
+    is overdue right now counts as lag too, which catches a loop that is still
+    blocked when the next request arrives.
+    """
+
+    def __init__(self, interval: float = 0.05, decay: float = 0.8):
+        self.interval = interval
+        self.decay = decay
+        self._lag = 0.0
+        self._max_lag = 0.0
+        self._due: Optional[float] = None # When the current tick should fire
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def ensure_started(self) -> None:
+        """Starts the sampler on the running loop (restarts it if the loop changed, e.g. in benchmarks)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._task is not None and not self._task.done():
+            return
+        self._loop, self._due = loop, None
+        self._task = loop.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+        self._task = self._loop = self._due = None
+
+    async def _run(self) -> None:
+        while True:
+            self._due = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            late = max(0.0, time.monotonic() - self._due)
+            self._lag = max(late, self._lag * self.decay)
+            self._max_lag = max(self._max_lag, late)
+
+    def lag(self) -> float:
+        """Current lag estimate in seconds."""
+        overdue = time.monotonic() - self._due if self._due is not None else 0.0
+        return max(self._lag, overdue)
+
+    def max_lag(self) -> float:
+        """Worst single tick seen since startup."""
+        return self._max_lag
+
+
+loop_monitor = LoopLagMonitor(LOOP_LAG_INTERVAL_MS / 1000)
@@ -0,0 +1,203 @@
+# services/metrics.py
+import asyncio
+import functools
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from config import METRICS_ENABLED
+
+# Minimal Prometheus text-format registry (no client library needed).
+#
+# Recording is lock-free: every thread writes into its own shard (the event
+# loop thread, each hashing/to_thread worker), so observe() never contends.
+# Shards are only merged when /metrics is scraped; a scrape racing a write
+# may miss that one observation, which is fine for monitoring.
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Histogram:
+    """Latency histogram with labels. Rows are [bucket counts..., +Inf count, sum] per label set and thread."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._local = threading.local()
+        self._shards: List[Dict[LabelValues, list]] = []
+        self._shards_lock = threading.Lock() # Only taken when a thread records for the first time
+
+    def _shard(self) -> Dict[LabelValues, list]:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def observe(self, value: float, *labels: str) -> None:
+        shard = self._shard()
+        row = shard.get(labels)
+        if row is None:
+            row = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        row[bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    def time(self, *labels: str) -> "_Timer":
+        """Context manager observing the elapsed time of its block."""
+        return _Timer(self, labels)
+
+    def collect(self) -> Dict[LabelValues, list]:
+        merged: Dict[LabelValues, list] = {}
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            for labels, row in list(shard.items()):
+                total = merged.get(labels)
+                if total is None:
+                    merged[labels] = list(row)
+                else:
+                    for i, value in enumerate(row):
+                        total[i] += value
+        return merged
+
+    def render(self) -> List[str]:
+        lines = []
+        for labels, row in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), row):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {row[-1]!r}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram: Histogram, labels: LabelValues):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+        return False
+
+
+class Gauge:
+    """Value read at scrape time from a callback returning a number or {label values: number}."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, read: Callable[[], Union[float, Dict[LabelValues, float]]], labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.read = read
+        self.labelnames = tuple(labelnames)
+
+    def render(self) -> List[str]:
+        value = self.read()
+        samples = value.items() if isinstance(value, dict) else [((), value)]
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(v)}" for labels, v in sorted(samples)]
+
+
+class Counter(Gauge):
+    """Monotonic total read at scrape time (e.g. from counters a component already keeps)."""
+
+    kind = "counter"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, Union[Histogram, Gauge]] = {}
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def gauge(self, name: str, help: str, read, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help, read, labelnames))
+
+    def counter(self, name: str, help: str, read, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, read, labelnames))
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format (0.0.4)."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# Shared by every service module; labelled by "module.function"
+service_function_seconds = registry.histogram(
+    "service_function_seconds", "Time spent in instrumented service functions.", ("function",),
+)
+
+
+def timed(function_name: Optional[str] = None):
+    """
+    Decorator recording each call's duration in service_function_seconds.
+    Works for sync and async functions. With METRICS_ENABLED off it returns
+    the function unchanged, so there is no per-call cost at all.
+    """
+    def decorate(func):
+        if not METRICS_ENABLED:
+            return func
+        label = function_name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+        observe = service_function_seconds.observe
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    observe(time.perf_counter() - start, label)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(time.perf_counter() - start, label)
+        return wrapper
+    return decorate
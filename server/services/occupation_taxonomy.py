@@ -0,0 +1,282 @@
+# services/occupation_taxonomy.py
+import csv
+import logging
+import mmap
+import os
+import re
+import threading
+from array import array
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Common abbreviations in free-text job titles
+_ABBREVIATIONS = {
+    "sr": "senior", "jr": "junior", "mgr": "manager", "asst": "assistant", "rep": "representative",
+    "dev": "developer", "eng": "engineer", "admin": "administrator", "tech": "technician",
+    "coord": "coordinator", "supv": "supervisor", "exec": "executive", "spec": "specialist",
+}
+_STOPWORDS = frozenset({"a", "an", "and", "at", "for", "in", "of", "the", "to", "&"})
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+_NGRAM = 3
+_CANDIDATE_GRAMS = 8 # Rarest query trigrams used to find candidates
+_CANDIDATES = 10 # Candidates (most shared rare trigrams) that get an exact similarity score
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_title(title: str) -> str:
+    """Lowercased, punctuation-free, abbreviation-expanded, singular form of a job title."""
+    tokens = []
+    for token in _NON_WORD.split(title.lower()):
+        if not token or token in _STOPWORDS:
+            continue
+        token = _ABBREVIATIONS.get(token, token)
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1] # cashiers -> cashier
+        tokens.append(token)
+    return " ".join(tokens)
+
+
+def _ngrams(text: str) -> set:
+    padded = f" {text} "
+    return {padded[i:i + _NGRAM] for i in range(len(padded) - _NGRAM + 1)}
+
+
+def _risk(value: str) -> Optional[int]:
+    """Risk score clamped to 0-100, or None when the cell isn't a number."""
+    try:
+        return max(0, min(100, int(value)))
+    except ValueError:
+        return None
+
+
+class Occupation(NamedTuple):
+    title: str
+    risk_score: int
+    explanation: str
+
+
+class OccupationTaxonomy:
+    """
+    Free-text job title -> occupation (risk score, explanation), backed by a CSV file.
+
+    Expected columns: title, risk_score, explanation and an optional synonyms
+    column ("|"-separated alternative titles); one row per line. The file is
+    memory-mapped and only loaded on first use. The index keeps titles, risk
+    scores and row offsets; explanations stay in the mapped file until an
+    occupation is actually returned.
+
+    Rows with a non-numeric risk score, missing columns or a quoted field
+    spanning several lines (which would break the per-line offsets) are
+    skipped and counted in `skipped_rows`. If the file can't be loaded at
+    all, the error is logged once, `load_error` is set and resolve() returns
+    None for every title, so callers fall back to their rule table.
+
+    Resolution order for a normalized title: exact title or synonym, then
+    the longest known title contained in it (token trie, e.g. "senior retail
+    cashier at walmart" -> "retail cashier"). If neither matches, misspelled
+    words are corrected against the title vocabulary (character trigrams)
+    and both are tried again; the last resort is the closest whole title by
+    trigram overlap. Fuzzy matches need a Dice similarity of at least
+    `min_similarity`. Results are memoized per normalized title.
+    """
+
+    def __init__(self, path: str, min_similarity: float = 0.6, memo_size: int = 50_000):
+        self.path = path
+        self.min_similarity = min_similarity
+        self._lock = threading.Lock()
+        self._loaded = False
+        self.load_error: Optional[str] = None
+        self.skipped_rows = 0
+        self._resolve_normalized = lru_cache(maxsize=memo_size)(self._lookup)
+
+    # --- Loading ---
+
+    def _load(self) -> None:
+        with self._lock:
+            if self._loaded:
+                return
+            try:
+                self._read()
+            except (OSError, KeyError, ValueError, csv.Error) as e: # KeyError: a required column is missing
+                self.load_error = f"{type(e).__name__}: {e}"
+                logger.error("Occupation dataset %s not loaded (%s); using the rule table", self.path, self.load_error)
+                self._titles = []
+            else:
+                if self.skipped_rows:
+                    logger.warning("Occupation dataset %s: skipped %d malformed rows", self.path, self.skipped_rows)
+            self._loaded = True
+
+    def _read(self) -> None:
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header_end = self._map.find(b"\n") + 1
+        header = next(csv.reader([self._map[:header_end].decode("utf-8-sig")]))
+        columns = {name.strip().lower(): index for index, name in enumerate(header)}
+        title_col, risk_col = columns["title"], columns["risk_score"]
+        self._explanation_col = columns["explanation"]
+        synonyms_col = columns.get("synonyms")
+
+        self._titles: List[str] = []
+        self._risks = array("B")
+        self._offsets = array("Q") # Start of each row in the mapped file
+        self._exact: Dict[str, int] = {}
+        self._trie: dict = {}
+        self._aliases: List[str] = [] # Normalized titles and synonyms
+        self._alias_rows = array("I")
+        self._grams: Dict[str, array] = {}
+        self._vocabulary: Dict[str, None] = {} # Distinct title tokens (ordered)
+
+        starts = array("Q")
+
+        def lines():
+            # One csv.reader over the whole file; record where each line starts
+            position = header_end
+            self._map.seek(header_end)
+            for line in iter(self._map.readline, b""):
+                starts.append(position)
+                position += len(line)
+                yield line.decode("utf-8", errors="replace")
+
+        needed = max(title_col, risk_col, self._explanation_col)
+        lines_read = 0
+        for row in csv.reader(lines()):
+            row_lines, lines_read = len(starts) - lines_read, len(starts)
+            if not any(cell.strip() for cell in row):
+                continue # Blank line
+            valid = row_lines == 1 and len(row) > needed and row[title_col].strip()
+            risk = _risk(row[risk_col]) if valid else None
+            if risk is None:
+                self.skipped_rows += 1
+                continue
+            row_id = len(self._titles)
+            self._titles.append(row[title_col].strip())
+            self._risks.append(risk)
+            self._offsets.append(starts[-1]) # Rows are single lines, so the last line read started this row
+            names = [row[title_col]]
+            if synonyms_col is not None and synonyms_col < len(row) and row[synonyms_col]:
+                names.extend(row[synonyms_col].split("|"))
+            for name in names:
+                self._add_alias(normalize_title(name), row_id)
+        self._build_token_grams()
+
+    def _add_alias(self, alias: str, row_id: int) -> None:
+        if not alias or alias in self._exact:
+            return
+        self._exact[alias] = row_id
+        node = self._trie
+        for token in alias.split():
+            self._vocabulary.setdefault(token, None)
+            node = node.setdefault(token, {})
+        node[""] = row_id # Terminal marker
+
+        alias_id = len(self._aliases)
+        self._aliases.append(alias)
+        self._alias_rows.append(row_id)
+        for gram in _ngrams(alias):
+            postings = self._grams.get(gram)
+            if postings is None:
+                postings = self._grams[gram] = array("I")
+            postings.append(alias_id)
+
+    def _build_token_grams(self) -> None:
+        # Trigram index over the token vocabulary, used to correct misspelled words.
+        # The vocabulary is far smaller than the title list, so this stays cheap.
+        self._tokens = list(self._vocabulary)
+        self._token_grams: Dict[str, List[int]] = {}
+        for token_id, token in enumerate(self._tokens):
+            for gram in _ngrams(token):
+                self._token_grams.setdefault(gram, []).append(token_id)
+
+    # --- Resolution ---
+
+    def _correct(self, token: str) -> str:
+        """The closest vocabulary word to `token` (itself when known or nothing is close enough)."""
+        if token in self._vocabulary or len(token) < _NGRAM:
+            return token
+        grams = _ngrams(token)
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self._token_grams.get(gram, ()))
+        best, best_score = token, self.min_similarity
+        for token_id, _ in shared.most_common(_CANDIDATES):
+            candidate = self._tokens[token_id]
+            candidate_grams = _ngrams(candidate)
+            score = 2 * len(grams & candidate_grams) / (len(grams) + len(candidate_grams))
+            if score >= best_score:
+                best, best_score = candidate, score
+        return best
+
+    def _occupation(self, row_id: int) -> Occupation:
+        start = self._offsets[row_id]
+        end = self._map.find(b"\n", start)
+        line = self._map[start:end if end != -1 else len(self._map)].decode("utf-8", errors="replace")
+        explanation = next(csv.reader([line]))[self._explanation_col].strip()
+        return Occupation(self._titles[row_id], self._risks[row_id], explanation)
+
+    def _longest_contained(self, tokens: List[str]) -> Optional[int]:
+        best: Optional[Tuple[int, int]] = None # (length, row_id)
+        for start in range(len(tokens)):
+            node = self._trie
+            for end in range(start, len(tokens)):
+                node = node.get(tokens[end])
+                if node is None:
+                    break
+                if "" in node and (best is None or end - start + 1 > best[0]):
+                    best = (end - start + 1, node[""])
+        return best[1] if best else None
+
+    def _closest(self, normalized: str) -> Optional[int]:
+        grams = _ngrams(normalized)
+        postings = sorted((self._grams[gram] for gram in grams if gram in self._grams), key=len)
+        # Candidates come from the rarest trigrams of the query: a typo spoils at
+        # most three of them, and common ones (" se", "er ") would touch a large
+        # part of the index while saying little
+        shared: Counter = Counter()
+        for ids in postings[:_CANDIDATE_GRAMS]:
+            shared.update(ids) # Counting runs in C
+        best_row, best_score = None, self.min_similarity
+        for alias_id, _ in shared.most_common(_CANDIDATES):
+            alias_grams = _ngrams(self._aliases[alias_id])
+            score = 2 * len(grams & alias_grams) / (len(grams) + len(alias_grams)) # Dice coefficient
+            if score >= best_score:
+                best_row, best_score = self._alias_rows[alias_id], score
+        return best_row
+
+    def _match(self, tokens: List[str]) -> Optional[int]:
+        row_id = self._exact.get(" ".join(tokens))
+        return row_id if row_id is not None else self._longest_contained(tokens)
+
+    def _lookup(self, normalized: str) -> Optional[Occupation]:
+        tokens = normalized.split()
+        row_id = self._match(tokens)
+        if row_id is None:
+            corrected = [self._correct(token) for token in tokens]
+            if corrected != tokens:
+                row_id = self._match(corrected)
+        if row_id is None:
+            row_id = self._closest(normalized)
+        return self._occupation(row_id) if row_id is not None else None
+
+    def resolve(self, job_title: str) -> Optional[Occupation]:
+        """Best matching occupation for a free-text job title, or None (also when the dataset failed to load)."""
+        if not self._loaded:
+            self._load()
+        if self.load_error is not None:
+            return None
+        normalized = normalize_title(job_title)
+        return self._resolve_normalized(normalized) if normalized else None
+
+    def __len__(self) -> int:
+        if not self._loaded:
+            self._load()
+        return len(self._titles)
+
+    def version(self) -> str:
+        """Identifies the dataset file contents (size and mtime) without loading it."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return "unavailable" # resolve() will log the error and fall back
+        return f"{stat.st_size}-{int(stat.st_mtime)}"
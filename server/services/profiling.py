@@ -0,0 +1,196 @@
+# services/profiling.py
+import cProfile
+import marshal
+import os
+import random
+import re
+import secrets
+import tempfile
+import threading
+import time
+from typing import List, NamedTuple, Optional, Tuple
+
+from config import (
+    PROFILING_DIR, PROFILING_MAX_FILES, PROFILING_SAMPLE_RATE, PROFILING_ROUTE_RATES, PROFILING_TOKEN,
+)
+
+# Per-request profiling. A request is profiled when it carries the debug
+# header with PROFILING_TOKEN, or when it wins the sampling draw for its
+# route. Profiles go to a bounded ring of files in PROFILING_DIR.
+#
+# pyinstrument (a sampling profiler that follows async tasks) is used when it
+# is installed and writes speedscope flame data; otherwise cProfile writes a
+# pstats file. cProfile traces the whole event-loop thread, so concurrent
+# requests show up in the same profile; only one request is profiled at a
+# time either way.
+
+
+def _pyinstrument():
+    # Optional; imported on the first profiled request
+    try:
+        import pyinstrument
+        return pyinstrument
+    except ModuleNotFoundError:
+        return None
+
+
+class ProfileEntry(NamedTuple):
+    id: str
+    name: str # File name in the ring
+    method: str
+    path: str # Request path with non-alphanumerics replaced by "_"
+    duration_ms: float
+    size_bytes: int
+    created_at: float # Unix time
+    format: str # "pstats" or "speedscope"
+
+
+_EXTENSIONS = {"pstats": ".prof", "speedscope": ".speedscope.json"}
+_NAME = re.compile(r"^(?P<id>\d{13}-[0-9a-f]{6})-(?P<method>[A-Z]+)-(?P<path>[A-Za-z0-9_]*)-(?P<us>\d+)(?P<ext>\.prof|\.speedscope\.json)$")
+
+
+class ProfileRing:
+    """Keeps the newest `max_files` profiles in `directory`; file names carry the metadata."""
+
+    def __init__(self, directory: str, max_files: int):
+        self.directory = directory
+        self.max_files = max(1, max_files)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def new_id() -> str:
+        # Millisecond timestamp first, so names sort oldest-first
+        return f"{int(time.time() * 1000):013d}-{secrets.token_hex(3)}"
+
+    def save(self, profile_id: str, method: str, path: str, duration: float, data: bytes, format: str) -> str:
+        """Writes a profile and drops the oldest ones past the cap. Returns the file name."""
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_")[:80]
+        name = f"{profile_id}-{method}-{slug}-{int(duration * 1e6)}{_EXTENSIONS[format]}"
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp_path, os.path.join(self.directory, name))
+            names = self._names()
+            for old in names[:max(0, len(names) - self.max_files)]:
+                try:
+                    os.remove(os.path.join(self.directory, old))
+                except FileNotFoundError:
+                    pass
+        return name
+
+    def _names(self) -> List[str]:
+        try:
+            return sorted(name for name in os.listdir(self.directory) if _NAME.match(name))
+        except FileNotFoundError:
+            return []
+
+    def list(self) -> List[ProfileEntry]:
+        """Profiles in the ring, newest first."""
+        entries = []
+        for name in reversed(self._names()):
+            match = _NAME.match(name)
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError: # Rotated out meanwhile
+                continue
+            entries.append(ProfileEntry(
+                id=match["id"], name=name, method=match["method"], path=match["path"],
+                duration_ms=int(match["us"]) / 1000, size_bytes=stat.st_size,
+                created_at=int(match["id"][:13]) / 1000,
+                format="pstats" if match["ext"] == ".prof" else "speedscope",
+            ))
+        return entries
+
+    def find(self, profile_id: str) -> Optional[Tuple[str, ProfileEntry]]:
+        """(file path, entry) of a profile by id, or None. Only names from the ring are ever resolved."""
+        for entry in self.list():
+            if entry.id == profile_id:
+                return os.path.join(self.directory, entry.name), entry
+        return None
+
+
+class RequestProfile:
+    """One running profile. `stop()` returns (data, format)."""
+
+    def __init__(self):
+        module = _pyinstrument()
+        if module is not None:
+            self._profiler = module.Profiler(async_mode="enabled")
+            self._profiler.start()
+            self._cprofile = None
+        else:
+            self._profiler = None
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def stop(self) -> Tuple[bytes, str]:
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.create_stats()
+            return marshal.dumps(self._cprofile.stats), "pstats" # Same bytes Profile.dump_stats writes
+        self._profiler.stop()
+        from pyinstrument.renderers import SpeedscopeRenderer
+        return self._profiler.output(renderer=SpeedscopeRenderer()).encode(), "speedscope"
+
+
+def parse_route_rates(spec: str) -> Tuple[Tuple[str, float], ...]:
+    """Parses PROFILING_ROUTE_RATES ("/api/v1/chat=0.01,/api/v1/jobs=0.05"), longest prefix first."""
+    rates = {}
+    for part in spec.split(","):
+        if "=" in part:
+            prefix, rate = part.rsplit("=", 1)
+            rates[prefix.strip()] = float(rate)
+    return tuple(sorted(rates.items(), key=lambda item: -len(item[0])))
+
+
+class RequestProfiler:
+    """Selection policy plus the ring. `begin()` returns a running profile or None."""
+
+    def __init__(self, ring: ProfileRing, token: str, default_rate: float, route_rates: Tuple[Tuple[str, float], ...]):
+        self.ring = ring
+        self.token = token
+        self.default_rate = default_rate
+        self.route_rates = route_rates
+        self._active = False # One profile at a time (touched from the event loop only)
+        self.skipped_busy = 0
+
+    def sample_rate(self, path: str) -> float:
+        for prefix, rate in self.route_rates:
+            if path.startswith(prefix):
+                return rate
+        return self.default_rate
+
+    def wants(self, path: str, header: Optional[str]) -> bool:
+        """Whether a request should be profiled: valid debug header, or a sampling hit for its route."""
+        if header is not None and self.token and secrets.compare_digest(header.encode("latin-1"), self.token.encode()):
+            return True
+        rate = self.sample_rate(path)
+        return rate > 0 and random.random() < rate
+
+    def begin(self) -> Optional[RequestProfile]:
+        if self._active:
+            self.skipped_busy += 1
+            return None
+        try:
+            profile = RequestProfile()
+        except ValueError: # Another profiler (e.g. a developer's) already owns the thread
+            self.skipped_busy += 1
+            return None
+        self._active = True
+        return profile
+
+    def end(self, profile: RequestProfile) -> Tuple[bytes, str]:
+        try:
+            return profile.stop()
+        finally:
+            self._active = False
+
+
+request_profiler = RequestProfiler(
+    ProfileRing(PROFILING_DIR, PROFILING_MAX_FILES),
+    PROFILING_TOKEN,
+    PROFILING_SAMPLE_RATE,
+    parse_route_rates(PROFILING_ROUTE_RATES),
+)
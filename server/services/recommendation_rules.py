@@ -0,0 +1,213 @@
+# services/recommendation_rules.py
+# Declarative rule table for recommendation_service. Each rule lists the
+# job-title keywords it applies to and the catalog entries it recommends.
+# Add occupations here rather than adding branches to the service code.
+from .rule_engine import (
+    OccupationRule, InterestBranch, JobTemplate, CourseTemplate, HustleTemplate,
+)
+
+_ENVIRONMENT = ("environment", "eco")
+_ENVIRONMENT_OR_GREEN = ("environment", "eco", "green")
+
+
+RETAIL = OccupationRule(
+    name="retail",
+    keywords=("cashier", "retail"),
+    risk_score=75,
+    risk_explanation="Cashier jobs face high automation risk due to self-checkout technology and online retail.",
+    jobs=(
+        JobTemplate(
+            title="Solar Sales Support Specialist",
+            growth=(10, 20),
+            skillMatch="Uses your customer service and sales skills",
+            description="Assist customers with solar panel purchases and installation scheduling.",
+            salary="$45,000 - $60,000",
+        ),
+        InterestBranch(
+            keywords=_ENVIRONMENT,
+            matched=(JobTemplate(
+                title="Eco-Retail Coordinator",
+                growth=(8, 15),
+                skillMatch="Uses your inventory and customer interaction experience",
+                description="Manage sustainable product lines and assist customers in an eco-friendly retail setting.",
+                salary="$42,000 - $55,000",
+            ),),
+            otherwise=(JobTemplate( # Default second option if no specific environmental interest
+                title="Community Recycling Program Assistant",
+                growth=(5, 10),
+                skillMatch="Uses your organizational and public interaction skills",
+                description="Help manage local recycling initiatives and educate the public.",
+                salary="$35,000 - $45,000",
+            ),),
+        ),
+    ),
+    courses=(
+        CourseTemplate(
+            title="Coursera: Sustainable Business Practices",
+            provider="Coursera",
+            duration="6 weeks",
+            skills="Sustainability, customer engagement, business ethics",
+            link="https://www.coursera.org/courses?query=sustainable%20business%20practices", # Example link
+        ),
+        InterestBranch(
+            keywords=_ENVIRONMENT_OR_GREEN,
+            matched=(CourseTemplate(
+                title="edX: Solar Energy Fundamentals",
+                provider="edX",
+                duration="8 weeks",
+                skills="Renewable energy, solar technology, basic sales principles",
+                link="https://www.edx.org/learn/solar-energy", # Example link
+            ),),
+            otherwise=(CourseTemplate(
+                title="Coursera: Introduction to Sales",
+                provider="Coursera",
+                duration="4 weeks",
+                skills="Sales techniques, customer relationship management",
+                link="https://www.coursera.org/courses?query=introduction%20to%20sales", # Example link
+            ),),
+        ),
+    ),
+    hustles=(
+        InterestBranch(
+            keywords=_ENVIRONMENT,
+            matched=(
+                HustleTemplate(
+                    title="Etsy Eco-Crafts",
+                    description="Sell handmade sustainable crafts (e.g., upcycled items, eco-friendly candles) on Etsy.",
+                    skills="Creativity, crafting, online selling, customer service",
+                    low=(300, 800), high=(1000, 2500),
+                ),
+                HustleTemplate(
+                    title="Green Blogging / Social Media Content",
+                    description="Create content about sustainability, zero waste, or eco-friendly living.",
+                    skills="Writing, research, social media marketing",
+                    low=(100, 300), high=(500, 1500),
+                ),
+            ),
+            otherwise=( # Default hustles if no specific environmental interest
+                HustleTemplate(
+                    title="Online Reselling (Sustainable Goods)",
+                    description="Buy and resell second-hand clothing or vintage items online.",
+                    skills="Eye for value, online marketplaces, photography, customer service",
+                    low=(400, 900), high=(1200, 2800),
+                ),
+                HustleTemplate(
+                    title="Local Errand Service (using sustainable transport)",
+                    description="Offer delivery or errand services in your neighborhood using a bike or walking.",
+                    skills="Reliability, organization, knowledge of local area, physical fitness",
+                    low=(200, 500), high=(800, 2000),
+                ),
+            ),
+        ),
+    ),
+)
+
+EDUCATION = OccupationRule(
+    name="education",
+    keywords=("teacher", "educator"),
+    risk_score=50,
+    risk_explanation="Teaching roles have moderate automation risk, with technology assisting but human interaction remaining key.",
+    jobs=(
+        JobTemplate(
+            title="Environmental Education Program Manager",
+            growth=(10, 18),
+            skillMatch="Leverages your teaching and program management abilities",
+            description="Develop and deliver educational programs on environmental topics for schools or community groups.",
+            salary="$50,000 - $70,000",
+        ),
+        JobTemplate(
+            title="Sustainability Training Coordinator",
+            growth=(12, 25),
+            skillMatch="Uses your training and communication skills",
+            description="Coordinate and deliver training sessions for businesses on sustainable practices.",
+            salary="$55,000 - $75,000",
+        ),
+    ),
+    courses=(
+        CourseTemplate(
+            title="Coursera: Climate Change Education",
+            provider="Coursera",
+            duration="7 weeks",
+            skills="Environmental education, climate science communication, pedagogy",
+            link="https://www.coursera.org/courses?query=climate%20change%20education", # Example link
+        ),
+        CourseTemplate(
+            title="edX: Urban Sustainability",
+            provider="edX",
+            duration="9 weeks",
+            skills="Urban planning, environmental policy, sustainable development",
+            link="https://www.edx.org/learn/sustainable-development", # Example link
+        ),
+    ),
+    hustles=(
+        HustleTemplate(
+            title="Online Environmental Tutoring",
+            description="Offer tutoring in science or environmental subjects to students online.",
+            skills="Subject matter expertise, online teaching tools, communication",
+            low=(300, 800), high=(1000, 2500),
+        ),
+        HustleTemplate(
+            title="Workshop Facilitator (Sustainable Living)",
+            description="Lead local workshops on topics like composting, urban gardening, or DIY eco-products.",
+            skills="Teaching, presentation, subject matter knowledge",
+            low=(200, 600), high=(700, 1800),
+        ),
+    ),
+)
+
+# Recommendations for job titles no rule matches
+DEFAULT_RULE = OccupationRule(
+    name="default",
+    keywords=(),
+    risk_score=60,
+    risk_explanation="This job has a moderate automation risk, typical for many roles impacted by technology.",
+    jobs=(
+        JobTemplate(
+            title="Green Building Consultant Assistant",
+            growth=(10, 20),
+            skillMatch="Adaptable to new industry knowledge",
+            description="Assist in consulting projects for sustainable construction and building practices.",
+            salary="$40,000 - $55,000",
+        ),
+        JobTemplate(
+            title="Renewable Energy Project Administrator",
+            growth=(15, 25),
+            skillMatch="Uses organizational and administrative skills",
+            description="Provide administrative support for solar, wind, or other renewable energy projects.",
+            salary="$45,000 - $60,000",
+        ),
+    ),
+    courses=(
+        CourseTemplate(
+            title="Coursera: Circular Economy",
+            provider="Coursera",
+            duration="5 weeks",
+            skills="Circular economy principles, sustainable design",
+            link="https://www.coursera.org/courses?query=circular%20economy", # Example link
+        ),
+        CourseTemplate(
+            title="edX: Introduction to Environmental Science",
+            provider="edX",
+            duration="6 weeks",
+            skills="Environmental systems, ecological principles",
+            link="https://www.edx.org/learn/environmental-science", # Example link
+        ),
+    ),
+    hustles=(
+        HustleTemplate(
+            title="Freelance Green Copywriting",
+            description="Write articles, blog posts, or marketing content for environmentally focused businesses.",
+            skills="Writing, research, understanding of green industries",
+            low=(400, 1000), high=(1500, 3500),
+        ),
+        HustleTemplate(
+            title="Sustainable Product Affiliate Marketing",
+            description="Promote eco-friendly products online and earn commission.",
+            skills="Online marketing, content creation, product reviews",
+            low=(100, 400), high=(600, 2000),
+        ),
+    ),
+)
+
+# Order matters: when a title matches several rules, the first one wins
+OCCUPATION_RULES = (RETAIL, EDUCATION)
@@ -1,218 +1,220 @@
 # services/recommendation_service.py
+import hashlib
 import random
-from typing import List, Optional
-from models import AutomationRiskResponse, GreenJob, ReskillingCourse, SideHustle, UserDB
+import zlib
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple, Optional
+from models import AutomationRiskResponse, GreenJob, ReskillingCourse, SideHustle, UserDB, RecommendationsResponse
 from uuid import UUID
-
+from .rule_engine import RuleEngine, RuleMatch, Template, encoded
+from .relevance_engine import BM25Index
+from .occupation_taxonomy import OccupationTaxonomy
+from .recommendation_rules import OCCUPATION_RULES, DEFAULT_RULE
+from .recommendation_cache import RecommendationCache
+from .metrics import timed
+from database import invalidation_bus
+from config import RECOMMENDATION_CACHE_MAX_ENTRIES, RECOMMENDATION_CACHE_TTL_SECONDS, RELEVANCE_RANKING, RELEVANCE_TOP_K
+from config import OCCUPATIONS_CSV, OCCUPATION_MIN_SIMILARITY, OCCUPATION_MEMO_SIZE
+
+# Rule table compiled once at import; see recommendation_rules.py
+_engine = RuleEngine(OCCUPATION_RULES, DEFAULT_RULE)
+
+# Optional occupation dataset; loaded on the first risk lookup, not at import
+occupation_taxonomy = (
+    OccupationTaxonomy(OCCUPATIONS_CSV, OCCUPATION_MIN_SIMILARITY, OCCUPATION_MEMO_SIZE) if OCCUPATIONS_CSV else None
+)
+
+# Changes whenever the rule table / catalog / occupation dataset changes; part of response ETags
+CATALOG_VERSION = hashlib.sha1(repr((
+    OCCUPATION_RULES, DEFAULT_RULE, occupation_taxonomy.version() if occupation_taxonomy else None,
+)).encode()).hexdigest()[:12]
+
+# Relevance ranking over the whole catalog, one BM25 index per section. Job
+# titles no rule covers are ranked by relevance to their title, interests and
+# resume skills instead of all getting the same default entries.
+_SECTION_FIELDS = {"jobs": "jobs", "reskilling": "courses", "hustles": "hustles"}
+
+def _document(entry: Template) -> str:
+    return " ".join(getattr(entry, field, "") for field in ("title", "description", "skillMatch", "skills"))
+
+@lru_cache(maxsize=None)
+def relevance_index(section: str) -> BM25Index:
+    """BM25 index of a section's catalog, built on first use (or during warmup)."""
+    return BM25Index((entry, _document(entry)) for entry in _engine.catalog(_SECTION_FIELDS[section]))
+
+def _query_text(job_title: str, interests: Optional[str], skills: Optional[Iterable[str]]) -> str:
+    return " ".join((job_title, interests or "", " ".join(skills or ())))
+
+def _relevance_terms(match: RuleMatch, job_title: str, interests: Optional[str], skills: Optional[Iterable[str]]) -> tuple:
+    """Catalog terms in the user's profile when relevance ranking applies (rule-less titles), else ()."""
+    if not RELEVANCE_RANKING or match.rule is not _engine.default:
+        return ()
+    text = _query_text(job_title, interests, skills)
+    return tuple(sorted({term for section in _SECTION_FIELDS for term in relevance_index(section).query_terms(text)}))
+
+def _ranked_entries(section: str, match: RuleMatch, job_title: str, interests: Optional[str], skills) -> List[Template]:
+    """Best catalog matches for the profile, topped up with the rule's entries ([] when ranking doesn't apply)."""
+    terms = _relevance_terms(match, job_title, interests, skills)
+    if not terms:
+        return []
+    ranked = [entry for entry, _ in relevance_index(section).top_k(terms, RELEVANCE_TOP_K)]
+    if ranked and len(ranked) < RELEVANCE_TOP_K:
+        fallback = [entry for entry in match.expand(getattr(match.rule, _SECTION_FIELDS[section])) if entry not in ranked]
+        ranked += fallback[:RELEVANCE_TOP_K - len(ranked)]
+    return ranked
+
+def occupation_for(job_title: str) -> str:
+    """Name of the occupation rule a job title falls under ("default" if none)."""
+    return _engine.match_rule(job_title).name
+
+@timed()
 def mock_get_risk_score(job_title: str) -> tuple[int, str]:
-    """Mocks automation risk based on job title."""
-    job_title_lower = job_title.lower()
-    if "cashier" in job_title_lower or "retail" in job_title_lower:
-        return 75, "Cashier jobs face high automation risk due to self-checkout technology and online retail."
-    elif "teacher" in job_title_lower or "educator" in job_title_lower:
-        return 50, "Teaching roles have moderate automation risk, with technology assisting but human interaction remaining key."
-    else:
-        return 60, "This job has a moderate automation risk, typical for many roles impacted by technology."
-
-def mock_get_green_jobs(job_title: str, interests: Optional[str]) -> List[GreenJob]:
+    """Automation risk for a job title: from the occupation dataset when configured, else the rule table."""
+    if occupation_taxonomy is not None:
+        occupation = occupation_taxonomy.resolve(job_title)
+        if occupation is not None:
+            return occupation.risk_score, occupation.explanation
+    rule = _engine.match_rule(job_title)
+    return rule.risk_score, rule.risk_explanation
+
+@timed()
+def mock_get_green_jobs(job_title: str, interests: Optional[str], skills: Optional[Iterable[str]] = None, rng=random) -> List[GreenJob]:
     """Mocks green job recommendations."""
-    # This logic is copied directly from the original main.py mock section
-    jobs: List[GreenJob] = []
-    job_title_lower = job_title.lower()
-    interests_lower = interests.lower() if interests else ""
-
-    if "cashier" in job_title_lower or "retail" in job_title_lower:
-        jobs.append(GreenJob(
-            title="Solar Sales Support Specialist",
-            growthRate=random.randint(10, 20),
-            skillMatch="Uses your customer service and sales skills",
-            description="Assist customers with solar panel purchases and installation scheduling.",
-            salary="$45,000 - $60,000"
-        ))
-        if "environment" in interests_lower or "eco" in interests_lower:
-             jobs.append(GreenJob(
-                title="Eco-Retail Coordinator",
-                growthRate=random.randint(8, 15),
-                skillMatch="Uses your inventory and customer interaction experience",
-                description="Manage sustainable product lines and assist customers in an eco-friendly retail setting.",
-                salary="$42,000 - $55,000"
-            ))
-        else: # Default second option if no specific environmental interest
-             jobs.append(GreenJob(
-                title="Community Recycling Program Assistant",
-                growthRate=random.randint(5, 10),
-                skillMatch="Uses your organizational and public interaction skills",
-                description="Help manage local recycling initiatives and educate the public.",
-                salary="$35,000 - $45,000"
-            ))
-
-    elif "teacher" in job_title_lower or "educator" in job_title_lower:
-        jobs.append(GreenJob(
-            title="Environmental Education Program Manager",
-            growthRate=random.randint(10, 18),
-            skillMatch="Leverages your teaching and program management abilities",
-            description="Develop and deliver educational programs on environmental topics for schools or community groups.",
-            salary="$50,000 - $70,000"
-        ))
-        jobs.append(GreenJob(
-            title="Sustainability Training Coordinator",
-            growthRate=random.randint(12, 25),
-            skillMatch="Uses your training and communication skills",
-            description="Coordinate and deliver training sessions for businesses on sustainable practices.",
-            salary="$55,000 - $75,000"
-        ))
-
-    else: # Default recommendations for others
-        jobs.append(GreenJob(
-            title="Green Building Consultant Assistant",
-            growthRate=random.randint(10, 20),
-            skillMatch="Adaptable to new industry knowledge",
-            description="Assist in consulting projects for sustainable construction and building practices.",
-            salary="$40,000 - $55,000"
-        ))
-        jobs.append(GreenJob(
-            title="Renewable Energy Project Administrator",
-            growthRate=random.randint(15, 25),
-            skillMatch="Uses organizational and administrative skills",
-            description="Provide administrative support for solar, wind, or other renewable energy projects.",
-            salary="$45,000 - $60,000"
-        ))
+    match = _engine.resolve(job_title, interests, skills)
+    ranked = _ranked_entries("jobs", match, job_title, interests, skills)
+    if ranked:
+        return [entry.render(rng) for entry in ranked] # Best match first, no shuffle
+    jobs: List[GreenJob] = [entry.render(rng) for entry in match.expand(match.rule.jobs)]
 
     # Shuffle and return max 2 for variety in demo
-    random.shuffle(jobs)
+    rng.shuffle(jobs)
     return jobs[:2]
 
-def mock_get_reskilling_courses(job_title: str, interests: Optional[str]) -> List[ReskillingCourse]:
+@timed()
+def mock_get_reskilling_courses(job_title: str, interests: Optional[str], skills: Optional[Iterable[str]] = None, rng=random) -> List[ReskillingCourse]:
     """Mocks reskilling course recommendations."""
-    # This logic is copied directly from the original main.py mock section
-    courses: List[ReskillingCourse] = []
-    job_title_lower = job_title.lower()
-    interests_lower = interests.lower() if interests else ""
-
-    if "cashier" in job_title_lower or "retail" in job_title_lower:
-        courses.append(ReskillingCourse(
-            title="Coursera: Sustainable Business Practices",
-            provider="Coursera",
-            duration="6 weeks",
-            skills="Sustainability, customer engagement, business ethics",
-            link="https://www.coursera.org/courses?query=sustainable%20business%20practices" # Example link
-        ))
-        if "environment" in interests_lower or "eco" in interests_lower or "green" in interests_lower:
-             courses.append(ReskillingCourse(
-                title="edX: Solar Energy Fundamentals",
-                provider="edX",
-                duration="8 weeks",
-                skills="Renewable energy, solar technology, basic sales principles",
-                link="https://www.edx.org/learn/solar-energy" # Example link
-            ))
-        else:
-            courses.append(ReskillingCourse(
-                title="Coursera: Introduction to Sales",
-                provider="Coursera",
-                duration="4 weeks",
-                skills="Sales techniques, customer relationship management",
-                link="https://www.coursera.org/courses?query=introduction%20to%20sales" # Example link
-            ))
-
-    elif "teacher" in job_title_lower or "educator" in job_title_lower:
-        courses.append(ReskillingCourse(
-            title="Coursera: Climate Change Education",
-            provider="Coursera",
-            duration="7 weeks",
-            skills="Environmental education, climate science communication, pedagogy",
-            link="https://www.coursera.org/courses?query=climate%20change%20education" # Example link
-        ))
-        courses.append(ReskillingCourse(
-            title="edX: Urban Sustainability",
-            provider="edX",
-            duration="9 weeks",
-            skills="Urban planning, environmental policy, sustainable development",
-            link="https://www.edx.org/learn/sustainable-development" # Example link
-        ))
-    else: # Default courses for others
-        courses.append(ReskillingCourse(
-            title="Coursera: Circular Economy",
-            provider="Coursera",
-            duration="5 weeks",
-            skills="Circular economy principles, sustainable design",
-            link="https://www.coursera.org/courses?query=circular%20economy" # Example link
-        ))
-        courses.append(ReskillingCourse(
-            title="edX: Introduction to Environmental Science",
-            provider="edX",
-            duration="6 weeks",
-            skills="Environmental systems, ecological principles",
-            link="https://www.edx.org/learn/environmental-science" # Example link
-        ))
+    match = _engine.resolve(job_title, interests, skills)
+    ranked = _ranked_entries("reskilling", match, job_title, interests, skills)
+    if ranked:
+        return [entry.render(rng) for entry in ranked]
+    courses: List[ReskillingCourse] = [entry.render(rng) for entry in match.expand(match.rule.courses)]
 
     # Shuffle and return max 2
-    random.shuffle(courses)
+    rng.shuffle(courses)
     return courses[:2]
 
-def mock_get_side_hustles(job_title: str, interests: Optional[str]) -> List[SideHustle]:
+@timed()
+def mock_get_side_hustles(job_title: str, interests: Optional[str], skills: Optional[Iterable[str]] = None, rng=random) -> List[SideHustle]:
     """Mocks side hustle recommendations."""
-    # This logic is copied directly from the original main.py mock section
-    hustles: List[SideHustle] = []
-    job_title_lower = job_title.lower()
-    interests_lower = interests.lower() if interests else ""
-
-    if "cashier" in job_title_lower or "retail" in job_title_lower:
-        if "environment" in interests_lower or "eco" in interests_lower:
-            hustles.append(SideHustle(
-                title="Etsy Eco-Crafts",
-                description="Sell handmade sustainable crafts (e.g., upcycled items, eco-friendly candles) on Etsy.",
-                skills="Creativity, crafting, online selling, customer service",
-                earnings=f"${random.randint(300, 800)*random.choice([1, 2])} - ${random.randint(1000, 2500)*random.choice([1, 2])}/month" # Randomize range a bit
-            ))
-            hustles.append(SideHustle(
-                title="Green Blogging / Social Media Content",
-                description="Create content about sustainability, zero waste, or eco-friendly living.",
-                skills="Writing, research, social media marketing",
-                earnings=f"${random.randint(100, 300)*random.choice([1, 2])} - ${random.randint(500, 1500)*random.choice([1, 2])}/month"
-            ))
-        else: # Default hustles if no specific environmental interest
-             hustles.append(SideHustle(
-                title="Online Reselling (Sustainable Goods)",
-                description="Buy and resell second-hand clothing or vintage items online.",
-                skills="Eye for value, online marketplaces, photography, customer service",
-                earnings=f"${random.randint(400, 900)*random.choice([1, 2])} - ${random.randint(1200, 2800)*random.choice([1, 2])}/month"
-            ))
-             hustles.append(SideHustle(
-                title="Local Errand Service (using sustainable transport)",
-                description="Offer delivery or errand services in your neighborhood using a bike or walking.",
-                skills="Reliability, organization, knowledge of local area, physical fitness",
-                earnings=f"${random.randint(200, 500)*random.choice([1, 2])} - ${random.randint(800, 2000)*random.choice([1, 2])}/month"
-            ))
-
-
-    elif "teacher" in job_title_lower or "educator" in job_title_lower:
-        hustles.append(SideHustle(
-            title="Online Environmental Tutoring",
-            description="Offer tutoring in science or environmental subjects to students online.",
-            skills="Subject matter expertise, online teaching tools, communication",
-            earnings=f"${random.randint(300, 800)*random.choice([1, 2])} - ${random.randint(1000, 2500)*random.choice([1, 2])}/month"
-        ))
-        hustles.append(SideHustle(
-            title="Workshop Facilitator (Sustainable Living)",
-            description="Lead local workshops on topics like composting, urban gardening, or DIY eco-products.",
-            skills="Teaching, presentation, subject matter knowledge",
-            earnings=f"${random.randint(200, 600)*random.choice([1, 2])} - ${random.randint(700, 1800)*random.choice([1, 2])}/month"
-        ))
-
-    else: # Default hustles for others
-        hustles.append(SideHustle(
-            title="Freelance Green Copywriting",
-            description="Write articles, blog posts, or marketing content for environmentally focused businesses.",
-            skills="Writing, research, understanding of green industries",
-            earnings=f"${random.randint(400, 1000)*random.choice([1, 2])} - ${random.randint(1500, 3500)*random.choice([1, 2])}/month"
-        ))
-        hustles.append(SideHustle(
-            title="Sustainable Product Affiliate Marketing",
-            description="Promote eco-friendly products online and earn commission.",
-            skills="Online marketing, content creation, product reviews",
-            earnings=f"${random.randint(100, 400)*random.choice([1, 2])} - ${random.randint(600, 2000)*random.choice([1, 2])}/month"
-        ))
+    match = _engine.resolve(job_title, interests, skills)
+    ranked = _ranked_entries("hustles", match, job_title, interests, skills)
+    if ranked:
+        return [entry.render(rng) for entry in ranked]
+    hustles: List[SideHustle] = [entry.render(rng) for entry in match.expand(match.rule.hustles)]
 
     # Shuffle and return max 2
-    random.shuffle(hustles)
-    return hustles[:2]
\ No newline at end of file
+    rng.shuffle(hustles)
+    return hustles[:2]
+
+# --- Cached recommendations ---
+# Results depend only on the matched rule and the interest keywords found
+# (in the interests field or the extracted resume skills), plus the catalog
+# terms of the profile when relevance ranking applies, so that tuple is the cache key and one entry serves every user who normalizes
+# to it. A profile change simply maps the user to a different key, so no
+# per-user invalidation is needed.
+#
+# Randomness policy: each entry is drawn once from an RNG seeded with its key
+# (which jobs, and which pre-built variant of each; see rule_engine.VARIANTS).
+# The same features therefore always get the same jobs/growth rates/earnings,
+# also after the entry expires and is recomputed.
+
+recommendation_cache = RecommendationCache(RECOMMENDATION_CACHE_MAX_ENTRIES, RECOMMENDATION_CACHE_TTL_SECONDS)
+
+def invalidate_recommendation_cache() -> None:
+    """Drops cached recommendations here and, via the broadcast, in every other worker (e.g. after a catalog change)."""
+    recommendation_cache.clear()
+    invalidation_bus.broadcast("recommendations")
+
+# Each worker keeps its own cache; another worker's invalidation clears ours too
+invalidation_bus.subscribe("recommendations", lambda payload: recommendation_cache.clear())
+invalidation_bus.on_connect(recommendation_cache.clear) # We may have missed one while disconnected
+
+def profile_features(job_title: str, interests: Optional[str], skills: Optional[Iterable[str]] = None) -> tuple:
+    """Normalized (rule, interest keywords, relevance terms) tuple recommendations are computed from."""
+    match = _engine.resolve(job_title, interests, skills)
+    return match.rule.name, tuple(sorted(match.interest_hits)), _relevance_terms(match, job_title, interests, skills)
+
+class EncodedList(NamedTuple):
+    """A cached recommendation list together with its JSON encoding."""
+    items: tuple
+    json: bytes
+
+def _encode(items: list) -> EncodedList:
+    # Joins the catalog entries' pre-built JSON; the fast response path sends these bytes as-is
+    return EncodedList(tuple(items), b"[" + b",".join(encoded(item) for item in items) + b"]")
+
+def _cached_entry(section: str, producer, job_title: str, interests: Optional[str], skills=None) -> EncodedList:
+    key = (section,) + profile_features(job_title, interests, skills)
+    seed = zlib.crc32(repr(key).encode())
+    return recommendation_cache.get_or_compute(
+        key, lambda: _encode(producer(job_title, interests, skills, rng=random.Random(seed)))
+    )
+
+def _cached(section: str, producer, job_title: str, interests: Optional[str], skills=None) -> list:
+    # Callers get their own list; the models inside are shared and must not be mutated
+    return list(_cached_entry(section, producer, job_title, interests, skills).items)
+
+@timed()
+def get_green_jobs(job_title: str, interests: Optional[str], skills: Optional[Iterable[str]] = None) -> List[GreenJob]:
+    """Cached green job recommendations."""
+    return _cached("jobs", mock_get_green_jobs, job_title, interests, skills)
+
+@timed()
+def get_reskilling_courses(job_title: str, interests: Optional[str], skills: Optional[Iterable[str]] = None) -> List[ReskillingCourse]:
+    """Cached reskilling course recommendations."""
+    return _cached("reskilling", mock_get_reskilling_courses, job_title, interests, skills)
+
+@timed()
+def get_side_hustles(job_title: str, interests: Optional[str], skills: Optional[Iterable[str]] = None) -> List[SideHustle]:
+    """Cached side hustle recommendations."""
+    return _cached("hustles", mock_get_side_hustles, job_title, interests, skills)
+
+# Pre-encoded JSON arrays of the same cached results (for PreEncodedJSONResponse)
+@timed()
+def get_green_jobs_json(job_title: str, interests: Optional[str], skills: Optional[Iterable[str]] = None) -> bytes:
+    return _cached_entry("jobs", mock_get_green_jobs, job_title, interests, skills).json
+
+@timed()
+def get_reskilling_courses_json(job_title: str, interests: Optional[str], skills: Optional[Iterable[str]] = None) -> bytes:
+    return _cached_entry("reskilling", mock_get_reskilling_courses, job_title, interests, skills).json
+
+@timed()
+def get_side_hustles_json(job_title: str, interests: Optional[str], skills: Optional[Iterable[str]] = None) -> bytes:
+    return _cached_entry("hustles", mock_get_side_hustles, job_title, interests, skills).json
+
+# Sections served by the bundled /recommendations route
+RECOMMENDATION_SECTIONS = ("risk", "jobs", "reskilling", "hustles")
+
+def _risk_section(user: UserDB) -> AutomationRiskResponse:
+    risk_score, explanation = mock_get_risk_score(user.jobTitle)
+    return AutomationRiskResponse(userId=user.id, jobTitle=user.jobTitle, riskScore=risk_score, explanation=explanation)
+
+def bundle_sections(sections: Iterable[str]) -> List[str]:
+    """The requested sections in canonical order (also what the bundle's ETag varies by)."""
+    wanted = set(sections)
+    return [name for name in RECOMMENDATION_SECTIONS if name in wanted]
+
+@timed()
+def get_recommendation_bundle(user: UserDB, sections: Iterable[str]) -> RecommendationsResponse:
+    """
+    Computes the requested recommendation sections for one user. Each is a
+    cache lookup or a few microseconds of rule work, so they run inline like
+    the single-section routes (a thread hop per section costs far more).
+    """
+    producers = {
+        "risk": lambda: _risk_section(user),
+        "jobs": lambda: get_green_jobs(user.jobTitle, user.interests, user.skills),
+        "reskilling": lambda: get_reskilling_courses(user.jobTitle, user.interests, user.skills),
+        "hustles": lambda: get_side_hustles(user.jobTitle, user.interests, user.skills),
+    }
+    return RecommendationsResponse(userId=user.id, **{name: producers[name]() for name in bundle_sections(sections)})
@@ -0,0 +1,115 @@
+# services/relevance_engine.py
+import heapq
+import math
+import re
+from typing import Dict, Generic, Iterable, List, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from in into is it of on or our the their to with your you "
+    "using use based like eg".split()
+)
+# Longest first; stripped up to twice so e.g. "environmental" and "environment" meet at "environ"
+_SUFFIXES = ("ability", "ation", "ment", "able", "ing", "ers", "er", "al", "s")
+_MIN_STEM = 4
+
+
+def _stem(word: str) -> str:
+    for _ in range(2):
+        for suffix in _SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= _MIN_STEM:
+                word = word[:-len(suffix)]
+                break
+        else:
+            break
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased, stemmed word tokens without stopwords."""
+    return [_stem(word) for word in _TOKEN.findall(text.lower()) if word not in _STOPWORDS]
+
+
+class BM25Index(Generic[T]):
+    """
+    Okapi BM25 over a fixed set of documents, stored as an inverted index.
+
+    Each term's postings map document ids to the precomputed BM25 weight of
+    the term in that document, so scoring a query only touches the postings
+    of its own terms. top_k additionally prunes with per-term score upper
+    bounds (MaxScore): terms are visited rarest-first, and once the
+    remaining terms together cannot lift an unseen document into the top k,
+    the long postings of common terms are only probed for the few
+    documents still in contention. Results are exact.
+    """
+
+    def __init__(self, documents: Iterable[Tuple[T, str]], k1: float = 1.2, b: float = 0.75):
+        self.items: List[T] = []
+        counts: List[Dict[str, int]] = []
+        for item, text in documents:
+            terms: Dict[str, int] = {}
+            for term in tokenize(text):
+                terms[term] = terms.get(term, 0) + 1
+            self.items.append(item)
+            counts.append(terms)
+
+        total = len(counts)
+        average_length = (sum(sum(terms.values()) for terms in counts) / total) if total else 0.0
+        frequency: Dict[str, int] = {}
+        for terms in counts:
+            for term in terms:
+                frequency[term] = frequency.get(term, 0) + 1
+        idf = {term: math.log(1 + (total - df + 0.5) / (df + 0.5)) for term, df in frequency.items()}
+
+        self._postings: Dict[str, Dict[int, float]] = {term: {} for term in frequency}
+        for doc_id, terms in enumerate(counts):
+            norm = k1 * (1 - b + b * sum(terms.values()) / average_length) if average_length else k1
+            for term, tf in terms.items():
+                self._postings[term][doc_id] = idf[term] * tf * (k1 + 1) / (tf + norm)
+        self._upper_bounds = {term: max(postings.values()) for term, postings in self._postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def query_terms(self, text: str) -> Tuple[str, ...]:
+        """Distinct query terms that occur in the index, sorted (a stable cache key for the query)."""
+        return tuple(sorted({term for term in tokenize(text) if term in self._postings}))
+
+    def scores(self, terms: Sequence[str]) -> Dict[int, float]:
+        """BM25 score of every document matching at least one term."""
+        totals: Dict[int, float] = {}
+        get = totals.get
+        for term in set(terms):
+            for doc_id, weight in self._postings.get(term, {}).items():
+                totals[doc_id] = get(doc_id, 0.0) + weight
+        return totals
+
+    def top_k(self, terms: Sequence[str], k: int) -> List[Tuple[T, float]]:
+        """The k best matching documents for the terms, best first (ties by catalog order). [] for k <= 0."""
+        if k <= 0:
+            return []
+        ordered = sorted({term for term in terms if term in self._postings}, key=self._upper_bounds.__getitem__, reverse=True)
+        remaining = sum(self._upper_bounds[term] for term in ordered)
+        totals: Dict[int, float] = {}
+        get = totals.get
+        for position, term in enumerate(ordered):
+            if len(totals) >= k:
+                threshold = heapq.nlargest(k, totals.values())[-1]
+                if remaining < threshold:
+                    # No unseen document can reach the top k; finish the contenders only
+                    contenders = [doc_id for doc_id, score in totals.items() if score + remaining >= threshold]
+                    for later in ordered[position:]:
+                        postings = self._postings[later]
+                        for doc_id in contenders:
+                            weight = postings.get(doc_id)
+                            if weight is not None:
+                                totals[doc_id] += weight
+                    totals = {doc_id: totals[doc_id] for doc_id in contenders}
+                    break
+            for doc_id, weight in self._postings[term].items():
+                totals[doc_id] = get(doc_id, 0.0) + weight
+            remaining -= self._upper_bounds[term]
+        best = heapq.nsmallest(k, totals.items(), key=lambda pair: (-pair[1], pair[0]))
+        return [(self.items[doc_id], score) for doc_id, score in best]
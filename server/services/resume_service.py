@@ -0,0 +1,161 @@
+# services/resume_service.py
+import asyncio
+import codecs
+import os
+import re
+import tempfile
+from typing import AsyncIterator, Dict, FrozenSet, List, Optional, Set, Tuple
+from uuid import UUID
+
+from models import UserDB
+from database import update_user_in_db_async
+from .skill_keywords import SKILL_PHRASES
+from config import RESUME_MAX_BYTES, RESUME_SPILL_DIR
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#.-]*[a-z0-9+#]|[a-z0-9]")
+
+
+class ResumeTooLargeError(Exception):
+    """The upload exceeded RESUME_MAX_BYTES."""
+
+
+class SkillExtractor:
+    """
+    Finds skill phrases in text that arrives in chunks.
+
+    Only the unfinished last word and the few words a phrase can span are
+    carried between chunks, so memory stays constant however long the
+    resume is. Bytes are decoded incrementally (UTF-8 sequences may be split
+    across chunks).
+    """
+
+    def __init__(self, phrases: Dict[str, str] = SKILL_PHRASES):
+        self._singles: Dict[str, str] = {phrase: skill for phrase, skill in phrases.items() if " " not in phrase}
+        self._phrases: Dict[Tuple[str, ...], str] = {
+            tuple(phrase.split()): skill for phrase, skill in phrases.items() if " " in phrase
+        }
+        self._starts = {words[0] for words in self._phrases} # First words of multi-word phrases
+        self._span = max((len(words) for words in self._phrases), default=1)
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._partial = "" # Text after the last word boundary seen so far
+        self._window: Tuple[str, ...] = () # Last complete words, for phrases crossing a chunk
+        self.skills: Set[str] = set()
+        self.bytes_read = 0
+
+    def feed(self, chunk: bytes) -> None:
+        self.bytes_read += len(chunk)
+        self.feed_text(self._decoder.decode(chunk))
+
+    def feed_text(self, text: str) -> None:
+        text = self._partial + text.lower()
+        # Hold back a trailing word that may continue in the next chunk
+        cut = len(text)
+        while cut and not text[cut - 1].isspace():
+            cut -= 1
+        self._partial = text[cut:]
+        self._scan(_WORD.findall(text, 0, cut))
+
+    def _scan(self, words: List[str]) -> None:
+        singles = self._singles
+        for word in singles.keys() & set(words): # Set intersection runs in C
+            self.skills.add(singles[word])
+
+        # Multi-word phrases: only look further at words that can start one
+        window = list(self._window) + words
+        carried = len(self._window)
+        phrases, starts, span = self._phrases, self._starts, self._span
+        for start in [index for index, word in enumerate(window) if word in starts]:
+            for length in range(max(2, carried - start + 1), span + 1):
+                skill = phrases.get(tuple(window[start:start + length]))
+                if skill is not None:
+                    self.skills.add(skill)
+        self._window = tuple(window[-(span - 1):]) if span > 1 else ()
+
+    def close(self) -> FrozenSet[str]:
+        """Flushes the last word and returns the skills found."""
+        tail = self._decoder.decode(b"", final=True)
+        self._partial, text = "", self._partial + tail.lower()
+        self._scan(_WORD.findall(text))
+        return frozenset(self.skills)
+
+
+def extract_skills(text: Optional[str]) -> Optional[list]:
+    """Skills found in a complete text, sorted (None for no text)."""
+    if not text:
+        return None
+    extractor = SkillExtractor()
+    extractor.feed_text(text)
+    return sorted(extractor.close())
+
+
+def _spill_name(user_id: UUID) -> str:
+    return f"{user_id}.txt"
+
+
+def resume_path(resume_file: str) -> str:
+    """Location on disk of a spilled resume. UserDB.resumeFile only holds the file name, never a server path."""
+    return os.path.join(RESUME_SPILL_DIR, os.path.basename(resume_file))
+
+
+def discard_resume_file(resume_file: Optional[str]) -> None:
+    """Deletes a spilled resume the profile no longer refers to."""
+    if resume_file and RESUME_SPILL_DIR:
+        try:
+            os.unlink(resume_path(resume_file))
+        except FileNotFoundError:
+            pass
+
+
+# Spilled uploads are written in blocks of about this size, one thread hop each
+_SPILL_WRITE_BYTES = 1024 * 1024
+
+
+def _open_spill_file():
+    os.makedirs(RESUME_SPILL_DIR, exist_ok=True)
+    return tempfile.NamedTemporaryFile("wb", dir=RESUME_SPILL_DIR, suffix=".part", delete=False)
+
+
+def _commit_spill_file(spill, tail: bytes, path: str) -> None:
+    spill.write(tail)
+    spill.close()
+    os.replace(spill.name, path) # Only complete uploads replace the previous file
+
+
+async def ingest_resume(user: UserDB, chunks: AsyncIterator[bytes]) -> Tuple[UserDB, int]:
+    """
+    Reads a resume upload chunk by chunk, extracting skills as it goes, and
+    stores the skill set on the user. With RESUME_SPILL_DIR set the raw text
+    is written to disk instead of being kept in memory. Returns the updated
+    user and the number of bytes read. Raises ResumeTooLargeError.
+    """
+    extractor = SkillExtractor()
+    spill = None
+    kept, buffered = [], 0
+    if RESUME_SPILL_DIR:
+        spill = await asyncio.to_thread(_open_spill_file)
+    try:
+        async for chunk in chunks:
+            if extractor.bytes_read + len(chunk) > RESUME_MAX_BYTES:
+                raise ResumeTooLargeError(f"Resume exceeds {RESUME_MAX_BYTES} bytes")
+            extractor.feed(chunk)
+            kept.append(chunk)
+            buffered += len(chunk)
+            if spill is not None and buffered >= _SPILL_WRITE_BYTES:
+                await asyncio.to_thread(spill.write, b"".join(kept)) # Disk writes stay off the event loop
+                kept, buffered = [], 0
+        skills = sorted(extractor.close())
+        if spill is not None:
+            await asyncio.to_thread(_commit_spill_file, spill, b"".join(kept), resume_path(_spill_name(user.id)))
+    except BaseException:
+        if spill is not None:
+            spill.close()
+            os.unlink(spill.name)
+        raise
+
+    text = None if spill is not None else b"".join(kept).decode("utf-8", errors="replace").strip() or None
+    updated = user.model_copy(update={
+        "resumeText": text,
+        "resumeFile": _spill_name(user.id) if spill is not None else None,
+        "skills": skills,
+    })
+    return await update_user_in_db_async(user.id, updated), extractor.bytes_read
@@ -0,0 +1,207 @@
+# services/rule_engine.py
+import random
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from models import GreenJob, ReskillingCourse, SideHustle
+from .keyword_matcher import KeywordMatcher
+
+
+# --- Catalog entries ---
+# Each entry's models are built once (at warmup, or on first use) together
+# with their JSON, and shared by every response, so they must not be
+# mutated. Random parts (growth rates, earnings) are drawn for VARIANTS
+# copies from an RNG seeded with the title, so every worker builds the same
+# ones; render() picks a copy with the caller's RNG.
+
+VARIANTS = 8
+
+# id() of a pre-built model -> (model, its JSON). Holding the model keeps its id from being reused.
+_prebuilt_json: Dict[int, tuple] = {}
+
+
+def _prebuild(models: Iterable) -> tuple:
+    models = tuple(models)
+    for model in models:
+        _prebuilt_json[id(model)] = (model, model.model_dump_json().encode())
+    return models
+
+
+def encoded(model) -> bytes:
+    """JSON of a model: the bytes stored when its catalog entry was built, or freshly encoded."""
+    prebuilt = _prebuilt_json.get(id(model))
+    return prebuilt[1] if prebuilt is not None else model.model_dump_json().encode()
+
+
+@dataclass(frozen=True)
+class JobTemplate:
+    title: str
+    growth: Tuple[int, int] # growthRate is drawn from this range
+    skillMatch: str
+    description: str
+    salary: str
+
+    @cached_property
+    def variants(self) -> Tuple[GreenJob, ...]:
+        rng = random.Random(self.title)
+        return _prebuild(
+            GreenJob(
+                title=self.title,
+                growthRate=rng.randint(*self.growth),
+                skillMatch=self.skillMatch,
+                description=self.description,
+                salary=self.salary,
+            )
+            for _ in range(VARIANTS)
+        )
+
+    def render(self, rng=random) -> GreenJob:
+        return rng.choice(self.variants)
+
+
+@dataclass(frozen=True)
+class CourseTemplate:
+    title: str
+    provider: str
+    duration: str
+    skills: str
+    link: str
+
+    @cached_property
+    def variants(self) -> Tuple[ReskillingCourse, ...]:
+        # Courses have no random parts, so one copy does
+        return _prebuild([ReskillingCourse(
+            title=self.title, provider=self.provider, duration=self.duration, skills=self.skills, link=self.link,
+        )])
+
+    def render(self, rng=random) -> ReskillingCourse:
+        return self.variants[0]
+
+
+@dataclass(frozen=True)
+class HustleTemplate:
+    title: str
+    description: str
+    skills: str
+    low: Tuple[int, int]  # Lower end of the monthly earnings range (before the x1/x2 spread)
+    high: Tuple[int, int] # Upper end
+
+    @cached_property
+    def variants(self) -> Tuple[SideHustle, ...]:
+        rng = random.Random(self.title)
+        return _prebuild(
+            SideHustle(
+                title=self.title,
+                description=self.description,
+                skills=self.skills,
+                earnings=(
+                    f"${rng.randint(*self.low)*rng.choice([1, 2])} - "
+                    f"${rng.randint(*self.high)*rng.choice([1, 2])}/month"
+                ),
+            )
+            for _ in range(VARIANTS)
+        )
+
+    def render(self, rng=random) -> SideHustle:
+        return rng.choice(self.variants)
+
+
+Template = Union[JobTemplate, CourseTemplate, HustleTemplate]
+
+
+@dataclass(frozen=True)
+class InterestBranch:
+    """Picks `matched` when any keyword occurs in the user's interests, `otherwise` if not."""
+    keywords: Tuple[str, ...]
+    matched: Tuple[Template, ...]
+    otherwise: Tuple[Template, ...] = ()
+
+
+SectionItem = Union[Template, InterestBranch]
+
+
+@dataclass(frozen=True)
+class OccupationRule:
+    """Everything we recommend for job titles containing one of `keywords`."""
+    name: str
+    keywords: Tuple[str, ...]
+    risk_score: int
+    risk_explanation: str
+    jobs: Tuple[SectionItem, ...] = ()
+    courses: Tuple[SectionItem, ...] = ()
+    hustles: Tuple[SectionItem, ...] = ()
+
+
+class RuleMatch(NamedTuple):
+    rule: OccupationRule
+    interest_hits: FrozenSet[str]
+
+    def expand(self, section: Iterable[SectionItem]) -> List[Template]:
+        """Resolves interest branches in a section to the concrete catalog entries."""
+        entries: List[Template] = []
+        for item in section:
+            if isinstance(item, InterestBranch):
+                hit = any(keyword in self.interest_hits for keyword in item.keywords)
+                entries.extend(item.matched if hit else item.otherwise)
+            else:
+                entries.append(item)
+        return entries
+
+
+# --- Engine ---
+
+# Titles and interests are short, so the automaton pays off with far fewer
+# keywords than on chat messages: measured crossover about 64 keywords
+# (python -m benchmarks.rule_engine --crossover). The shipped table stays
+# below it; tables of hundreds of occupations compile to the automaton.
+SMALL_SET_THRESHOLD = 64
+
+class RuleEngine:
+    """
+    Compiles an occupation rule table into two keyword automata (job titles and
+    interests) so one pass over each string resolves the rule for every
+    recommendation category. When several rules match, the earliest one in
+    the table wins; titles matching nothing fall back to `default`.
+    """
+
+    def __init__(self, rules: Iterable[OccupationRule], default: OccupationRule):
+        self.rules = tuple(rules)
+        self.default = default
+        self._titles = KeywordMatcher(
+            ((keyword.lower(), index) for index, rule in enumerate(self.rules) for keyword in rule.keywords),
+            SMALL_SET_THRESHOLD,
+        )
+        interest_keywords = {
+            keyword.lower()
+            for rule in self.rules + (default,)
+            for section in (rule.jobs, rule.courses, rule.hustles)
+            for item in section if isinstance(item, InterestBranch)
+            for keyword in item.keywords
+        }
+        self._interests = KeywordMatcher(((keyword, keyword) for keyword in interest_keywords), SMALL_SET_THRESHOLD)
+        self._interest_keywords = frozenset(interest_keywords)
+
+    def catalog(self, section: str) -> Tuple[Template, ...]:
+        """Every distinct entry of a section ("jobs", "courses" or "hustles") across all rules, in table order."""
+        entries = {}
+        for rule in self.rules + (self.default,):
+            for item in getattr(rule, section):
+                branches = (item.matched + item.otherwise) if isinstance(item, InterestBranch) else (item,)
+                for entry in branches:
+                    entries.setdefault(entry, None)
+        return tuple(entries)
+
+    def match_rule(self, job_title: str) -> OccupationRule:
+        hits = self._titles.find_all(job_title.lower())
+        return self.rules[min(hits)] if hits else self.default
+
+    def resolve(self, job_title: str, interests: Optional[str] = None, skills: Optional[Iterable[str]] = None) -> RuleMatch:
+        """
+        Rule for the title plus the interest keywords found in `interests` or
+        among the extracted resume `skills` (the only inputs recommendations depend on).
+        """
+        interest_hits = self._interests.find_all(interests.lower()) if interests else set()
+        if skills:
+            interest_hits |= self._interest_keywords.intersection(skills)
+        return RuleMatch(self.match_rule(job_title), frozenset(interest_hits))
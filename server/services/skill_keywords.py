@@ -0,0 +1,67 @@
+# services/skill_keywords.py
+# Skill vocabulary for resume extraction: phrase found in a resume -> skill
+# stored on the profile. Phrases are matched on whole words, case-insensitive.
+# The "environment" / "eco" / "green" skills double as interest keywords in
+# recommendation_rules, so a resume can unlock the same catalog branches as
+# the interests field.
+
+SKILL_PHRASES = {
+    # Green / interest signals
+    "environment": "environment",
+    "environmental": "environment",
+    "sustainability": "environment",
+    "sustainable": "environment",
+    "climate": "environment",
+    "conservation": "environment",
+    "recycling": "eco",
+    "eco": "eco",
+    "eco-friendly": "eco",
+    "composting": "eco",
+    "green": "green",
+    "renewable energy": "green",
+    "solar": "green",
+    "wind energy": "green",
+    # Customer facing
+    "customer service": "customer service",
+    "customer support": "customer service",
+    "sales": "sales",
+    "cash handling": "cash handling",
+    "point of sale": "cash handling",
+    "pos": "cash handling",
+    "merchandising": "merchandising",
+    # Operations
+    "inventory": "inventory management",
+    "stock control": "inventory management",
+    "logistics": "logistics",
+    "supply chain": "logistics",
+    "scheduling": "scheduling",
+    "data entry": "data entry",
+    "bookkeeping": "bookkeeping",
+    "budgeting": "budgeting",
+    "project management": "project management",
+    # Teaching / people
+    "teaching": "teaching",
+    "tutoring": "teaching",
+    "curriculum": "curriculum design",
+    "lesson planning": "curriculum design",
+    "training": "training",
+    "mentoring": "training",
+    "public speaking": "public speaking",
+    "presentations": "public speaking",
+    "leadership": "leadership",
+    "team lead": "leadership",
+    "supervisor": "leadership",
+    "communication": "communication",
+    # Digital
+    "excel": "spreadsheets",
+    "spreadsheets": "spreadsheets",
+    "copywriting": "writing",
+    "writing": "writing",
+    "blogging": "writing",
+    "social media": "social media",
+    "marketing": "marketing",
+    "python": "programming",
+    "javascript": "programming",
+    "sql": "programming",
+    "data analysis": "data analysis",
+}
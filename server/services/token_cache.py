@@ -0,0 +1,109 @@
+# services/token_cache.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Set
+from uuid import UUID
+
+from models import TokenData, UserDB
+from database import register_user_change_listener, invalidation_bus
+from config import TOKEN_CACHE_MAX_ENTRIES
+
+
+class _CachedToken(NamedTuple):
+    expires_at: float # Unix timestamp taken from the token's `exp` claim
+    token_data: TokenData
+    user: UserDB
+
+
+class VerifiedTokenCache:
+    """
+    LRU cache of tokens that already passed signature verification.
+
+    Keyed by the SHA-256 digest of the raw token so the bearer token itself is
+    never kept in memory. Entries are dropped once the token's `exp` passes,
+    and all entries for a user are dropped when that user is written to the DB.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, _CachedToken]" = OrderedDict()
+        self._keys_by_user: Dict[UUID, Set[bytes]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[_CachedToken]:
+        """Returns the cached entry for a token, or None on miss/expiry."""
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.time():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def user_id_of(self, token: str) -> Optional[UUID]:
+        """User ID of a cached, unexpired token; doesn't count as a hit or miss or refresh its LRU position."""
+        with self._lock:
+            entry = self._entries.get(self._key(token))
+        if entry is None or entry.expires_at <= time.time():
+            return None
+        return entry.token_data.id
+
+    def put(self, token: str, token_data: TokenData, user: UserDB) -> None:
+        """Caches a verified token. Tokens without an `exp` claim are not cached."""
+        if token_data.exp is None or token_data.id is None:
+            return
+        key = self._key(token)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _CachedToken(float(token_data.exp), token_data, user)
+            self._keys_by_user.setdefault(token_data.id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        """Drops every cached token that resolved to this user."""
+        with self._lock:
+            for key in self._keys_by_user.pop(user_id, set()):
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _remove(self, key: bytes) -> None:
+        # Caller must hold the lock
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._keys_by_user.get(entry.token_data.id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[entry.token_data.id]
+
+
+token_cache = VerifiedTokenCache(TOKEN_CACHE_MAX_ENTRIES)
+register_user_change_listener(token_cache.invalidate_user)
+# Other workers' user writes arrive over the invalidation bus; after a gap in
+# the subscription we can't tell which users changed, so drop every token
+invalidation_bus.on_connect(token_cache.clear)
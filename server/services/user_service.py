@@ -3,21 +3,65 @@ from typing import Optional
 from uuid import UUID
 from models import UserProfileRequest, UserDB
 from database import get_user_from_db, create_user_in_db, update_user_in_db
+from database import get_user_from_db_async, update_user_in_db_async
+from .resume_service import extract_skills, discard_resume_file
 
-def create_user_profile(profile_data: UserProfileRequest) -> UserDB:
-    """Creates a new user profile entry in the database."""
+def _build_profile_user(profile_data: UserProfileRequest) -> UserDB:
     # This creates a NEW user entry, separate from any auth users
-    user_db_data = UserDB(
+    resume_text = profile_data.resumeText.strip() if profile_data.resumeText else None
+    return UserDB(
         id=profile_data.id,
         jobTitle=profile_data.jobTitle.strip(),
         experience=profile_data.experience.strip() if profile_data.experience else None,
         interests=profile_data.interests.strip() if profile_data.interests else None,
-        resumeText=profile_data.resumeText.strip() if profile_data.resumeText else None,
-        # email, hashed_password, full_name will be None
+        resumeText=resume_text,
+        skills=extract_skills(resume_text), # Recommendations read these instead of the text
+        # email, hashed_password, full_name (and an uploaded resume) are carried over by _keep_stored_fields
     )
-    return update_user_in_db(user_db_data.id, user_db_data)
+
+def _keep_stored_fields(user: UserDB, existing: Optional[UserDB]) -> UserDB:
+    # The profile form has no login fields; without this, submitting it would
+    # drop the user's email from the index and they could no longer log in
+    if existing is not None:
+        user.email = existing.email
+        user.hashed_password = existing.hashed_password
+        user.full_name = existing.full_name
+        if user.resumeText is None:
+            # No resume in the form: keep the one uploaded earlier and the skills extracted from it
+            user.resumeText = existing.resumeText
+            user.resumeFile = existing.resumeFile
+            user.skills = existing.skills
+    return user
+
+def _replaced_resume_file(user: UserDB, existing: Optional[UserDB]) -> Optional[str]:
+    """A spilled resume file the new profile no longer refers to (pasted text replaced the upload)."""
+    if existing is not None and existing.resumeFile and existing.resumeFile != user.resumeFile:
+        return existing.resumeFile
+    return None
+
+def create_user_profile(profile_data: UserProfileRequest) -> UserDB:
+    """Creates a new user profile entry in the database."""
+    existing = get_user_from_db(profile_data.id)
+    user_db_data = _keep_stored_fields(_build_profile_user(profile_data), existing)
+    updated = update_user_in_db(user_db_data.id, user_db_data)
+    if updated is not None:
+        discard_resume_file(_replaced_resume_file(user_db_data, existing))
+    return updated
+
+async def create_user_profile_async(profile_data: UserProfileRequest) -> UserDB:
+    """Async variant of create_user_profile for use in endpoints."""
+    existing = await get_user_from_db_async(profile_data.id)
+    user_db_data = _keep_stored_fields(_build_profile_user(profile_data), existing)
+    updated = await update_user_in_db_async(user_db_data.id, user_db_data)
+    if updated is not None:
+        discard_resume_file(_replaced_resume_file(user_db_data, existing))
+    return updated
 
 def get_user(user_id: str) -> Optional[UserDB]:
     """Retrieves a user profile by ID."""
 
-    return get_user_from_db(user_id)
\ No newline at end of file
+    return get_user_from_db(user_id)
+
+async def get_user_async(user_id: str) -> Optional[UserDB]:
+    """Async variant of get_user for use in endpoints."""
+    return await get_user_from_db_async(user_id)
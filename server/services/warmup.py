@@ -0,0 +1,92 @@
+# services/warmup.py
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+# Everything the first requests would otherwise build on demand. Each step is
+# idempotent and only fills caches that are built lazily anyway, so warmup is
+# purely an optimization: skipping it (or a failed step) just moves the cost
+# back to the first request that needs it.
+
+_ready = threading.Event()
+_timings: Dict[str, float] = {}
+
+
+def _crypto() -> None:
+    from services.auth_utils import get_pwd_context, hash_password, _get_executor
+    get_pwd_context().hash("warmup") # Loads the bcrypt backend
+    _get_executor().submit(hash_password, "warmup").result() # Starts the hashing pool (and its imports, for processes)
+
+
+def _tokens() -> None:
+    from uuid import uuid4
+    from services.auth_service import create_access_token, verify_token
+    verify_token(create_access_token({"sub": str(uuid4())})) # Imports jose and its crypto backends
+
+
+def _catalogs() -> None:
+    from services.recommendation_service import _engine
+    for section in ("jobs", "courses", "hustles"):
+        for entry in _engine.catalog(section):
+            entry.variants # Builds the entry's shared models and their JSON
+
+
+def _relevance() -> None:
+    from services.recommendation_service import relevance_index, _SECTION_FIELDS
+    for section in _SECTION_FIELDS:
+        relevance_index(section)
+
+
+def _occupations() -> None:
+    from services.recommendation_service import occupation_taxonomy
+    if occupation_taxonomy is not None:
+        len(occupation_taxonomy) # Maps the dataset and builds its indexes
+
+
+def _recommendations() -> None:
+    # One cache entry per rule; most traffic normalizes to these keys
+    from services.recommendation_service import _engine, get_green_jobs, get_reskilling_courses, get_side_hustles
+    for rule in _engine.rules:
+        title = rule.keywords[0]
+        get_green_jobs(title, None)
+        get_reskilling_courses(title, None)
+        get_side_hustles(title, None)
+
+
+def _chat() -> None:
+    from services.chat_service import intent_classifier
+    intent_classifier.classify("warmup")
+
+
+STEPS: List[Tuple[str, Callable[[], None]]] = [
+    ("crypto", _crypto),
+    ("tokens", _tokens),
+    ("catalogs", _catalogs),
+    ("relevance", _relevance),
+    ("occupations", _occupations),
+    ("recommendations", _recommendations),
+    ("chat", _chat),
+]
+
+
+def warm_up() -> Dict[str, float]:
+    """Runs every warmup step (blocking) and marks the app ready. Returns seconds per step."""
+    for name, step in STEPS:
+        start = time.perf_counter()
+        step()
+        _timings[name] = time.perf_counter() - start
+    _ready.set()
+    return dict(_timings)
+
+
+def mark_ready() -> None:
+    """Marks the app ready without warming up (WARMUP_ON_STARTUP=false)."""
+    _ready.set()
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def warmup_timings() -> Dict[str, float]:
+    return dict(_timings)
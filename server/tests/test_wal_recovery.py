@@ -0,0 +1,102 @@
+# tests/test_wal_recovery.py
+"""
+Crash recovery of the WAL-backed dict store: a log cut or corrupted at the
+tail must replay exactly the records before the damage, be truncated to the
+last intact frame, and accept new writes that survive the next restart.
+
+    python -m pytest tests
+"""
+import glob
+import os
+import uuid
+
+import pytest
+
+from database.durable_store import DurableDictUserStore
+from database.wal import WriteAheadLog, _FRAME
+from models import UserDB
+
+_RECORDS = 50
+
+
+def _open(directory: str) -> DurableDictUserStore:
+    return DurableDictUserStore({}, {}, WriteAheadLog(directory))
+
+
+def _write_records(directory: str, ids) -> None:
+    store = _open(directory)
+    for i in ids:
+        store.create(UserDB(id=uuid.UUID(int=i), email=f"user{i}@example.com", jobTitle="Cashier"))
+    store.close()
+
+
+def _segments(directory: str):
+    return sorted(glob.glob(os.path.join(directory, "wal-*.log")), key=lambda p: int(p.rsplit("-", 1)[1][:-4]))
+
+
+def _frame_ends(segment: str):
+    with open(segment, "rb") as f:
+        data = f.read()
+    ends, offset = [], 0
+    while offset < len(data):
+        length, _, _ = _FRAME.unpack_from(data, offset)
+        offset += _FRAME.size + length
+        ends.append(offset)
+    return ends
+
+
+def _damage(segment: str, case: str) -> int:
+    """Damages the last record of the segment; returns the offset where intact frames end."""
+    ends = _frame_ends(segment)
+    last_start = ends[-2]
+    with open(segment, "r+b") as f:
+        if case == "cut in header":
+            f.truncate(last_start + _FRAME.size // 2)
+        elif case == "cut in payload":
+            f.truncate(last_start + _FRAME.size + 5)
+        elif case == "bad checksum":
+            f.seek(ends[-1] - 1)
+            byte = f.read(1)
+            f.seek(ends[-1] - 1)
+            f.write(bytes([byte[0] ^ 0xFF]))
+    return last_start
+
+
+@pytest.mark.parametrize("case", ["cut in header", "cut in payload", "bad checksum"])
+def test_torn_tail_is_truncated_and_later_writes_survive(tmp_path, case):
+    directory = str(tmp_path)
+    _write_records(directory, range(1, _RECORDS + 1))
+    (segment,) = _segments(directory)
+    intact_end = _damage(segment, case)
+
+    store = _open(directory)
+    assert store.count() == _RECORDS - 1
+    assert store.get(uuid.UUID(int=_RECORDS)) is None # The damaged record is gone
+    assert os.path.getsize(segment) == intact_end
+    store.create(UserDB(id=uuid.UUID(int=10_000), jobTitle="Teacher")) # Written after recovery
+    store.close()
+
+    again = _open(directory)
+    assert again.count() == _RECORDS
+    assert again.get(uuid.UUID(int=10_000)) is not None
+    again.close()
+
+
+def test_replay_stops_at_first_torn_record(tmp_path):
+    directory = str(tmp_path)
+    _write_records(directory, range(1, 11))      # wal-1.log: LSNs 1-10
+    _write_records(directory, range(101, 111))   # wal-11.log: LSNs 11-20
+    first, later = _segments(directory)
+    _damage(first, "bad checksum")               # LSN 10 is lost
+
+    store = _open(directory)
+    assert store.count() == 9 # Nothing from the later segment is applied
+    assert store.get(uuid.UUID(int=101)) is None
+    assert not os.path.exists(later) and os.path.exists(later + ".discarded")
+    store.create(UserDB(id=uuid.UUID(int=10_000), jobTitle="Teacher"))
+    store.close()
+
+    again = _open(directory)
+    assert again.count() == 10
+    assert again.get(uuid.UUID(int=10_000)) is not None
+    again.close()